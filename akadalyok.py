@@ -0,0 +1,313 @@
+# Akadályok a munkaterületben (köztük a gyűjtő) és a pályák ütközésvizsgálata.
+# Az akadályok egyenletes rácsba kerülnek; egy szakaszhoz először a teljes szakasz befoglaló
+# téglalapjával kérdezzük le a jelölteket, és csak ezekre fut mintánkénti pontos vizsgálat
+# (NumPy-jal az összes mintára egyszerre).
+import math
+
+from szimulacio import numpy_or_none, Trajectory
+
+class RectObstacle:
+    def __init__(self, x0, y0, x1, y1, name="téglalap"):
+        self.x0, self.x1 = min(x0, x1), max(x0, x1)
+        self.y0, self.y1 = min(y0, y1), max(y0, y1)
+        self.name = name
+
+    def bbox(self):
+        return self.x0, self.y0, self.x1, self.y1
+
+    def segment_distance(self, ax, ay, bx, by):
+        # A szakasz és a téglalap távolsága (0, ha metszik egymást)
+        if segment_hits_rect(ax, ay, bx, by, self.x0, self.y0, self.x1, self.y1):
+            return 0.0
+        d = min(point_rect_distance(ax, ay, self), point_rect_distance(bx, by, self))
+        for cx, cy in ((self.x0, self.y0), (self.x1, self.y0), (self.x1, self.y1), (self.x0, self.y1)):
+            d = min(d, point_segment_distance(cx, cy, ax, ay, bx, by))
+        return d
+
+class CircleObstacle:
+    def __init__(self, x, y, r, name="kör"):
+        self.x, self.y, self.r = x, y, r
+        self.name = name
+
+    def bbox(self):
+        return self.x - self.r, self.y - self.r, self.x + self.r, self.y + self.r
+
+    def segment_distance(self, ax, ay, bx, by):
+        return max(0.0, point_segment_distance(self.x, self.y, ax, ay, bx, by) - self.r)
+
+def point_segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    L = dx * dx + dy * dy
+    t = 0.0 if L == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / L))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+def point_rect_distance(px, py, r):
+    dx = max(r.x0 - px, 0.0, px - r.x1)
+    dy = max(r.y0 - py, 0.0, py - r.y1)
+    return math.hypot(dx, dy)
+
+def segment_hits_rect(ax, ay, bx, by, x0, y0, x1, y1):
+    # Liang-Barsky vágás: van-e a szakasznak a téglalapba eső része
+    t0, t1 = 0.0, 1.0
+    dx, dy = bx - ax, by - ay
+    for p, q in ((-dx, ax - x0), (dx, x1 - ax), (-dy, ay - y0), (dy, y1 - ay)):
+        if p == 0:
+            if q < 0: return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1: return False
+                t0 = max(t0, t)
+            else:
+                if t < t0: return False
+                t1 = min(t1, t)
+    return True
+
+def bin_obstacle(bin_x, bin_y, width=1.2, height=0.4, clearance=0.05):
+    # A gyűjtő (a rajzon 120 x 40 képpont, 100 px/m léptéknél): teteje a gyűjtőpont alatt
+    # clearance-szel, hogy a megfogó a nyílásig lenyúlhasson
+    return RectObstacle(bin_x - width / 2, bin_y - height, bin_x + width / 2, bin_y - clearance, "gyűjtő")
+
+def obstacles_from_json(items):
+    # [{"type": "rect", "x0":, "y0":, "x1":, "y1":}, {"type": "circle", "x":, "y":, "r":}, ...]
+    out = []
+    for k, it in enumerate(items):
+        name = it.get("name", f"akadály {k+1}")
+        if it.get("type", "rect") == "circle":
+            out.append(CircleObstacle(float(it["x"]), float(it["y"]), float(it["r"]), name))
+        else:
+            out.append(RectObstacle(float(it["x0"]), float(it["y0"]), float(it["x1"]), float(it["y1"]), name))
+    return out
+
+# --- TÉRBELI INDEX ---
+
+class ObstacleGrid:
+    def __init__(self, obstacles, cell=None):
+        self.obstacles = list(obstacles)
+        if cell is None:
+            # Cellaméret: legalább az akadályok átlagos mérete, és cellánként átlagosan egy akadály
+            boxes = [o.bbox() for o in self.obstacles]
+            cell = 1.0
+            if boxes:
+                w = max(b[2] for b in boxes) - min(b[0] for b in boxes)
+                h = max(b[3] for b in boxes) - min(b[1] for b in boxes)
+                size = sum(max(b[2] - b[0], b[3] - b[1]) for b in boxes) / len(boxes)
+                cell = max(0.05, size, math.sqrt(w * h / len(boxes)))
+        self.cell = cell
+        self.cells = {}
+        for i, ob in enumerate(self.obstacles):
+            x0, y0, x1, y1 = ob.bbox()
+            for gx in range(self.key(x0), self.key(x1) + 1):
+                for gy in range(self.key(y0), self.key(y1) + 1):
+                    self.cells.setdefault((gx, gy), []).append(i)
+
+    def key(self, v):
+        return int(math.floor(v / self.cell))
+
+    def query(self, x0, y0, x1, y1):
+        # Az adott téglalapot érintő akadályok sorszámai
+        found = set()
+        gx0, gx1, gy0, gy1 = self.key(x0), self.key(x1), self.key(y0), self.key(y1)
+        if (gx1 - gx0 + 1) * (gy1 - gy0 + 1) > len(self.cells):
+            # Nagy terület: olcsóbb a foglalt cellákon végigmenni
+            for (gx, gy), ids in self.cells.items():
+                if gx0 <= gx <= gx1 and gy0 <= gy <= gy1: found.update(ids)
+            return found
+        for gx in range(gx0, gx1 + 1):
+            for gy in range(gy0, gy1 + 1):
+                ids = self.cells.get((gx, gy))
+                if ids: found.update(ids)
+        return found
+
+# --- ÜTKÖZÉSVIZSGÁLAT ---
+
+def split_segments(samples):
+    # A tervezett minták szakaszokra bontása (minden szakasz n = 0 mintával kezdődik)
+    seg = []
+    for s in samples:
+        if s[2] == 0 and s[5] and seg:
+            yield seg
+            seg = []
+        seg.append(s)
+    if seg:
+        yield seg
+
+REFINE_STEP = 0.002  # finomításkor eddig (m) felezzük a csuklók elmozdulását két vizsgált helyzet között
+
+def check_trajectory(model, samples, obstacles, link_radius=0.03):
+    # Visszatér: [(szakasz sorszáma, az ütközés előtti utolsó minta sorszáma a szakaszon belül,
+    #             akadály neve, "L3"/"L4"), ...] - szakaszonként legfeljebb egy találat.
+    # Két minta között a kar söpört területének minden pontja legfeljebb a csuklóelmozdulás
+    # felére van a két mintabeli helyzet valamelyikétől. Ezzel a bővített vastagsággal csak
+    # jelöltet keresünk; a jelölt melletti lépéseket csuklótérben felezve (REFINE_STEP
+    # felbontásig) dől el az ütközés - így az eredmény nem függ a felosztástól (n).
+    grid = obstacles if isinstance(obstacles, ObstacleGrid) else ObstacleGrid(obstacles)
+    hits = []
+    if not grid.obstacles:
+        return hits
+    for si, seg in enumerate(split_segments(samples)):
+        hit = _check_samples(model, grid, [s[0] for s in seg], [s[1] for s in seg], link_radius)
+        if hit is not None:
+            hits.append((si,) + hit)
+    return hits
+
+def watch_collisions(model, samples, obstacles, on_hit, link_radius=0.03):
+    # Lusta változat a lejátszáshoz: a mintákat változatlanul továbbadja, és minden lezárt
+    # szakaszt akkor vizsgál meg, amikor a fogyasztó (a lejátszó előretekintése) odáig húzott.
+    # Találatkor on_hit(szakasz, minta, akadály neve, "L3"/"L4"). Az élő forrás None-jai és a
+    # plan_job(chunks=True) egyben adott szakaszai (Trajectory) változatlanul átmennek.
+    grid = obstacles if isinstance(obstacles, ObstacleGrid) else ObstacleGrid(obstacles)
+    if not grid.obstacles:
+        yield from samples
+        return
+    a32, a43, si = [], [], 0
+    for s in samples:
+        if s is not None:
+            # Egyben érkező (gyorsítótárazott) szakasz: a szögoszlopai mintánkénti bontás nélkül
+            chunk = isinstance(s, Trajectory)
+            if (chunk or s[2] == 0 and s[5]) and a32:
+                hit = _check_samples(model, grid, a32, a43, link_radius)
+                if hit is not None: on_hit(si, *hit)
+                a32, a43, si = [], [], si + 1
+            if chunk:
+                a32.extend(s.phi32)
+                a43.extend(s.phi43)
+            else:
+                a32.append(s[0])
+                a43.append(s[1])
+        yield s
+    if a32:
+        hit = _check_samples(model, grid, a32, a43, link_radius)
+        if hit is not None: on_hit(si, *hit)
+
+def _check_samples(model, grid, a32, a43, link_radius):
+    bx, by, cx, cy, _ = model.forward_kinematics_batch(a32, a43)
+    np = numpy_or_none()
+    if np is not None:
+        return _check_segment_numpy(np, model, grid, a32, a43, bx, by, cx, cy, link_radius)
+    return _check_segment(model, grid, a32, a43, bx, by, cx, cy, link_radius)
+
+def _moves(bx, by, cx, cy):
+    # move[k]: a csuklók legnagyobb elmozdulása a (k-1, k) lépésben (a két szélén 0)
+    n = len(bx)
+    move = [0.0] * (n + 1)
+    for k in range(1, n):
+        move[k] = max(math.hypot(bx[k] - bx[k-1], by[k] - by[k-1]), math.hypot(cx[k] - cx[k-1], cy[k] - cy[k-1]))
+    return move
+
+def _link_distances(model, ob, q):
+    _, (bx, by), (cx, cy) = model.forward_kinematics(q[0], q[1])
+    return (bx, by, cx, cy), ob.segment_distance(0.0, 0.0, bx, by), ob.segment_distance(bx, by, cx, cy)
+
+def _refine(model, ob, a32, a43, k, link_radius):
+    # A k. minta két szomszédos lépésének finom vizsgálata egy akadályra, csuklótéri felezéssel:
+    # egy részlépés tiszta, ha mindkét végén a kar messzebb van, mint a vastagság + az elmozdulás
+    # fele; különben REFINE_STEP alatti elmozdulásig felezünk. Visszatér: (a találatot megelőző
+    # minta sorszáma, "L3"/"L4"), vagy None
+    for j in (k - 1, k):
+        if j < 0 or j + 1 >= len(a32): continue
+        q0, q1 = (a32[j], a43[j]), (a32[j+1], a43[j+1])
+        stack = [(q0, _link_distances(model, ob, q0), q1, _link_distances(model, ob, q1))]
+        while stack:
+            qa, (pa, d3a, d4a), qb, (pb, d3b, d4b) = stack.pop()
+            if min(d3a, d3b) <= link_radius: return j, "L3"
+            if min(d4a, d4b) <= link_radius: return j, "L4"
+            move = max(math.hypot(pb[0] - pa[0], pb[1] - pa[1]), math.hypot(pb[2] - pa[2], pb[3] - pa[3]))
+            pad = link_radius + move / 2
+            if min(d3a, d3b, d4a, d4b) > pad: continue
+            if move <= REFINE_STEP:
+                return j, "L3" if min(d3a, d3b) <= min(d4a, d4b) else "L4"
+            qm = ((qa[0] + qb[0]) / 2, (qa[1] + qb[1]) / 2)
+            dm = _link_distances(model, ob, qm)
+            stack.append((qm, dm, qb, (pb, d3b, d4b)))
+            stack.append((qa, (pa, d3a, d4a), qm, dm))
+    return None
+
+def _check_segment(model, grid, a32, a43, bx, by, cx, cy, link_radius):
+    n = len(bx)
+    move = _moves(bx, by, cx, cy)
+    pad = [link_radius + max(move[k], move[k+1]) / 2 for k in range(n)]
+    m = max(pad)
+    cand = grid.query(min(0.0, min(bx), min(cx)) - m, min(0.0, min(by), min(cy)) - m,
+                      max(0.0, max(bx), max(cx)) + m, max(0.0, max(by), max(cy)) + m)
+    if not cand:
+        return None
+    cand = [(grid.obstacles[i], grid.obstacles[i].bbox()) for i in sorted(cand)]
+    for k in range(n):
+        p = pad[k]
+        for link, (ax, ay, ex, ey) in (("L3", (0.0, 0.0, bx[k], by[k])), ("L4", (bx[k], by[k], cx[k], cy[k]))):
+            lx0, lx1 = min(ax, ex) - p, max(ax, ex) + p
+            ly0, ly1 = min(ay, ey) - p, max(ay, ey) + p
+            for ob, (ox0, oy0, ox1, oy1) in cand:
+                if ox0 > lx1 or ox1 < lx0 or oy0 > ly1 or oy1 < ly0: continue
+                d = ob.segment_distance(ax, ay, ex, ey)
+                if d <= link_radius:
+                    return k, ob.name, link
+                if d <= p:
+                    hit = _refine(model, ob, a32, a43, k, link_radius)
+                    if hit is not None:
+                        return hit[0], ob.name, hit[1]
+    return None
+
+def _check_segment_numpy(np, model, grid, a32, a43, bx, by, cx, cy, link_radius):
+    bx, by, cx, cy = (np.asarray(v, dtype=float) for v in (bx, by, cx, cy))
+    move = np.zeros(len(bx) + 1)
+    if len(bx) > 1:
+        move[1:-1] = np.maximum(np.hypot(np.diff(bx), np.diff(by)), np.hypot(np.diff(cx), np.diff(cy)))
+    pad = link_radius + np.maximum(move[:-1], move[1:]) / 2
+    m = pad.max()
+    cand = grid.query(min(0.0, bx.min(), cx.min()) - m, min(0.0, by.min(), cy.min()) - m,
+                      max(0.0, bx.max(), cx.max()) + m, max(0.0, by.max(), cy.max()) + m)
+    if not cand:
+        return None
+    zero = np.zeros_like(bx)
+    first = None
+    for i in sorted(cand):
+        ob = grid.obstacles[i]
+        # Mintánként a két kar távolsága; a közelebbi dönt
+        d = np.minimum(_segment_distance_numpy(np, ob, zero, zero, bx, by),
+                       _segment_distance_numpy(np, ob, bx, by, cx, cy))
+        limit = len(bx) if first is None else first[0] + 1
+        for k in np.nonzero(d[:limit] <= pad[:limit])[0]:
+            k = int(k)
+            if d[k] <= link_radius:
+                d3 = _segment_distance_numpy(np, ob, zero[k:k+1], zero[k:k+1], bx[k:k+1], by[k:k+1])[0]
+                hit = (k, "L3" if d3 <= link_radius else "L4")
+            else:
+                hit = _refine(model, ob, a32, a43, k, link_radius)
+            if hit is not None:
+                if first is None or hit[0] < first[0]:
+                    first = (hit[0], ob.name, hit[1])
+                break
+    return first
+
+def _point_segment_numpy(np, px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    L = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(L > 0, ((px - ax) * dx + (py - ay) * dy) / np.where(L > 0, L, 1.0), 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.hypot(px - ax - t * dx, py - ay - t * dy)
+
+def _segment_distance_numpy(np, ob, ax, ay, bx, by):
+    if isinstance(ob, CircleObstacle):
+        return np.maximum(0.0, _point_segment_numpy(np, ob.x, ob.y, ax, ay, bx, by) - ob.r)
+    # Téglalap: metszés (Liang-Barsky vektorosan), különben a csúcs-szakasz / végpont-téglalap távolságok minimuma
+    dx, dy = bx - ax, by - ay
+    t0 = np.zeros_like(ax)
+    t1 = np.ones_like(ax)
+    inside = np.ones(ax.shape, dtype=bool)
+    for p, q in ((-dx, ax - ob.x0), (dx, ob.x1 - ax), (-dy, ay - ob.y0), (dy, ob.y1 - ay)):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = q / p
+        inside &= ~((p == 0) & (q < 0))
+        t0 = np.where(p < 0, np.maximum(t0, t), t0)
+        t1 = np.where(p > 0, np.minimum(t1, t), t1)
+    inside &= t0 <= t1
+    d = np.minimum(np.hypot(np.maximum.reduce([ob.x0 - ax, 0 * ax, ax - ob.x1]),
+                            np.maximum.reduce([ob.y0 - ay, 0 * ay, ay - ob.y1])),
+                   np.hypot(np.maximum.reduce([ob.x0 - bx, 0 * bx, bx - ob.x1]),
+                            np.maximum.reduce([ob.y0 - by, 0 * by, by - ob.y1])))
+    for qx, qy in ((ob.x0, ob.y0), (ob.x1, ob.y0), (ob.x1, ob.y1), (ob.x0, ob.y1)):
+        d = np.minimum(d, _point_segment_numpy(np, qx, qy, ax, ay, bx, by))
+    return np.where(inside, 0.0, d)
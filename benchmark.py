@@ -0,0 +1,205 @@
+# Teljesítménymérés a forró útvonalakra, géppel olvasható eredménnyel.
+#   python benchmark.py -o eredmeny.json
+#   python benchmark.py --baseline alap.json --tolerance 0.25
+# Ha egy mért érték a tárolt alapértékhez képest a tűréshatárnál jobban romlik,
+# a kilépési kód 1. A draw() mérése kijelzőt igényel (pl. xvfb-run python benchmark.py).
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+from szimulacio import (RobotArmModel, Trajectory, TrajectoryPlayer, generate_path_segment,
+                        plan_job, bin_angles_for)
+from munkaterulet import Workspace
+
+def best_time(fn, repeat=5):
+    # Egy hívás ideje: a legjobb ismétlés, ahol egy ismétlés annyi hívás, hogy legalább 0,2 s-ig
+    # tartson (timeit autorange) - a mikroszekundumos műveleteknél az óra felbontása így nem számít
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+def random_points(model, count, seed=1):
+    # Véletlen, biztosan elérhető pontok a szöghatárokon belül
+    rnd = random.Random(seed)
+    pts = []
+    for _ in range(count):
+        a32 = rnd.uniform(model.rad_min32, model.rad_max32)
+        a43 = rnd.uniform(model.rad_min43, model.rad_max43)
+        x, y = model.forward_kinematics(a32, a43)[2]
+        pts.append((x, y, a32, a43))
+    return pts
+
+def consume(gen):
+    n = 0
+    for _ in gen: n += 1
+    return n
+
+# --- MÉRÉSEK ---
+# Mindegyik (név, érték, mértékegység, "lower"/"higher" = melyik irány a jobb) sorokat ad.
+
+def bench_kinematics(model, n):
+    rnd = random.Random(2)
+    a32 = [rnd.uniform(model.rad_min32, model.rad_max32) for _ in range(n)]
+    a43 = [rnd.uniform(model.rad_min43, model.rad_max43) for _ in range(n)]
+    xs = [model.forward_kinematics(p, q)[2][0] for p, q in zip(a32, a43)]
+    ys = [model.forward_kinematics(p, q)[2][1] for p, q in zip(a32, a43)]
+    fk, ik = model.forward_kinematics, model.inverse_kinematics
+
+    def fk_scalar():
+        for p, q in zip(a32, a43): fk(p, q)
+    def ik_scalar():
+        for x, y in zip(xs, ys): ik(x, y)
+
+    yield "fk_scalar", n / best_time(fk_scalar), "call/s", "higher"
+    yield "ik_scalar", n / best_time(ik_scalar), "call/s", "higher"
+    yield "fk_batch", n / best_time(lambda: model.forward_kinematics_batch(a32, a43)), "sample/s", "higher"
+    yield "ik_batch", n / best_time(lambda: model.inverse_kinematics_batch(xs, ys)), "sample/s", "higher"
+
+def bench_planning(model, sizes, steps):
+    a, b = (model.rad_min32, model.rad_min43), (model.rad_max32, model.rad_max43)
+    yield "path_segment", best_time(lambda: generate_path_segment(model, a, b, steps, False)), "s", "lower"
+    bin_angles = bin_angles_for(model, 1.2, -0.6)
+    start = (model.rad_min32, model.rad_min43)
+    for size in sizes:
+        pts = random_points(model, size)
+        yield (f"plan_normal_{size}",
+               best_time(lambda: consume(plan_job(model, pts, start, steps)), 3), "s", "lower")
+        yield (f"plan_rakodas_{size}",
+               best_time(lambda: consume(plan_job(model, pts, start, steps, bin_angles)), 3), "s", "lower")
+        # Első minta megjelenéséig eltelt idő (lusta tervezés)
+        yield (f"first_sample_{size}",
+               best_time(lambda: TrajectoryPlayer(plan_job(model, pts, start, steps, bin_angles))),
+               "s", "lower")
+
+def bench_workspace(model):
+    # Gyorsítótár nélkül: minden hívás új Workspace-en, így az ívek és a sokszög újraszámolódnak
+    yield "workspace_outline", best_time(lambda: Workspace(model).outline()), "s", "lower"
+
+def bench_memory(model, size, steps):
+    pts = random_points(model, size)
+    start = (model.rad_min32, model.rad_min43)
+    bin_angles = bin_angles_for(model, 1.2, -0.6)
+
+    # A teljes animációs sor (mintha előre ki lenne számolva) és a lejátszó puffere
+    tracemalloc.start()
+    queue = list(plan_job(model, pts, start, steps, bin_angles))
+    full = tracemalloc.get_traced_memory()[0]
+    del queue
+    tracemalloc.stop()
+
+    # Ugyanez tömör oszlopos tárolóban
+    tracemalloc.start()
+    traj = Trajectory.from_samples(plan_job(model, pts, start, steps, bin_angles))
+    compact = tracemalloc.get_traced_memory()[0]
+    del traj
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    player = TrajectoryPlayer(plan_job(model, pts, start, steps, bin_angles))
+    buffered = tracemalloc.get_traced_memory()[0]
+    del player
+    tracemalloc.stop()
+    yield f"anim_queue_bytes_{size}", full, "B", "lower"
+    yield f"trajectory_bytes_{size}", compact, "B", "lower"
+    yield f"player_buffer_bytes_{size}", buffered, "B", "lower"
+
+def bench_draw(frames=200):
+    # Valódi vagy virtuális kijelző kell; anélkül a mérés kimarad
+    try:
+        import tkinter as tk
+        import robotkar
+        root = tk.Tk()
+    except Exception as e:
+        print(f"draw() mérés kihagyva: {e}", file=sys.stderr)
+        return
+    try:
+        app = robotkar.RobotApp(root)
+        root.update()
+        model = app.model
+        model.points = random_points(model, 50)
+        angles = [(a[2], a[3]) for a in random_points(model, frames, seed=3)]
+        app.draw()
+        t0 = time.perf_counter()
+        for a in angles:
+            app.mouse_ik_angles = a
+            app.draw()
+            root.update_idletasks()
+        yield "draw_frame", (time.perf_counter() - t0) / frames, "s", "lower"
+
+        # Teljes újraépítés (átméretezés, paraméterváltozás)
+        def full():
+            app._static_key = app._points_key = None
+            app.draw()
+            root.update_idletasks()
+        yield "draw_full_rebuild", best_time(full, 10), "s", "lower"
+    finally:
+        root.destroy()
+
+# --- FUTTATÁS ÉS ÖSSZEVETÉS ---
+
+def run(args):
+    model = RobotArmModel()
+    sizes = [10, 100, 1000, 10000] if not args.quick else [10, 100]
+    results = {}
+    groups = [bench_kinematics(model, 10000 if args.quick else 100000),
+              bench_planning(model, sizes, args.n),
+              bench_workspace(model),
+              bench_memory(model, sizes[-1], args.n)]
+    if not args.no_draw:
+        groups.append(bench_draw())
+    for group in groups:
+        for name, value, unit, better in group:
+            results[name] = {"value": value, "unit": unit, "better": better}
+            print(f"{name:28s} {value:14.6g} {unit}", file=sys.stderr)
+    return results
+
+def compare(results, baseline, tolerance):
+    # Visszatér a romlott mérések listájával: (név, alap, mostani, relatív romlás)
+    bad = []
+    for name, base in baseline.items():
+        cur = results.get(name)
+        if cur is None or base["value"] <= 0: continue
+        if base.get("better", "lower") == "lower":
+            change = cur["value"] / base["value"] - 1.0
+        else:
+            change = base["value"] / cur["value"] - 1.0 if cur["value"] > 0 else math.inf
+        if change > tolerance:
+            bad.append((name, base["value"], cur["value"], change))
+    return bad
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Robotkar teljesítménymérés")
+    ap.add_argument("-o", "--output", help="eredmények JSON fájlba")
+    ap.add_argument("--baseline", help="összevetés egy korábbi eredményfájllal")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="megengedett relatív romlás (alapértelmezés: 0.25 = 25%%)")
+    ap.add_argument("-n", type=int, default=12, help="felosztás szakaszonként")
+    ap.add_argument("--quick", action="store_true", help="kisebb méretek (gyors ellenőrzéshez)")
+    ap.add_argument("--no-draw", action="store_true", help="a draw() mérés kihagyása")
+    args = ap.parse_args(argv)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        bad = compare(results, baseline, args.tolerance)
+        for name, base, cur, change in bad:
+            print(f"ROMLÁS: {name}: {base:.6g} -> {cur:.6g} ({change:+.0%})", file=sys.stderr)
+        if bad:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
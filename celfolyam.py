@@ -0,0 +1,314 @@
+# Élő célpontfolyam: egy külső (pl. képfeldolgozó vagy szállítószalag) folyamat soronként
+# küldi a célpontokat Unix socketen vagy a standard bemeneten:
+#   kérés:   x y [azonosító]
+#   válasz:  OK azonosító φ32 φ43          (fokban)
+#            REJECT azonosító ok           (formátum / elérhetetlen)
+# A fogadás és az IK-ellenőrzés külön szálon, asyncio eseményhurokban fut, kötegelt IK-val.
+# Az elfogadott célpontok korlátos sorba kerülnek; ha a sor tele van, a fogadó nem olvas
+# tovább, így a küldőt a socket pufferén keresztül fékezi (visszanyomás).
+#   python celfolyam.py szerver --socket /tmp/robotkar.sock
+#   python celfolyam.py termelo --socket /tmp/robotkar.sock -n 100000
+import argparse
+import asyncio
+import math
+import os
+import queue
+import random
+import signal
+import socket
+import stat
+import sys
+import threading
+import time
+
+from szimulacio import RobotArmModel, load_job, build_model, plan_job, bin_angles_for
+
+DEFAULT_SOCKET = "/tmp/robotkar.sock"
+
+class TargetServer:
+    CHUNK = 4096     # egyszerre beolvasott bájtok (ennyi sor kerül egy IK-kötegbe)
+
+    def __init__(self, model, maxsize=1024):
+        # A modellt csak olvassa (IK); a célpontok (x, y, φ32, φ43, azonosító) sorként érkeznek
+        self.model = model
+        self.queue = queue.Queue(maxsize)
+        self.accepted = 0
+        self.rejected = 0
+        self.loop = None
+        self.thread = None
+        self._server = None
+        self._ready = threading.Event()
+        self._space = None  # asyncio.Event: a fogyasztó helyet csinált a sorban
+        self.error = None
+
+    # --- Indítás és leállítás (a hívó szálról) ---
+
+    def start_unix(self, path=DEFAULT_SOCKET):
+        # Meglévő socketfájlt csak akkor töröl, ha senki sem figyel rajta (elárvult)
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise OSError(f"a megadott út nem socket: {path}")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                os.unlink(path)
+            else:
+                raise OSError(f"a socketet már egy másik példány használja: {path}")
+            finally:
+                probe.close()
+        self._start(lambda: asyncio.start_unix_server(self.handle, path=path))
+        self.path = path
+
+    def start_stdin(self, out=None):
+        self._start(lambda: self.open_pipe(sys.stdin, out or sys.stdout))
+
+    def _start(self, make):
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self._space = asyncio.Event()
+            try:
+                res = self.loop.run_until_complete(make())
+                if isinstance(res, asyncio.AbstractServer): self._server = res
+            except Exception as e:
+                self.error = e
+            self._ready.set()
+            if self.error is None:
+                self.loop.run_forever()
+            self.loop.close()
+        self.thread = threading.Thread(target=run, name="celfolyam", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        if self.loop is None or self.loop.is_closed(): return
+        def shutdown():
+            if self._server is not None: self._server.close()
+            self.loop.stop()
+        try:
+            self.loop.call_soon_threadsafe(shutdown)
+        except RuntimeError:
+            pass
+        self.thread.join(timeout=2)
+        path = getattr(self, "path", None)
+        if path and os.path.exists(path): os.unlink(path)
+
+    def get(self, block=True, timeout=None):
+        # A fogyasztó szálról (a queue.Queue.get megfelelője): ha a sor tele volt, a felszabadult
+        # helyről szól a tele sornál várakozó fogadónak
+        item = self.queue.get(block, timeout)
+        if self.queue.qsize() >= self.queue.maxsize - 1 and self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._space.set)
+            except RuntimeError:
+                pass  # a hurok már leállt
+        return item
+
+    # --- Protokoll (az eseményhurok szálán) ---
+
+    async def handle(self, reader, writer):
+        counter = [0]
+        rest = b""
+        try:
+            while True:
+                data = await reader.read(self.CHUNK)
+                if not data: break
+                lines = (rest + data).split(b"\n")
+                rest = lines.pop()
+                await self.process(lines, counter, writer)
+            if rest.strip():
+                await self.process([rest], counter, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def open_pipe(self, inp, out):
+        # Standard bemenet: a válaszok a kimenetre mennek; a bemenet végén None jelzi
+        # a fogyasztónak, hogy nem jön több célpont
+        reader = asyncio.StreamReader(limit=self.CHUNK * 4)
+        await self.loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), inp)
+        class Out:
+            def write(self, data): out.write(data.decode()); out.flush()
+            async def drain(self): pass
+            def close(self): pass
+        async def serve():
+            await self.handle(reader, Out())
+            await self.put(None)
+        self.loop.create_task(serve())
+
+    async def process(self, lines, counter, writer):
+        # Az OK nyugta csak a célpont sorba kerülése után megy ki: mielőtt a put() a tele
+        # soron várni kezdene, az addig ténylegesen elfogadottak válaszai kiíródnak
+        replies, ok = self.validate(lines, counter)
+        sent = 0
+        for k, target in ok:
+            if self.queue.full():
+                writer.write("".join(replies[sent:k]).encode())
+                sent = k
+            await self.put(target)
+        writer.write("".join(replies[sent:]).encode())
+        await writer.drain()
+
+    def validate(self, lines, counter):
+        # Kötegelt IK az összes jól formázott sorra; visszatér: (válaszsorok, elfogadott
+        # (sorindex, célpont) párok)
+        replies = [None] * len(lines)
+        parsed = []
+        for k, raw in enumerate(lines):
+            counter[0] += 1
+            parts = raw.replace(b",", b" ").split()
+            if not parts:
+                replies[k] = ""
+                continue
+            ident = parts[2].decode(errors="replace") if len(parts) > 2 else str(counter[0])
+            try:
+                x, y = float(parts[0]), float(parts[1])
+                if not (math.isfinite(x) and math.isfinite(y)): raise ValueError
+            except (ValueError, IndexError):
+                replies[k] = f"REJECT {ident} formátum\n"
+                continue
+            parsed.append((k, x, y, ident))
+        ok = []
+        if parsed:
+            phi32, phi43, good = self.model.inverse_kinematics_batch([p[1] for p in parsed],
+                                                                     [p[2] for p in parsed])
+            for j, (k, x, y, ident) in enumerate(parsed):
+                if good[j]:
+                    a32, a43 = float(phi32[j]), float(phi43[j])
+                    ok.append((k, (x, y, a32, a43, ident)))
+                    replies[k] = f"OK {ident} {math.degrees(a32):.3f} {math.degrees(a43):.3f}\n"
+                else:
+                    replies[k] = f"REJECT {ident} elérhetetlen\n"
+        self.accepted += len(ok)
+        self.rejected += sum(1 for r in replies if r and r.startswith("REJECT"))
+        return replies, ok
+
+    async def put(self, target):
+        # Korlátos sor: tele sornál a kapcsolat olvasása is áll (visszanyomás), amíg a fogyasztó
+        # get() hívása fel nem ébreszti
+        while True:
+            try:
+                self.queue.put_nowait(target)
+                return
+            except queue.Full:
+                self._space.clear()
+                if self.queue.full(): await self._space.wait()
+
+# --- HELYETTESÍTŐ KÜLDŐ (teszteléshez) ---
+
+async def produce(path, count, rate=0.0, seed=1, bad=0.1):
+    # count célpont küldése (bad arányban elérhetetlen); rate > 0 esetén célpont/s korláttal.
+    # Visszatér: (elküldve, OK, REJECT, eltelt idő)
+    model = RobotArmModel()
+    rnd = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+    counts = {"OK": 0, "REJECT": 0}
+
+    async def read_replies():
+        while True:
+            line = await reader.readline()
+            if not line: break
+            word = line.split(b" ", 1)[0].decode()
+            if word in counts: counts[word] += 1
+            if counts["OK"] + counts["REJECT"] >= count: break
+
+    t0 = time.perf_counter()
+    replies = asyncio.ensure_future(read_replies())
+    batch = 200
+    for first in range(0, count, batch):
+        lines = []
+        for i in range(first, min(count, first + batch)):
+            if rnd.random() < bad:
+                lines.append(f"{rnd.uniform(3, 5):.4f} {rnd.uniform(3, 5):.4f} {i}\n")
+                continue
+            a32 = rnd.uniform(model.rad_min32, model.rad_max32)
+            a43 = rnd.uniform(model.rad_min43, model.rad_max43)
+            x, y = model.forward_kinematics(a32, a43)[2]
+            lines.append(f"{x:.5f} {y:.5f} {i}\n")
+        writer.write("".join(lines).encode())
+        await writer.drain()  # a szerver visszanyomása itt érződik
+        if rate > 0:
+            ahead = (first + batch) / rate - (time.perf_counter() - t0)
+            if ahead > 0: await asyncio.sleep(ahead)
+    await replies
+    elapsed = time.perf_counter() - t0
+    writer.close()
+    return count, counts["OK"], counts["REJECT"], elapsed
+
+# --- FUTTATÁS ---
+
+def consume(server, model, steps, bin_angles=None):
+    # Fej nélküli fogyasztó: minden elfogadott célponthoz megtervezi a mozgást (a GUI helyett)
+    current = (model.rad_min32, model.rad_min43)
+    targets = samples = 0
+    try:
+        while True:
+            try:
+                p = server.get(timeout=0.5)
+            except queue.Empty:
+                if server.thread is not None and not server.thread.is_alive(): break
+                continue
+            if p is None: break
+            if bin_angles is not None:
+                pts, nxt = [p], bin_angles
+            else:
+                pts, nxt = [(None, None) + tuple(current), p], (p[2], p[3])
+            for _ in plan_job(model, pts, current, steps, bin_angles):
+                samples += 1
+            current = nxt
+            targets += 1
+    except KeyboardInterrupt:
+        pass
+    return targets, samples
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Élő célpontfolyam fogadása és tesztküldő")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sp = sub.add_parser("szerver", help="célpontok fogadása, ellenőrzése és megtervezése")
+    sp.add_argument("--socket", default=DEFAULT_SOCKET)
+    sp.add_argument("--stdin", action="store_true", help="socket helyett a standard bemenetről")
+    sp.add_argument("--job", help="feladatfájl a paraméterekhez (params, mode, bin, n)")
+    sp.add_argument("--queue", type=int, default=1024, help="a várakozó sor mérete")
+    tp = sub.add_parser("termelo", help="helyettesítő küldő véletlen célpontokkal")
+    tp.add_argument("--socket", default=DEFAULT_SOCKET)
+    tp.add_argument("-n", type=int, default=10000)
+    tp.add_argument("--rate", type=float, default=0.0, help="célpont/s (0 = amilyen gyorsan csak lehet)")
+    tp.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "termelo":
+        sent, ok, rej, dt = asyncio.run(produce(args.socket, args.n, args.rate, args.seed))
+        print(f"{sent} célpont {dt:.2f} s alatt ({sent / dt:.0f}/s): {ok} elfogadva, {rej} elutasítva",
+              file=sys.stderr)
+        return 0 if ok + rej == sent else 1
+
+    job = load_job(args.job) if args.job else {}
+    model = build_model(job)
+    bin_angles = None
+    if job.get("mode", "normal") == "rakodas":
+        bin_angles = bin_angles_for(model, *job.get("bin", (1.2, -0.6)))
+        if not bin_angles:
+            print("Hiba: A gyűjtő fizikailag nem elérhető!", file=sys.stderr)
+            return 1
+    def interrupt(*_): raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, interrupt)  # leállításkor is legyen összesítés
+    server = TargetServer(model, maxsize=args.queue)
+    if args.stdin:
+        server.start_stdin()
+    else:
+        server.start_unix(args.socket)
+        print(f"Várakozás: {args.socket} (Ctrl+C: leállítás)", file=sys.stderr)
+    t0 = time.perf_counter()
+    targets, samples = consume(server, model, int(job.get("n", 12)), bin_angles)
+    server.stop()
+    print(f"Elfogadva: {server.accepted}, elutasítva: {server.rejected}, "
+          f"{time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    print(f"Megtervezve: {targets} célpont, {samples} minta", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+# Többkaros cella szimulációja fej nélkül: N kar (saját talppont-eltolással, geometriával és
+# szöghatárokkal), közös felvételi terület és több gyűjtő. A beérkező felvételeket az ütemező
+# a legkorábbi befejezési idő (ECT) szerint osztja ki, ami a listás ütemezés makespan-
+# minimalizáló szabálya; összevetéshez körbeforgó (rr) kiosztás is választható.
+# Az esemény-ütemezés pontos időkkel dolgozik; a karok állapota ütemenként egyetlen
+# kötegelt frissítéssel (NumPy-jal vektorizáltan) lép.
+#   python cella.py --arms 50 --hours 1 --rate 900
+#   python cella.py cella.json -o eredmeny.json
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import time
+from collections import deque
+
+from szimulacio import (DWELL_TIME, numpy_or_none, joint_profile, segment_duration, bin_angles_for,
+                        load_job, build_model)
+
+class CellArm:
+    # Egy kar a cellában: a modell a saját talppontjához képest számol
+    def __init__(self, model, base, bins):
+        self.model = model
+        self.base = base
+        # Gyűjtők a kar koordinátáiban: (sorszám, csuklószögek) - csak az elérhetők
+        self.bins = [(k, a) for k, a in ((k, bin_angles_for(model, x - base[0], y - base[1]))
+                                         for k, (x, y) in enumerate(bins)) if a is not None]
+        self.angles = (model.rad_min32, model.rad_min43)  # a szabaddá válás pillanatában
+        self.free_at = 0.0
+        self.phases = deque()  # (kezdet, vég, kezdő szögek, cél szögek, profil, megfogva)
+        self.busy = 0.0
+        self.picks = 0
+
+    def pick_plan(self, x, y, ready):
+        # A felvétel legkorábbi befejezése ennél a karnál: (befejezés, szakaszok) vagy None
+        m = self.model
+        lx, ly = x - self.base[0], y - self.base[1]
+        if not self.bins or not m.in_annulus(lx, ly): return None
+        target = m.inverse_kinematics(lx, ly)
+        if target is None: return None
+        t = max(self.free_at, ready)
+        d1 = segment_duration(m, self.angles, target)
+        d2, bin_angles = min((segment_duration(m, target, a), a) for _, a in self.bins)
+        t1 = t + d1
+        t2 = t1 + DWELL_TIME
+        t3 = t2 + d2
+        t4 = t3 + DWELL_TIME
+        phases = [(t, t1, self.angles, target, False), (t1, t2, target, target, True),
+                  (t2, t3, target, bin_angles, True), (t3, t4, bin_angles, bin_angles, False)]
+        return t4, phases
+
+    def commit(self, finish, phases):
+        for t0, t1, a, b, holding in phases:
+            prof = joint_profile(self.model, a, b) if t1 > t0 and a != b else None
+            self.phases.append((t0, t1, a, b, prof, holding))
+            self.busy += t1 - t0
+        self.angles = phases[-1][3]
+        self.free_at = finish
+        self.picks += 1
+
+class Cell:
+    # t0: a szakasz kezdete, rate: profilidő / falióra-idő, a32/a43 + d32/d43: kezdő szögek és
+    # elmozdulás, vpeak/ta/tc/dur: a profil, s: S-görbe (1) vagy trapéz (0)
+    COLUMNS = ("t0", "rate", "a32", "a43", "d32", "d43", "vpeak", "ta", "tc", "dur", "s")
+
+    def __init__(self, arms, bins, policy="ect"):
+        self.bins = list(bins)
+        self.arms = [CellArm(m, base, self.bins) for m, base in arms]
+        self.policy = policy
+        self.rr = 0
+        self.done = []        # (érkezés, kezdés, befejezés, kar)
+        self.rejected = 0
+        n = len(self.arms)
+        # Karonkénti szakaszparaméterek állandó oszlopokban (NumPy-jal tömbökben): csak annak a
+        # karnak a sora íródik át, amelyik szakaszt vált, a pozíció egyetlen tömbkifejezés
+        self.np = numpy_or_none()
+        self.cols = {c: self.np.zeros(n) if self.np is not None else [0.0] * n for c in self.COLUMNS}
+        self.prof = [None] * n   # NumPy nélkül a karonkénti kiértékeléshez
+        self.moving = set()      # ennek a karnak van profilja (NumPy nélkül csak ezeket számolja)
+        self.a32 = [a.angles[0] for a in self.arms]
+        self.a43 = [a.angles[1] for a in self.arms]
+        self.holding = [False] * n
+        self.wake = [math.inf] * n   # a következő szakaszváltás ideje karonként
+        self.wakeups = []            # (idő, kar) kupac; az elavult bejegyzéseket kihagyja
+        for i, arm in enumerate(self.arms):
+            self._rest(i, arm.angles)
+
+    # --- Ütemezés ---
+
+    def assign(self, x, y, ready):
+        # ECT: a kar, amelyiknél a felvétel a legkorábban fejeződik be. A karok a szabaddá
+        # válás szerint rendezve jönnek; ha már a legkorábbi kezdés + várakozások sem
+        # javíthat, a keresés leáll.
+        best = None
+        if self.policy == "rr":
+            n = len(self.arms)
+            for k in range(n):
+                arm = self.arms[(self.rr + k) % n]
+                plan = arm.pick_plan(x, y, ready)
+                if plan is not None:
+                    self.rr = (self.rr + k + 1) % n
+                    best = (plan, arm)
+                    break
+        else:
+            for arm in sorted(self.arms, key=lambda a: a.free_at):
+                if best is not None and max(arm.free_at, ready) + 2 * DWELL_TIME >= best[0][0]: break
+                plan = arm.pick_plan(x, y, ready)
+                if plan is not None and (best is None or plan[0] < best[0][0]):
+                    best = (plan, arm)
+        if best is None:
+            self.rejected += 1
+            return None
+        (finish, phases), arm = best
+        arm.commit(finish, phases)
+        i = self.arms.index(arm)
+        # Álló karnál az új első szakasz kezdete a következő váltás
+        if phases[0][0] < self.wake[i]:
+            self.wake[i] = phases[0][0]
+            heapq.heappush(self.wakeups, (phases[0][0], i))
+        self.done.append((ready, phases[0][0], finish, i))
+        return finish
+
+    # --- Kötegelt léptetés ---
+
+    def _rest(self, i, angles):
+        c = self.cols
+        c["a32"][i], c["a43"][i] = self.a32[i], self.a43[i] = angles
+        c["d32"][i] = c["d43"][i] = c["dur"][i] = 0.0
+        self.prof[i] = None
+        self.moving.discard(i)
+
+    def _load(self, i, t):
+        # Az i. kar sora a t-ben érvényes szakaszra; visszatér: a következő szakaszváltás ideje
+        ph = self.arms[i].phases
+        while ph and ph[0][1] <= t:
+            last = ph.popleft()
+            self._rest(i, last[3])
+            self.holding[i] = last[5]
+        if not ph: return math.inf
+        t0, t1, a, b, prof, holding = ph[0]
+        if t0 > t: return t0
+        c = self.cols
+        c["t0"][i] = t0
+        c["a32"][i], c["a43"][i] = a
+        c["d32"][i], c["d43"][i] = b[0] - a[0], b[1] - a[1]
+        if prof is None:
+            c["dur"][i] = 0.0
+            self.a32[i], self.a43[i] = b
+        else:
+            # A profil saját idejére skálázva (a "linear" profil időtartama a Descartes-sebességből jön)
+            c["rate"][i] = prof.duration / (t1 - t0)
+            c["vpeak"][i], c["ta"][i], c["tc"][i], c["dur"][i] = prof.vpeak, prof.ta, prof.tc, prof.duration
+            c["s"][i] = 1.0 if prof.kind == "s" else 0.0
+        self.prof[i] = prof
+        if prof is not None: self.moving.add(i)
+        else: self.moving.discard(i)
+        self.holding[i] = holding
+        return t1
+
+    def step(self, t):
+        # Az összes kar állapota t időpontban: a szakaszt váltó karok sora frissül, a pozíciók
+        # egyetlen menetben számolódnak
+        wake, heap = self.wake, self.wakeups
+        while heap and heap[0][0] <= t:
+            w, i = heapq.heappop(heap)
+            if w != wake[i]: continue
+            wake[i] = self._load(i, t)
+            if wake[i] < math.inf: heapq.heappush(heap, (wake[i], i))
+        c = self.cols
+        if self.np is not None:
+            r = profile_positions(self.np, c, t)
+            self.a32 = c["a32"] + c["d32"] * r
+            self.a43 = c["a43"] + c["d43"] * r
+            return
+        for i in self.moving:
+            prof = self.prof[i]
+            r = prof.position(min(max(0.0, (t - c["t0"][i]) * c["rate"][i]), prof.duration))
+            self.a32[i] = c["a32"][i] + c["d32"][i] * r
+            self.a43[i] = c["a43"][i] + c["d43"][i] * r
+
+    def run(self, picks, horizon=None, dt=0.1, on_tick=None):
+        # picks: (x, y, érkezési idő) időrendben. horizon: a szimulált idő (None: amíg minden kész)
+        picks = iter(picks)
+        nxt = next(picks, None)
+        t = 0.0
+        end = horizon
+        while True:
+            while nxt is not None and nxt[2] <= t:
+                self.assign(nxt[0], nxt[1], nxt[2])
+                nxt = next(picks, None)
+            if dt > 0:
+                self.step(t)
+                if on_tick is not None: on_tick(t, self.a32, self.a43, self.holding)
+            if end is None and nxt is None:
+                end = max((a.free_at for a in self.arms), default=0.0)
+            if end is not None and t >= end: break
+            t = t + dt if dt > 0 else (nxt[2] if nxt is not None else end)
+        return self.report(end)
+
+    def report(self, horizon):
+        finished = [d for d in self.done if d[2] <= horizon]
+        busy = [0.0] * len(self.arms)
+        picks = [0] * len(self.arms)
+        for arr, start, fin, k in finished:
+            busy[k] += fin - start
+            picks[k] += 1
+        waits = [start - arr for arr, start, fin, k in finished]
+        return {
+            "horizon_s": horizon,
+            "picks": len(finished),
+            "assigned": len(self.done),
+            "rejected": self.rejected,
+            "makespan_s": max((d[2] for d in self.done), default=0.0),
+            "throughput_ppm": len(finished) / (horizon / 60) if horizon else 0.0,
+            "mean_wait_s": sum(waits) / len(waits) if waits else 0.0,
+            "arms": [{"base": list(a.base), "picks": picks[k],
+                      "utilization": busy[k] / horizon if horizon else 0.0}
+                     for k, a in enumerate(self.arms)],
+        }
+
+def profile_positions(np, c, t):
+    # u(τ) ∈ [0, 1] minden karra a Cell oszlopaiból; álló karnál és várakozásnál (dur = 0) 1
+    v, ta, tc, dur = c["vpeak"], c["ta"], c["tc"], c["dur"]
+    s = c["s"] > 0
+    tau = np.clip((t - c["t0"]) * c["rate"], 0.0, dur)
+    safe = np.where(ta > 0, ta, 1.0)
+    def ramp(t):
+        return np.where(s, v / 2 * (t - safe / math.pi * np.sin(math.pi * t / safe)),
+                        v * t * t / (2 * safe))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.where(tau < ta, ramp(tau),
+                     np.where(tau <= ta + tc, v * (tau - ta / 2), 1.0 - ramp(dur - tau)))
+    return np.where(dur > 0, np.where(tau >= dur, 1.0, r), 1.0)
+
+# --- CELLA LÉTREHOZÁSA ---
+
+def build_cell(spec, policy="ect"):
+    # {"arms": [{"base": [x, y], "params": {...}, "profile": "trapez"}, ...], "bins": [[x, y], ...]}
+    # A karok csuklótérben interpolálnak (egyenes pályás mód nélkül)
+    arms = []
+    for a in spec["arms"]:
+        m = build_model({"params": a.get("params", {}), "profile": a.get("profile", spec.get("profile", "trapez"))})
+        arms.append((m, tuple(a.get("base", (0.0, 0.0)))))
+    return Cell(arms, [tuple(b) for b in spec.get("bins", [(1.2, -0.6)])], policy)
+
+def line_cell_spec(count, spacing=0.8, seed=1):
+    # Egy sorba állított karok, fölöttük közös szalag, alattuk minden második kar után egy gyűjtő;
+    # a karok hossza kissé eltér (gyártási szórás)
+    rnd = random.Random(seed)
+    arms = [{"base": [i * spacing, 0.0],
+             "params": {"l3": round(1.2 * rnd.uniform(0.95, 1.05), 3),
+                        "l4": round(0.7 * rnd.uniform(0.95, 1.05), 3)}} for i in range(count)]
+    bins = [[i * spacing + 1.2, -0.6] for i in range(0, count, 2)]
+    area = [0.9, 0.4, (count - 1) * spacing + 1.8, 0.8]
+    return {"arms": arms, "bins": bins, "area": area}
+
+def poisson_picks(area, rate_per_min, horizon, seed=1):
+    # Véletlen felvételek a területen, Poisson-érkezéssel (időrendben, lustán)
+    rnd = random.Random(seed)
+    x0, y0, x1, y1 = area
+    t = 0.0
+    rate = rate_per_min / 60.0
+    while True:
+        t += rnd.expovariate(rate)
+        if t > horizon: return
+        yield rnd.uniform(x0, x1), rnd.uniform(y0, y1), t
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Többkaros cella szimulációja grafikus felület nélkül")
+    ap.add_argument("cell", nargs="?", help="cellaleírás (.json); nélküle --arms karos sor")
+    ap.add_argument("--arms", type=int, default=50)
+    ap.add_argument("--hours", type=float, default=1.0, help="szimulált idő (óra)")
+    ap.add_argument("--rate", type=float, help="felvétel/perc (alapértelmezés: karonként 15)")
+    ap.add_argument("--dt", type=float, default=0.1, help="ütemidő (s); 0 = csak események")
+    ap.add_argument("--policy", choices=("ect", "rr"), default="ect")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("-o", "--output", help="eredmény JSON fájlba")
+    args = ap.parse_args(argv)
+
+    spec = load_job(args.cell) if args.cell else line_cell_spec(args.arms, seed=args.seed)
+    cell = build_cell(spec, args.policy)
+    horizon = spec.get("duration", args.hours * 3600)
+    if "picks" in spec:
+        picks = sorted(((float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else 0.0)
+                        for p in spec["picks"]), key=lambda p: p[2])
+        horizon = None  # rögzített feladatsor: amíg minden kész (makespan)
+    else:
+        rate = args.rate if args.rate is not None else spec.get("rate", 15.0 * len(cell.arms))
+        area = spec.get("area") or line_cell_spec(len(cell.arms))["area"]
+        picks = poisson_picks(area, rate, horizon, args.seed)
+
+    t0 = time.perf_counter()
+    rep = cell.run(picks, horizon, args.dt)
+    elapsed = time.perf_counter() - t0
+    util = [a["utilization"] for a in rep["arms"]]
+    print(f"{len(cell.arms)} kar, {rep['horizon_s']:.0f} s szimulált idő, {elapsed:.2f} s futásidő", file=sys.stderr)
+    print(f"Felvétel: {rep['picks']} ({rep['throughput_ppm']:.1f}/perc), elutasítva: {rep['rejected']}, "
+          f"átlagos várakozás: {rep['mean_wait_s']:.2f} s, makespan: {rep['makespan_s']:.1f} s", file=sys.stderr)
+    if util:
+        print(f"Kihasználtság: átlag {sum(util) / len(util):.1%}, min {min(util):.1%}, max {max(util):.1%}",
+              file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rep, f, indent=2, ensure_ascii=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
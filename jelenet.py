@@ -0,0 +1,159 @@
+# A jelenet rajzolása bármilyen, a Tk Canvas create_* hívásait ismerő felületre: a grafikus
+# felület statikus és pont rétege, valamint a képkocka-kimentés (kepkocka.py) ugyanezt használja.
+# A jelenet (sc) adatai: model, scale, to_scr(x, y), bin_xy (None, ha nincs gyűjtő) és obstacles.
+import math
+
+class Scene:
+    # A rajzoláshoz szükséges adatok (folyamatok között átadható)
+    def __init__(self, model, width=1000, height=650, scale=100.0, origin=(100, 550),
+                 bin_xy=None, obstacles=()):
+        self.model = model
+        self.width, self.height = width, height
+        self.scale = scale
+        self.origin_x, self.origin_y = origin
+        self.bin_xy = bin_xy
+        self.obstacles = list(obstacles)
+
+    def to_scr(self, x, y):
+        return self.origin_x + x*self.scale, self.origin_y - y*self.scale
+
+def draw_static(c, sc, tags=(), prof=None):
+    st = tags
+    bx, by = sc.to_scr(0, 0)
+    sA = sc.to_scr(0,0)
+
+    # --- 1. HÁTTÉR ELEMEK ---
+    # Gyűjtőterület
+    if sc.bin_xy is not None:
+        bin_w_scr, bin_h_scr = 60, 40
+        bin_cx, bin_cy = sc.to_scr(*sc.bin_xy)
+        c.create_rectangle(bin_cx - bin_w_scr, bin_cy,
+                           bin_cx + bin_w_scr, bin_cy + bin_h_scr,
+                           fill="#DDDDDD", outline="#888888", width=2, tags=st)
+        c.create_rectangle(bin_cx - bin_w_scr + 5, bin_cy + 5,
+                           bin_cx + bin_w_scr - 5, bin_cy + bin_h_scr - 5,
+                           fill="#BBBBBB", outline="", tags=st)
+        c.create_text(bin_cx, bin_cy + bin_h_scr/2, text="GYŰJTŐ",
+                      fill="#555555", font=("Arial", 9, "bold"), tags=st)
+
+    # Akadályok
+    for ob in sc.obstacles:
+        x0, y0, x1, y1 = ob.bbox()
+        (sx0, sy0), (sx1, sy1) = sc.to_scr(x0, y1), sc.to_scr(x1, y0)
+        draw = c.create_oval if hasattr(ob, "r") else c.create_rectangle
+        draw(sx0, sy0, sx1, sy1, fill="#F4CCCC", outline="#CC0000", stipple="gray50", tags=st)
+    if prof: prof.lap("háttér")
+
+    # --- 2. KOORDINÁTA RENDSZER ---
+    grid_color = "#E0E0E0"
+    axis_color = "#444444"
+    max_coord = 7
+    axis_length = 6 * sc.scale
+
+    for i in range(1, max_coord):
+        sx = bx + i * sc.scale
+        c.create_line(sx, 0, sx, c.winfo_height(), fill=grid_color, tags=st)
+        sy = by - i * sc.scale
+        c.create_line(0, sy, c.winfo_width(), sy, fill=grid_color, tags=st)
+        sy_neg = by + i * sc.scale
+        c.create_line(0, sy_neg, c.winfo_width(), sy_neg, fill=grid_color, tags=st)
+
+    c.create_line(bx, by, bx + axis_length, by, fill=axis_color, arrow="last", width=1.5, tags=st)
+    c.create_line(bx, by, bx, 0, fill=axis_color, arrow="last", width=1.5, tags=st)
+
+    # Skála
+    for i in range(1, 6):
+        sx = bx + i * sc.scale
+        c.create_line(sx, by - 5, sx, by + 5, fill=axis_color, tags=st)
+        c.create_text(sx, by + 15, text=str(i), font=("Arial", 9), tags=st)
+        sy = by - i * sc.scale
+        c.create_line(bx - 5, sy, bx + 5, sy, fill=axis_color, tags=st)
+        c.create_text(bx - 15, sy, text=str(i), font=("Arial", 9), tags=st)
+
+    c.create_text(bx + axis_length + 20, by, text="X (m)", font=("Arial", 10, "bold"), tags=st)
+    c.create_text(bx, 20, text="Y (m)", font=("Arial", 10, "bold"), tags=st)
+    c.create_text(bx - 10, by + 10, text="O", font=("Arial", 10), tags=st)
+
+    # --- 3. TALAPZAT ---
+    pedestal_w, pedestal_h = 20, 7
+    c.create_rectangle(sA[0] - pedestal_w, sA[1] - pedestal_h,
+                       sA[0] + pedestal_w, sA[1] + pedestal_h,
+                       fill="#666666", outline="#333333", tags=st)
+    c.create_polygon([sA[0] - pedestal_w, sA[1] - pedestal_h,
+                      sA[0], sA[1] - pedestal_h - 10,
+                      sA[0] + pedestal_w, sA[1] - pedestal_h],
+                     fill="#444444", outline="#333333", tags=st)
+    if prof: prof.lap("rács")
+
+    # --- 4. MUNKATERÜLET ---
+    # Zárt alakú határívek, a léptékhez igazított (fél képpont hibájú) felbontással
+    ws = sc.model.workspace
+    pts = []
+    for x, y in zip(*ws.outline(sc.scale)):
+        pts.extend(sc.to_scr(x, y))
+    if pts:
+        c.create_polygon(pts, fill="#EFEFEF", outline="gray", dash=(5, 2), tags=st)
+
+    # --- Végpontok (A, B, C, D) ---
+    corners = ws.corners()
+    for name, dx, dy in (("A", -15, 0), ("B", 0, -15), ("C", 15, 0), ("D", 0, 15)):
+        if name not in corners: continue
+        sx, sy = sc.to_scr(*corners[name])
+        c.create_text(sx + dx, sy + dy, text=name, font=("Arial", 11, "bold"), tags=st)
+    if prof: prof.lap("munkaterület")
+
+def draw_points(c, sc, tags=()):
+    # Betanított pontok és a köztük futó útvonal
+    pt = tags
+    points = sc.model.points
+    for i, p in enumerate(points):
+        s = sc.to_scr(p[0], p[1])
+        c.create_oval(s[0]-4, s[1]-4, s[0]+4, s[1]+4, fill="#FFA500", outline="black", tags=pt)
+        c.create_text(s[0] + 10, s[1] - 10, text=str(i+1), font=("Arial", 8, "bold"), fill="#FFA500", tags=pt)
+        if i > 0:
+            prev = sc.to_scr(points[i-1][0], points[i-1][1])
+            c.create_line(prev[0], prev[1], s[0], s[1], width=2, fill="gray", tags=pt)
+
+def draw_arm(c, sc, phi32, phi43, holding, t):
+    # A kar mozgás közbeni képe egyszeri rajzolásra (a grafikus felület ugyanezt az elrendezést
+    # állandó elemekkel, coords/itemconfig hívásokkal mozgatja)
+    _, pB, pC = sc.model.forward_kinematics(phi32, phi43)
+    sA, sB, sC = sc.to_scr(0, 0), sc.to_scr(*pB), sc.to_scr(*pC)
+    w, so = 8, 4
+    rnd = "round"
+    bold = ("Arial", 10, "bold")
+    c.create_line(sA[0] + so, sA[1] + so, sB[0] + so, sB[1] + so, fill="#AAAAAA", width=w, capstyle=rnd)
+    c.create_line(sB[0] + so, sB[1] + so, sC[0] + so, sC[1] + so, fill="#AAAAAA", width=w - 2, capstyle=rnd)
+    c.create_line(sA[0], sA[1], sB[0], sB[1], fill="#C0C0C0", width=w, capstyle=rnd)
+    c.create_line(sA[0]-2, sA[1]-2, sB[0]-2, sB[1]-2, fill="#FFFFFF", width=w/3, capstyle=rnd)
+    c.create_text((sA[0]+sB[0])/2, (sA[1]+sB[1])/2 - 15, text="L3", font=bold)
+    c.create_line(sB[0], sB[1], sC[0], sC[1], fill="#A9A9A9", width=w - 2, capstyle=rnd)
+    c.create_line(sB[0]-2, sB[1]-2, sC[0]-2, sC[1]-2, fill="#D3D3D3", width=(w-2)/3, capstyle=rnd)
+    c.create_text((sB[0]+sC[0])/2 + 15, (sB[1]+sC[1])/2 - 15, text="L4", font=bold)
+
+    js = 6
+    c.create_oval(sA[0]-js, sA[1]-js, sA[0]+js, sA[1]+js, fill="#696969", outline="black")
+    c.create_oval(sA[0]-js+1, sA[1]-js+1, sA[0]+js-3, sA[1]+js-3, fill="#D3D3D3", outline="")
+    c.create_oval(sB[0]-js, sB[1]-js, sB[0]+js, sB[1]+js, fill="#888888", outline="black")
+    c.create_oval(sB[0]-js+1, sB[1]-js+1, sB[0]+js-3, sB[1]+js-3, fill="#EEEEEE", outline="")
+    es = 8
+    c.create_oval(sC[0]-es, sC[1]-es, sC[0]+es, sC[1]+es, fill="red", outline="black")
+    c.create_oval(sC[0]-es+2, sC[1]-es+2, sC[0]+es-4, sC[1]+es-4, fill="#FFCCCC", outline="")
+    if holding:
+        box_sz = 12
+        c.create_rectangle(sC[0]-box_sz, sC[1]-box_sz, sC[0]+box_sz, sC[1]+box_sz,
+                           fill="#FFFF00", outline="black", width=2)
+
+    # Koordináta-rendszer a könyökben és a szögek
+    d32, d43 = math.degrees(phi32), math.degrees(phi43)
+    rad = math.radians(d32)
+    c.create_line(sB[0], sB[1], sB[0] + 30 * math.cos(rad), sB[1] - 30 * math.sin(rad), fill="red", arrow="last")
+    rad2 = rad - math.pi/2
+    c.create_line(sB[0], sB[1], sB[0] + 30 * math.cos(rad2), sB[1] - 30 * math.sin(rad2), fill="green", arrow="last")
+    c.create_arc(sA[0]-25, sA[1]-25, sA[0]+25, sA[1]+25, start=0, extent=d32, outline="#FF0000", width=2)
+    c.create_text(sA[0]+35, sA[1]-10, text=f"{d32:.1f}°", fill="#FF0000", font=bold)
+    c.create_arc(sB[0]-25, sB[1]-25, sB[0]+25, sB[1]+25, start=d32, extent=-d43, outline="#FF0000", width=2)
+    c.create_text(sB[0]+20, sB[1]+20, text=f"{d43:.1f}°", fill="#FF0000", font=bold)
+
+    c.create_text(sC[0] + 50, sC[1] - 20, text=f"X: {pC[0]:.2f} m\nY: {pC[1]:.2f} m\nT: {t:.2f} s",
+                  fill="red", font=bold, anchor="w")
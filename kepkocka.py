@@ -0,0 +1,268 @@
+# Képkockák kimentése grafikus felület (Tk) nélkül: a grafikus felülettel közös jelenet (rács,
+# munkaterület, pontok, gyűjtő, akadályok, kar, megfogott tárgy, szögek) SVG-be, vagy ha
+# a Pillow telepítve van, PNG-be / animált GIF-be. A pálya egyszer tervződik meg, memóriába
+# leképezhető fájlba kerül, és a képkockákat több folyamat rajzolja párhuzamosan; az
+# idővonal-tartomány és a képkocka/s független a tervezés mintavételétől.
+#   python kepkocka.py feladat.json -o kockak/ --fps 25 --from 0 --to 60
+#   python kepkocka.py feladat.json --traj palya.traj -o futas.gif
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+from xml.sax.saxutils import escape
+
+from szimulacio import (Trajectory, TrajectoryPlayer, load_job, build_model, plan_job, bin_angles_for)
+from akadalyok import obstacles_from_json
+from jelenet import Scene, draw_static, draw_points, draw_arm
+
+def pil_or_none():
+    try:
+        from PIL import Image, ImageDraw
+        return Image, ImageDraw
+    except ImportError:
+        return None
+
+# --- RAJZFELÜLETEK ---
+# A Tk Canvas create_* hívásainak megfelelői, hogy a jelenet.py rajzoló kódja változatlanul
+# fusson rajtuk (a tags paramétert elfogadják, de nem használják).
+
+def arrow_head(x0, y0, x1, y1, length=8, half=4):
+    # A Tk "arrow=last" nyílhegye háromszögként
+    d = math.hypot(x1 - x0, y1 - y0) or 1.0
+    ux, uy = (x1 - x0) / d, (y1 - y0) / d
+    bx, by = x1 - ux * length, y1 - uy * length
+    return [x1, y1, bx - uy * half, by + ux * half, bx + uy * half, by - ux * half]
+
+class SvgCanvas:
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.parts = []
+
+    def winfo_width(self): return self.width
+    def winfo_height(self): return self.height
+
+    def _stroke(self, fill, width, dash):
+        s = f' stroke="{fill}" stroke-width="{width:g}"'
+        if dash: s += f' stroke-dasharray="{",".join(str(d) for d in dash)}"'
+        return s
+
+    def create_line(self, *xy, fill="black", width=1, dash=(), arrow=None, capstyle=None, tags=()):
+        pts = " ".join(f"{v:.1f}" for v in xy)
+        cap = ' stroke-linecap="round"' if capstyle == "round" else ""
+        self.parts.append(f'<polyline points="{pts}" fill="none"{self._stroke(fill, width, dash)}{cap}/>')
+        if arrow == "last":
+            self.create_polygon(arrow_head(*xy[-4:]), fill=fill, outline="")
+
+    def create_rectangle(self, x0, y0, x1, y1, fill="", outline="black", width=1, stipple=None, tags=()):
+        op = ' fill-opacity="0.5"' if stipple else ""
+        stroke = self._stroke(outline, width, ()) if outline else ""
+        self.parts.append(f'<rect x="{min(x0, x1):.1f}" y="{min(y0, y1):.1f}" width="{abs(x1 - x0):.1f}" '
+                          f'height="{abs(y1 - y0):.1f}" fill="{fill or "none"}"{op}{stroke}/>')
+
+    def create_oval(self, x0, y0, x1, y1, fill="", outline="black", width=1, stipple=None, tags=()):
+        op = ' fill-opacity="0.5"' if stipple else ""
+        stroke = self._stroke(outline, width, ()) if outline else ""
+        self.parts.append(f'<ellipse cx="{(x0 + x1) / 2:.1f}" cy="{(y0 + y1) / 2:.1f}" rx="{abs(x1 - x0) / 2:.1f}" '
+                          f'ry="{abs(y1 - y0) / 2:.1f}" fill="{fill or "none"}"{op}{stroke}/>')
+
+    def create_polygon(self, xy, fill="", outline="black", width=1, dash=(), tags=()):
+        pts = " ".join(f"{v:.1f}" for v in xy)
+        stroke = self._stroke(outline, width, dash) if outline else ""
+        self.parts.append(f'<polygon points="{pts}" fill="{fill or "none"}"{stroke}/>')
+
+    def create_arc(self, x0, y0, x1, y1, start=0.0, extent=90.0, outline="black", width=1, tags=()):
+        # Tk: fokban, 3 órától az óramutatóval ellentétesen (a képernyő y tengelye lefelé mutat)
+        cx, cy, r = (x0 + x1) / 2, (y0 + y1) / 2, abs(x1 - x0) / 2
+        a, b = math.radians(start), math.radians(start + extent)
+        large = 1 if abs(extent) > 180 else 0
+        sweep = 0 if extent > 0 else 1
+        self.parts.append(f'<path d="M {cx + r * math.cos(a):.1f} {cy - r * math.sin(a):.1f} '
+                          f'A {r:.1f} {r:.1f} 0 {large} {sweep} {cx + r * math.cos(b):.1f} {cy - r * math.sin(b):.1f}" '
+                          f'fill="none"{self._stroke(outline, width, ())}/>')
+
+    def create_text(self, x, y, text="", font=("Arial", 10), fill="black", anchor="center", tags=()):
+        h = {"w": "start", "nw": "start", "sw": "start", "e": "end", "ne": "end", "se": "end"}.get(anchor, "middle")
+        v = {"n": "hanging", "ne": "hanging", "nw": "hanging",
+             "s": "text-after-edge", "se": "text-after-edge", "sw": "text-after-edge"}.get(anchor, "central")
+        weight = ' font-weight="bold"' if "bold" in font[2:] else ""
+        lines = str(text).split("\n")
+        size = font[1]
+        if len(lines) > 1 and v == "central":
+            y -= (len(lines) - 1) * size * 0.6
+        spans = "".join(f'<tspan x="{x:.1f}" dy="{0 if k == 0 else size * 1.2:.1f}">{escape(s)}</tspan>'
+                        for k, s in enumerate(lines))
+        self.parts.append(f'<text x="{x:.1f}" y="{y:.1f}" font-family="{font[0]}" font-size="{size}"{weight} '
+                          f'fill="{fill}" text-anchor="{h}" dominant-baseline="{v}">{spans}</text>')
+
+    def document(self):
+        body = "\n".join(self.parts)
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                f'viewBox="0 0 {self.width} {self.height}">\n<rect width="100%" height="100%" fill="white"/>\n'
+                f'{body}\n</svg>\n')
+
+class PilCanvas:
+    # Ugyanez Pillow-val (a szöveg a beépített betűkészlettel)
+    def __init__(self, width, height, image=None):
+        Image, ImageDraw = pil_or_none()
+        self.width, self.height = width, height
+        self.image = image.copy() if image is not None else Image.new("RGB", (width, height), "white")
+        self.draw = ImageDraw.Draw(self.image)
+
+    def winfo_width(self): return self.width
+    def winfo_height(self): return self.height
+
+    def create_line(self, *xy, fill="black", width=1, dash=(), arrow=None, capstyle=None, tags=()):
+        self.draw.line(list(xy), fill=fill, width=max(1, round(width)),
+                       joint="curve" if capstyle == "round" else None)
+        if arrow == "last":
+            self.create_polygon(arrow_head(*xy[-4:]), fill=fill, outline="")
+
+    def create_rectangle(self, x0, y0, x1, y1, fill="", outline="black", width=1, stipple=None, tags=()):
+        self.draw.rectangle([min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)], fill=fill or None,
+                            outline=outline or None, width=max(1, round(width)))
+
+    def create_oval(self, x0, y0, x1, y1, fill="", outline="black", width=1, stipple=None, tags=()):
+        self.draw.ellipse([min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)], fill=fill or None,
+                          outline=outline or None, width=max(1, round(width)))
+
+    def create_polygon(self, xy, fill="", outline="black", width=1, dash=(), tags=()):
+        self.draw.polygon(list(xy), fill=fill or None, outline=outline or None)
+
+    def create_arc(self, x0, y0, x1, y1, start=0.0, extent=90.0, outline="black", width=1, tags=()):
+        # A Pillow az óramutató járásával egyezően, lefelé mutató y-nal számol
+        a, b = -(start + extent), -start
+        self.draw.arc([x0, y0, x1, y1], min(a, b), max(a, b), fill=outline, width=max(1, round(width)))
+
+    def create_text(self, x, y, text="", font=("Arial", 10), fill="black", anchor="center", tags=()):
+        w, h = self.draw.multiline_textbbox((0, 0), str(text))[2:]
+        dx = {"w": 0, "nw": 0, "sw": 0, "e": -w, "ne": -w, "se": -w}.get(anchor, -w / 2)
+        dy = {"n": 0, "ne": 0, "nw": 0, "s": -h, "se": -h, "sw": -h}.get(anchor, -h / 2)
+        self.draw.multiline_text((x + dx, y + dy), str(text), fill=fill)
+
+# --- PÁRHUZAMOS KIMENTÉS ---
+
+_ctx = None
+
+def init_worker(scene, traj_path, out_dir, fmt, times):
+    # Folyamatonként egyszer: a pálya memóriába leképezve, a statikus réteg előre megrajzolva
+    global _ctx
+    player = TrajectoryPlayer(Trajectory.load(traj_path), clock=lambda: 0.0)
+    if fmt == "svg":
+        base = SvgCanvas(scene.width, scene.height)
+    else:
+        base = PilCanvas(scene.width, scene.height)
+    draw_static(base, scene)
+    draw_points(base, scene)
+    if fmt != "svg": base = base.image
+    _ctx = (scene, player, out_dir, fmt, times, base)
+
+def render_frames(span):
+    # span: (első, utolsó+1) képkocka-sorszám; visszatér: a kiírt kockák száma
+    scene, player, out_dir, fmt, times, base = _ctx
+    for i in range(*span):
+        player.seek(times[i])
+        st = player.state()
+        if fmt == "svg":
+            c = SvgCanvas(scene.width, scene.height)
+            c.parts = list(base.parts)
+        else:
+            c = PilCanvas(scene.width, scene.height, base)
+        if st is not None:
+            draw_arm(c, scene, *st)
+        path = os.path.join(out_dir, f"kocka_{i:05d}.{fmt}")
+        if fmt == "svg":
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(c.document())
+        else:
+            c.image.save(path)
+    return span[1] - span[0]
+
+def frame_times(duration, fps, t_from=0.0, t_to=None):
+    t_to = duration if t_to is None else min(t_to, duration)
+    t_from = max(0.0, t_from)
+    count = int(math.floor((t_to - t_from) * fps + 1e-9)) + 1 if t_to >= t_from else 0
+    return [t_from + k / fps for k in range(count)]
+
+def export_frames(scene, traj_path, out_dir, times, fmt="svg", processes=None):
+    # A képkockák egyenletes darabokban oszlanak el a folyamatok között
+    processes = processes or os.cpu_count() or 1
+    n = len(times)
+    if n == 0: return 0
+    chunk = max(1, -(-n // (processes * 4)))
+    spans = [(k, min(n, k + chunk)) for k in range(0, n, chunk)]
+    args = (scene, traj_path, out_dir, fmt, times)
+    if processes == 1 or len(spans) == 1:
+        init_worker(*args)
+        return sum(render_frames(s) for s in spans)
+    with Pool(min(processes, len(spans)), initializer=init_worker, initargs=args) as pool:
+        return sum(pool.imap_unordered(render_frames, spans))
+
+def write_gif(frame_dir, count, fps, path):
+    Image, _ = pil_or_none()
+    frames = (Image.open(os.path.join(frame_dir, f"kocka_{i:05d}.png")) for i in range(count))
+    first = next(frames)
+    first.save(path, save_all=True, append_images=frames, duration=round(1000 / fps), loop=0)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Animáció képkockáinak kimentése grafikus felület nélkül")
+    ap.add_argument("job", help="feladatfájl (.json) vagy pontlista (soronként x y)")
+    ap.add_argument("-o", "--output", required=True, help="könyvtár a képkockáknak, vagy .gif fájl")
+    ap.add_argument("--traj", help="kész pálya (szimulacio.py --traj); nélküle a feladatból tervez")
+    ap.add_argument("--format", choices=("svg", "png"), default="svg", help="képkockák formátuma")
+    ap.add_argument("--fps", type=float, default=25.0)
+    ap.add_argument("--from", dest="t_from", type=float, default=0.0, help="kezdő időpont (s)")
+    ap.add_argument("--to", dest="t_to", type=float, help="záró időpont (s)")
+    ap.add_argument("--size", default="1000x650", help="képméret képpontban (SzxM)")
+    ap.add_argument("-j", "--jobs", type=int, help="folyamatok száma (alapértelmezés: minden mag)")
+    args = ap.parse_args(argv)
+
+    gif = args.output.lower().endswith(".gif")
+    fmt = "png" if gif else args.format
+    if fmt == "png" and pil_or_none() is None:
+        print("Hiba: PNG/GIF kimenethez a Pillow csomag szükséges (SVG nélküle is megy).", file=sys.stderr)
+        return 1
+    if args.fps <= 0:
+        print("Hiba: A képkocka/s legyen pozitív.", file=sys.stderr)
+        return 1
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    job = load_job(args.job)
+    model = build_model(job)
+    bin_xy = tuple(job.get("bin", (1.2, -0.6))) if job.get("mode", "normal") == "rakodas" else None
+    scene = Scene(model, width, height, bin_xy=bin_xy, obstacles=obstacles_from_json(job.get("obstacles", [])))
+
+    bin_angles = bin_angles_for(model, *bin_xy) if bin_xy is not None else None
+    if bin_xy is not None and not bin_angles:
+        print("Hiba: A gyűjtő fizikailag nem elérhető!", file=sys.stderr)
+        return 1
+    # Az ideiglenes könyvtár (tervezett pálya, GIF-hez a kockák) hiba esetén is törlődik
+    with tempfile.TemporaryDirectory(prefix="kepkocka_") as tmp:
+        traj_path = args.traj
+        if traj_path is None:
+            start = (model.rad_min32, model.rad_min43)
+            traj_path = os.path.join(tmp, "palya.traj")
+            Trajectory.from_samples(plan_job(model, model.points, start, int(job.get("n", 12)),
+                                             bin_angles)).save(traj_path)
+        duration = TrajectoryPlayer(Trajectory.load(traj_path)).duration
+        times = frame_times(duration, args.fps, args.t_from, args.t_to)
+        if not times:
+            print(f"Hiba: A megadott időtartomány üres (a pálya {duration:.2f} s hosszú).", file=sys.stderr)
+            return 1
+        out_dir = tmp if gif else args.output
+        os.makedirs(out_dir, exist_ok=True)
+
+        t0 = time.perf_counter()
+        count = export_frames(scene, traj_path, out_dir, times, fmt, args.jobs)
+        if gif and count:
+            write_gif(out_dir, count, args.fps, args.output)
+        elapsed = time.perf_counter() - t0
+    span = times[-1] - times[0]
+    print(f"{count} képkocka ({span:.1f} s pályaidő, {args.fps:g} kocka/s) {elapsed:.2f} s alatt -> {args.output}",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# Beépített teljesítménymérés a grafikus felülethez (alapból kikapcsolva).
+# Bekapcsolva gyűjti: a rajzolás szakaszonkénti idejét, az IK/FK hívások számát másodpercenként,
+# a lejátszó pufferének mélységét, a táblázatba írás idejét és az ütemező késését.
+# Kikapcsolva a mért kód csak egy None-ellenőrzést fizet: a modell metódusai ilyenkor
+# nincsenek becsomagolva.
+import json
+import time
+from collections import deque
+
+class Profiler:
+    WINDOW = 120  # a kijelzés ennyi utolsó mérés átlagát és maximumát mutatja
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.model = None
+        self.reset()
+
+    def reset(self):
+        self.series = {}   # név -> az utolsó WINDOW érték
+        self.totals = {}   # név -> [darab, összeg, maximum] a mérés kezdete óta
+        self.counts = {}   # hívásszámlálók a folyó másodpercben
+        self.rates = {}    # hívás/s az előző lezárt időablakban
+        self.rate_t0 = self.clock()
+        self.started = time.time()
+        self._lap = self.rate_t0
+
+    # --- Gyűjtés ---
+
+    def record(self, name, value):
+        s = self.series.get(name)
+        if s is None:
+            s = self.series[name] = deque(maxlen=self.WINDOW)
+            self.totals[name] = [0, 0.0, value]
+        s.append(value)
+        t = self.totals[name]
+        t[0] += 1
+        t[1] += value
+        if value > t[2]: t[2] = value
+
+    def lap_start(self):
+        self._lap = self.clock()
+
+    def lap(self, name):
+        # Az előző lap_start()/lap() óta eltelt idő a megadott szakaszhoz
+        now = self.clock()
+        self.record(name, now - self._lap)
+        self._lap = now
+
+    def count(self, name, k=1):
+        self.counts[name] = self.counts.get(name, 0) + k
+
+    def tick(self):
+        # Képkockánként hívva; másodpercenként lezárja a hívásszámlálókat
+        now = self.clock()
+        dt = now - self.rate_t0
+        if dt >= 1.0:
+            self.rates = {k: v / dt for k, v in self.counts.items()}
+            self.counts = {}
+            self.rate_t0 = now
+
+    # --- A modell kinematikájának számlálása ---
+
+    def instrument(self, model):
+        # Példányszintű csomagolók: az osztály (és más modellek) érintetlen marad
+        self.uninstrument()
+        self.model = model
+        fk, ik = model.forward_kinematics, model.inverse_kinematics
+        fkb, ikb = model.forward_kinematics_batch, model.inverse_kinematics_batch
+        count = self.count
+
+        def forward_kinematics(*args, **kw):
+            count("fk")
+            return fk(*args, **kw)
+        def inverse_kinematics(*args, **kw):
+            count("ik")
+            return ik(*args, **kw)
+        def forward_kinematics_batch(phi32, *args, **kw):
+            count("fk", len(phi32))
+            return fkb(phi32, *args, **kw)
+        def inverse_kinematics_batch(xs, *args, **kw):
+            count("ik", len(xs))
+            return ikb(xs, *args, **kw)
+
+        model.forward_kinematics = forward_kinematics
+        model.inverse_kinematics = inverse_kinematics
+        model.forward_kinematics_batch = forward_kinematics_batch
+        model.inverse_kinematics_batch = inverse_kinematics_batch
+
+    def uninstrument(self):
+        if self.model is None: return
+        for name in ("forward_kinematics", "inverse_kinematics",
+                     "forward_kinematics_batch", "inverse_kinematics_batch"):
+            self.model.__dict__.pop(name, None)
+        self.model = None
+
+    # --- Kiértékelés ---
+
+    def summary(self):
+        out = {}
+        for name, s in self.series.items():
+            n, total, peak = self.totals[name]
+            out[name] = {"last": s[-1], "avg": sum(s) / len(s), "max": max(s),
+                         "count": n, "avg_all": total / n, "max_all": peak}
+        return out
+
+    def overlay_lines(self):
+        # Rövid szöveges összesítés a vászonra (idők ms-ban)
+        lines = []
+        for name, m in sorted(self.summary().items()):
+            if name == "sor_mélység":
+                lines.append(f"{name:14s} {m['last']:7.0f}  max {m['max']:7.0f}")
+            else:
+                lines.append(f"{name:14s} {m['avg'] * 1000:7.2f}  max {m['max'] * 1000:7.2f} ms")
+        for name in ("fk", "ik"):
+            lines.append(f"{name + '/s':14s} {self.rates.get(name, 0.0):9.0f}")
+        return lines
+
+    def export(self, path):
+        data = {"started": self.started, "duration": time.time() - self.started,
+                "metrics": self.summary(), "rates": self.rates,
+                "series": {k: list(v) for k, v in self.series.items()}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
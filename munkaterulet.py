@@ -0,0 +1,197 @@
+# A munkaterület zárt alakban: a határ négy körív, amelyek középpontja és sugara közvetlenül
+# l3-ból, l4-ből és a szöghatárokból adódik:
+#   φ43 = min / max:  az origó körüli ív, sugara R(φ43) = sqrt(l3² + l4² + 2·l3·l4·cos φ43)
+#   φ32 = max / min:  a könyök (B) körüli ív, sugara l4
+# A terület pontosan l3·l4·Δφ32·(cos φ43min - cos φ43max) (a Jacobi-determináns l3·l4·sin φ43).
+# A sokszög csak rajzoláshoz kell, és a kért képponthibával (lépték szerint) bontható fel.
+# Az IK csak 0 <= φ43 <= π könyökállást ad, ezért a határok is erre szűkülnek.
+# Az IK a φ32-t egyetlen ágon adja: φ32 = atan2(y, x) + offset(φ43), vagyis a végpont
+# polárszöge (φ32 - offset) csak (-π, π]-be eshet. Ha a φ32 határok ezen túlnyúlnak (széles
+# tartomány, egymásra hajló ívek), a négy ív már nem az elérhető tartomány határa: ilyenkor
+# (exact = False) a terület numerikus integrál, a sokszög pedig a (-π, π]-re vágott tartomány
+# határa (φ43 szerint mintavételezve). A contains() mindkét esetben az IK döntését adja.
+import math
+
+class Arc:
+    # Körív (cx, cy) középponttal, r sugárral, a0-tól a1-ig (radián, előjeles irány)
+    def __init__(self, cx, cy, r, a0, a1):
+        self.cx, self.cy, self.r, self.a0, self.a1 = cx, cy, r, a0, a1
+
+    def point(self, a):
+        return self.cx + self.r * math.cos(a), self.cy + self.r * math.sin(a)
+
+    def segments(self, scale, tol_px):
+        # Legkevesebb húr, amelynél az ív és a húr legnagyobb eltérése (nyílmagasság) <= tol_px
+        span = abs(self.a1 - self.a0)
+        r_px = self.r * scale
+        if span == 0 or r_px <= tol_px / 2:
+            return 1
+        step = 2 * math.acos(1 - tol_px / r_px)
+        return max(1, int(math.ceil(span / step)))
+
+    def points(self, scale, tol_px):
+        n = self.segments(scale, tol_px)
+        return [self.point(self.a0 + (self.a1 - self.a0) * k / n) for k in range(n + 1)]
+
+class Workspace:
+    OUTLINE_CACHE = 8  # ennyi (lépték, tűrés) felbontást tart meg
+
+    def __init__(self, model):
+        self.model = model
+        self.key = None
+        self._outlines = {}
+
+    def _update(self):
+        # Lusta újraszámolás: csak ha a hosszak vagy a határok változtak
+        m = self.model
+        key = (m.l3, m.l4, m.rad_min32, m.rad_max32, m.rad_min43, m.rad_max43)
+        if key == self.key: return
+        self.key = key
+        self._outlines = {}
+        self.min32, self.max32 = m.rad_min32, m.rad_max32
+        self.min43, self.max43 = max(0.0, m.rad_min43), min(math.pi, m.rad_max43)
+        self.empty = self.min32 > self.max32 or self.min43 > self.max43
+        self.arc_list = [] if self.empty else self._arcs(m.l3, m.l4)
+        lo_off, hi_off = (0.0, 0.0) if self.empty else self.offset_range()
+        self.exact = self.empty or (self.min32 - hi_off >= -math.pi and self.max32 - lo_off <= math.pi)
+
+    def _arcs(self, l3, l4):
+        # A határ körüljárási sorrendben: φ43 = min, φ32 = max, φ43 = max, φ32 = min
+        lo, hi = self.min43, self.max43
+        d_lo, d_hi = self.offset(lo), self.offset(hi)
+        b_max = (l3 * math.cos(self.max32), l3 * math.sin(self.max32))
+        b_min = (l3 * math.cos(self.min32), l3 * math.sin(self.min32))
+        return [Arc(0.0, 0.0, self.radius(lo), self.min32 - d_lo, self.max32 - d_lo),
+                Arc(b_max[0], b_max[1], l4, self.max32 - lo, self.max32 - hi),
+                Arc(0.0, 0.0, self.radius(hi), self.max32 - d_hi, self.min32 - d_hi),
+                Arc(b_min[0], b_min[1], l4, self.min32 - hi, self.min32 - lo)]
+
+    # --- Zárt alakú mennyiségek ---
+
+    def radius(self, phi43):
+        m = self.model
+        return math.sqrt(max(0.0, m.l3 ** 2 + m.l4 ** 2 + 2 * m.l3 * m.l4 * math.cos(phi43)))
+
+    def offset(self, phi43):
+        # A végpont polárszöge φ32 - offset(φ43)
+        m = self.model
+        return math.atan2(m.l4 * math.sin(phi43), m.l3 + m.l4 * math.cos(phi43))
+
+    def offset_range(self):
+        # offset(φ43) legkisebb és legnagyobb értéke [min43, max43]-on: a végpontokban vagy
+        # a belső szélsőértéknél (cos φ43 = -l4/l3, csak l4 < l3 esetén)
+        m = self.model
+        cands = [self.min43, self.max43]
+        if m.l4 < m.l3:
+            crit = math.acos(-m.l4 / m.l3)
+            if self.min43 < crit < self.max43: cands.append(crit)
+        offs = [self.offset(a) for a in cands]
+        return min(offs), max(offs)
+
+    def theta_range(self, phi43):
+        # A végpont polárszögének tartománya adott φ43-nál, az IK ágára (-π, π]-re vágva
+        d = self.offset(phi43)
+        return max(self.min32 - d, -math.pi), min(self.max32 - d, math.pi)
+
+    def arcs(self):
+        # A négy határív; csak exact esetén írják le pontosan az elérhető tartományt
+        self._update()
+        return list(self.arc_list)
+
+    def area(self, steps=2048):
+        self._update()
+        if self.empty: return 0.0
+        m = self.model
+        if self.exact:
+            return m.l3 * m.l4 * (self.max32 - self.min32) * (math.cos(self.min43) - math.cos(self.max43))
+        # Simpson-szabály φ43 szerint: dA = l3·l4·sin φ43 · (vágott szögtartomány) dφ43
+        h = (self.max43 - self.min43) / steps
+        total = 0.0
+        for k in range(steps + 1):
+            a = self.min43 + k * h
+            t0, t1 = self.theta_range(a)
+            w = 1 if k in (0, steps) else (4 if k % 2 else 2)
+            total += w * math.sin(a) * max(0.0, t1 - t0)
+        return m.l3 * m.l4 * total * h / 3
+
+    def corners(self):
+        # A, B, C, D: (φ32, φ43) = (max, max), (max, min), (min, min), (min, max)
+        self._update()
+        if self.empty: return {}
+        a = self.arc_list
+        return {"A": a[1].point(a[1].a1), "B": a[0].point(a[0].a1),
+                "C": a[0].point(a[0].a0), "D": a[2].point(a[2].a1)}
+
+    def contains(self, x, y, eps=0.001):
+        # Ugyanaz a döntés, mint az inverse_kinematics() határellenőrzése
+        self._update()
+        if self.empty: return False
+        m = self.model
+        d = math.hypot(x, y)
+        if d == 0: return False
+        c = (d * d - m.l3 ** 2 - m.l4 ** 2) / (2 * m.l3 * m.l4)
+        if not -1.0 <= c <= 1.0: return False
+        phi43 = math.acos(c)
+        if not self.min43 - eps <= phi43 <= self.max43 + eps: return False
+        phi32 = math.atan2(y, x) + self.offset(phi43)
+        return self.min32 - eps <= phi32 <= self.max32 + eps
+
+    def bbox(self):
+        # A befoglaló téglalap (x0, y0, x1, y1) az ívek pontos szélsőértékeivel
+        # (vágott tartománynál a sokszögből)
+        self._update()
+        if self.empty: return None
+        if not self.exact:
+            xs, ys = self.outline()
+            return min(xs), min(ys), max(xs), max(ys)
+        xs, ys = [], []
+        for arc in self.arc_list:
+            lo, hi = min(arc.a0, arc.a1), max(arc.a0, arc.a1)
+            angles = [arc.a0, arc.a1]
+            k = math.ceil(lo / (math.pi / 2))
+            while k * math.pi / 2 <= hi:
+                angles.append(k * math.pi / 2)
+                k += 1
+            for a in angles:
+                px, py = arc.point(a)
+                xs.append(px); ys.append(py)
+        return min(xs), min(ys), max(xs), max(ys)
+
+    # --- Felbontásfüggő sokszög ---
+
+    def outline(self, scale=100.0, tol_px=0.5):
+        # A határ sokszöge (xs, ys), képpontban legfeljebb tol_px eltéréssel; gyorsítótárazva
+        self._update()
+        key = (scale, tol_px)
+        out = self._outlines.get(key)
+        if out is None:
+            xs, ys = [], []
+            arcs = self.arc_list if self.exact else self._clipped_arcs(scale, tol_px)
+            for arc in arcs:
+                pts = arc.points(scale, tol_px) if isinstance(arc, Arc) else arc
+                for px, py in pts[:-1]:  # a végpont a következő ív kezdete
+                    xs.append(px); ys.append(py)
+            out = (xs, ys)
+            if len(self._outlines) >= self.OUTLINE_CACHE:
+                self._outlines.pop(next(iter(self._outlines)))
+            self._outlines[key] = out
+        return out
+
+    def _clipped_arcs(self, scale, tol_px):
+        # A (-π, π]-re vágott tartomány határa ugyanabban a körüljárási sorrendben: a két
+        # origó körüli ív a vágott szögtartománnyal, a két oldal φ43 szerint mintavételezve
+        # (a lépésköz a könyök körüli l4 sugarú ív felbontása, kétszeres sűrítéssel)
+        lo, hi = self.min43, self.max43
+        n = 2 * Arc(0.0, 0.0, self.model.l4, lo, hi).segments(scale, tol_px)
+        samples = [lo + (hi - lo) * k / n for k in range(n + 1)]
+        ranges = [self.theta_range(a) for a in samples]
+        ranges = [(t0, max(t0, t1)) for t0, t1 in ranges]  # üres szakaszon nulla szélesség
+
+        radii = [self.radius(a) for a in samples]
+
+        def side(i, order):
+            return [(radii[k] * math.cos(ranges[k][i]), radii[k] * math.sin(ranges[k][i])) for k in order]
+        return [Arc(0.0, 0.0, radii[0], ranges[0][0], ranges[0][1]),
+                side(1, range(n + 1)),
+                Arc(0.0, 0.0, radii[-1], ranges[-1][1], ranges[-1][0]),
+                side(0, range(n, -1, -1))]
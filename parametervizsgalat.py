@@ -0,0 +1,168 @@
+# Tervezési tér bejárása: a kar geometriája (l3, l4) és a szöghatárok rács- vagy véletlen
+# kombinációinak kiértékelése az összes processzormagon. Kombinációnként: munkaterület
+# területe, a célpontok elérhető hányada, a gyűjtő elérhetősége és a becsült ciklusidő
+# (a teljes feladaté, ha minden célpont elérhető, és külön az elérhető részhalmazé).
+# Az eredmények soronként (JSON Lines) íródnak ki, így a futás megszakítás után folytatható:
+#   python parametervizsgalat.py feladat.json -o eredmeny.jsonl --l3 1.0:1.6:7 --max_phi32 70:90:5
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from szimulacio import (RobotArmModel, MotionProfile, load_job,
+                        bin_angles_for, job_cycle_time)
+
+SWEEP_PARAMS = ("l3", "l4", "min_phi32", "max_phi32", "min_phi43", "max_phi43")
+
+def parse_range(text):
+    # "a:b:n" -> n egyenletes érték [a, b]-n; "a" -> egyetlen érték; "a,b,c" -> felsorolás
+    if ":" in text:
+        a, b, n = text.split(":")
+        a, b, n = float(a), float(b), int(n)
+        return [a + (b - a) * k / (n - 1) for k in range(n)] if n > 1 else [a]
+    return [float(v) for v in text.split(",")]
+
+def grid_combinations(ranges):
+    # Determinisztikus sorrend: a folytatáshoz ugyanazt a listát kell kapni
+    combos = [{}]
+    for name in SWEEP_PARAMS:
+        if name not in ranges: continue
+        combos = [dict(c, **{name: v}) for c in combos for v in ranges[name]]
+    return combos
+
+def random_combinations(ranges, count, seed):
+    rnd = random.Random(seed)
+    return [{name: rnd.uniform(min(vals), max(vals)) for name, vals in ranges.items()}
+            for _ in range(count)]
+
+def combo_key(combo):
+    return json.dumps({k: round(combo[k], 9) for k in sorted(combo)}, sort_keys=True)
+
+# --- MUNKAFOLYAMAT (egy kombináció kiértékelése) ---
+
+_job = None
+
+def init_worker(job):
+    global _job
+    _job = job
+
+def evaluate(combo, job=None):
+    job = job or _job
+    model = RobotArmModel()
+    for k, v in job.get("params", {}).items():
+        setattr(model, k, float(v))
+    for k, v in combo.items():
+        setattr(model, k, v)
+    model.profile = job.get("profile", model.profile)
+    model.calc_rad_limits()
+
+    result = {"params": combo, "valid": (model.min_phi32 < model.max_phi32 and
+                                         model.min_phi43 < model.max_phi43 and model.l3 > 0 and model.l4 > 0)}
+    if not result["valid"]:
+        return result
+
+    result["area"] = model.workspace.area()
+
+    targets = job.get("points", [])
+    tx = [float(p[0]) for p in targets]
+    ty = [float(p[1]) for p in targets]
+    phi32, phi43, ok = model.inverse_kinematics_batch(tx, ty)
+    reach = [(tx[i], ty[i], float(phi32[i]), float(phi43[i])) for i in range(len(tx)) if ok[i]]
+    result["reachable"] = len(reach) / len(tx) if tx else 1.0
+
+    bin_x, bin_y = job.get("bin", (1.2, -0.6))
+    bin_angles = bin_angles_for(model, bin_x, bin_y)
+    result["bin_reachable"] = bin_angles is not None
+    result["bin_within_limits"] = bin_angles is not None and model.within_limits(*bin_angles)
+
+    # cycle_time: a teljes feladaté, csak ha minden célpont elérhető (különben None);
+    # cycle_time_reachable: csak az elérhető célpontokon
+    start = (model.rad_min32, model.rad_min43)
+    if job.get("mode", "normal") == "rakodas":
+        sub = job_cycle_time(model, reach, start, bin_angles)[0] if bin_angles is not None else None
+    else:
+        sub = job_cycle_time(model, reach, start)[0]
+    result["cycle_time_reachable"] = sub
+    result["cycle_time"] = sub if len(reach) == len(tx) else None
+    return result
+
+# --- FUTTATÁS ---
+
+def done_keys(path):
+    # A már kiírt kombinációk és az utolsó teljes sor végének bájtpozíciója: a félbeszakadt
+    # utolsó sor (nincs utána "\n") nem számít késznek, és a folytatás előtt levágódik
+    keys = set()
+    end = 0
+    if not os.path.exists(path): return keys, end
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"): break
+            end += len(line)
+            try:
+                keys.add(combo_key(json.loads(line)["params"]))
+            except (ValueError, KeyError):
+                pass
+    return keys, end
+
+def run_sweep(job, combos, out_path, processes=None, chunksize=None):
+    done, end = done_keys(out_path)
+    todo = [c for c in combos if combo_key(c) not in done]
+    print(f"{len(combos)} kombináció, ebből {len(done & {combo_key(c) for c in combos})} kész, "
+          f"{len(todo)} hátra van", file=sys.stderr)
+    if not todo: return 0
+
+    processes = processes or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(todo) // (processes * 8))
+    t0 = time.perf_counter()
+    if os.path.exists(out_path):
+        os.truncate(out_path, end)
+    with open(out_path, "a", encoding="utf-8") as out:
+        if processes == 1:
+            results = (evaluate(c, job) for c in todo)
+            pool = None
+        else:
+            pool = Pool(processes, initializer=init_worker, initargs=(job,))
+            results = pool.imap_unordered(evaluate, todo, chunksize)
+        try:
+            for k, res in enumerate(results, 1):
+                # Rekordonként kiírva: megszakításkor legfeljebb a félig írt sor vész el
+                out.write(json.dumps(res, ensure_ascii=False) + "\n")
+                out.flush()
+                if k % 100 == 0:
+                    print(f"{k}/{len(todo)} ({time.perf_counter() - t0:.1f} s)", file=sys.stderr)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    print(f"Kész: {len(todo)} kombináció, {time.perf_counter() - t0:.2f} s, {processes} folyamat",
+          file=sys.stderr)
+    return len(todo)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Kar-geometria és szöghatárok tervezési terének bejárása")
+    ap.add_argument("job", help="célpontok: feladatfájl (.json) vagy pontlista (soronként x y)")
+    ap.add_argument("-o", "--output", required=True, help="eredmények (JSON Lines, folytatható)")
+    for name in SWEEP_PARAMS:
+        ap.add_argument(f"--{name}", metavar="A:B:N", help=f"{name} értékei (A:B:N vagy lista)")
+    ap.add_argument("--random", type=int, metavar="N", help="rács helyett N véletlen kombináció")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--profile", choices=MotionProfile.KINDS)
+    ap.add_argument("-j", "--processes", type=int, help="folyamatok száma (alapértelmezés: összes mag)")
+    args = ap.parse_args(argv)
+
+    job = load_job(args.job)
+    if args.profile: job["profile"] = args.profile
+    ranges = {name: parse_range(getattr(args, name)) for name in SWEEP_PARAMS
+              if getattr(args, name) is not None}
+    if not ranges:
+        ap.error("legalább egy paramétertartomány kell (pl. --l3 1.0:1.6:7)")
+    combos = (random_combinations(ranges, args.random, args.seed) if args.random
+              else grid_combinations(ranges))
+    run_sweep(job, combos, args.output, args.processes)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
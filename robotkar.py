@@ -1,86 +1,188 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import math
-
-# --- 1. MATEMATIKAI MODELL ---
-
-class RobotArmModel:
-    def __init__(self):
-        # Adatok
-        self.l3 = 1.2
-        self.l4 = 0.7
-        self.min_phi32 = 25.0
-        self.max_phi32 = 80.0
-        self.min_phi43 = 45.0
-        self.max_phi43 = 135.0
-        self.tgy = 0.5
-        self.v = 0.5
-        
-        self.points = []
-        self.calc_rad_limits()
-
-    def calc_rad_limits(self):
-        self.rad_min32 = math.radians(self.min_phi32)
-        self.rad_max32 = math.radians(self.max_phi32)
-        self.rad_min43 = math.radians(self.min_phi43)
-        self.rad_max43 = math.radians(self.max_phi43)
-
-    def forward_kinematics(self, phi32, phi43):
-        ax, ay = 0, 0
-        bx = self.l3 * math.cos(phi32)
-        by = self.l3 * math.sin(phi32)
-        
-        # Könyök jobbra/lefelé hajlik
-        abs_angle = phi32 - phi43
-        
-        cx = bx + self.l4 * math.cos(abs_angle)
-        cy = by + self.l4 * math.sin(abs_angle)
-        
-        return (ax, ay), (bx, by), (cx, cy)
-
-    def inverse_kinematics(self, x, y, check_limits=True):
-        dist_sq = x**2 + y**2
-        dist = math.sqrt(dist_sq)
-        
-        if dist > (self.l3 + self.l4) or dist < abs(self.l3 - self.l4) or dist == 0:
-            return None
-
-        val = (self.l3**2 + self.l4**2 - dist_sq) / (2 * self.l3 * self.l4)
-        val = max(-1.0, min(1.0, val))
-        
-        gamma = math.acos(val)
-        phi43 = math.pi - gamma
-
-        beta = math.atan2(y, x)
-        
-        val_alpha = (self.l3**2 + dist_sq - self.l4**2) / (2 * self.l3 * dist)
-        val_alpha = max(-1.0, min(1.0, val_alpha))
-        alpha = math.acos(val_alpha)
-        
-        phi32 = beta + alpha
-
-        if check_limits:
-            eps = 0.001
-            if not (self.rad_min32 - eps <= phi32 <= self.rad_max32 + eps):
-                return None
-            if not (self.rad_min43 - eps <= phi43 <= self.rad_max43 + eps):
-                return None
-
-        return phi32, phi43
+import queue
+import time
+from collections import deque
+
+from utvonal import optimize_route
+from akadalyok import obstacles_from_json, bin_obstacle, watch_collisions
+from meres import Profiler
+import jelenet
+from celfolyam import TargetServer, DEFAULT_SOCKET
+from szimulacio import (RobotArmModel, ReachabilityMap, TrajectoryPlayer, TrajectoryLog, MotionProfile,
+                        SegmentCache, DWELL_TIME, plan_job, live_job, job_segments, bin_angles_for, table_row)
+
+# --- 1. RAJZOLÁS ÜTEMEZŐ ---
+
+class RenderScheduler:
+    # A rajzolási kérések csak "piszkosnak" jelölik a jelenetet; képkockánként
+    # legfeljebb egy újrarajzolás fut, egyetlen after() visszahíváson keresztül.
+    def __init__(self, root, paint, fps=60):
+        self.root = root
+        self.paint = paint
+        self.set_fps(fps)
+        self.pending = None
+        self.dirty = False
+        self.requested_at = None
+        self.scheduled_at = None
+        self.delay_s = 0.0
+        self.last_frame = None
+        self.profiler = None  # bekapcsolt mérésnél: a kért és a tényleges after() késés eltérése
+        self.tasks = []     # képkocka előtt futó feladatok (pl. animáció léptetése)
+        self.frames = 0
+        self.coalesced = 0  # összevont (fölösleges) kérések
+        self.dropped = 0    # a keretidőn túli késés miatt kimaradt képkockák
+
+    def set_fps(self, fps):
+        self.fps = max(1.0, float(fps))
+        self.frame_s = 1.0 / self.fps
+
+    def request(self, task=None):
+        if task is not None and task not in self.tasks:
+            self.tasks.append(task)
+        now = time.perf_counter()
+        if self.dirty:
+            self.coalesced += 1
+        else:
+            self.dirty = True
+            self.requested_at = now
+        if self.pending is None:
+            delay = 0
+            if self.last_frame is not None:
+                delay = max(0, int((self.last_frame + self.frame_s - now) * 1000))
+            self.pending = self.root.after(delay, self.frame)
+            self.scheduled_at, self.delay_s = now, delay / 1000
+
+    def frame(self):
+        now = time.perf_counter()
+        if self.profiler is not None and self.scheduled_at is not None:
+            self.profiler.record("ütemező_késés", max(0.0, now - self.scheduled_at - self.delay_s))
+        due = self.requested_at if self.requested_at is not None else now
+        if self.last_frame is not None:
+            due = max(due, self.last_frame + self.frame_s)
+        late = now - due
+        if late > self.frame_s:
+            self.dropped += int(late / self.frame_s)
+        self.last_frame = now
+        self.pending = None
+        self.dirty = False
+        self.requested_at = None
+
+        # A feladatok újra kérhetnek rajzolást - az már a következő képkockára kerül
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task()
+        self.paint()
+        self.frames += 1
+
+    def stats(self):
+        return {"fps": self.fps, "frames": self.frames,
+                "coalesced": self.coalesced, "dropped": self.dropped}
+
+# --- 1b. VIRTUÁLIS TÁBLÁZAT ---
+
+class VirtualTable:
+    # A Treeview-ban csak a látható sorok léteznek (fix számú elem, újrahasznosítva);
+    # az adatok a TrajectoryLog-ban vannak. Ha a nézet az alján áll, követi az új sorokat.
+    def __init__(self, tree, scrollbar, log, height):
+        self.tree = tree
+        self.sb = scrollbar
+        self.log = log
+        self.height = height
+        self.top = 0
+        self.follow = True
+        self._shown = None
+        self.items = [tree.insert("", "end", values=()) for _ in range(height)]
+        scrollbar.configure(command=self.on_scroll)
+        for ev in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(ev, self.on_wheel)
+
+    def max_top(self):
+        return max(0, len(self.log) - self.height)
+
+    def on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.log))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.top = max(0, min(self.max_top(), self.top))
+        self.follow = self.top >= self.max_top()
+        self.refresh()
+
+    def on_wheel(self, e):
+        if getattr(e, "num", None) == 4 or getattr(e, "delta", 0) > 0:
+            self.on_scroll("scroll", -1, "units")
+        else:
+            self.on_scroll("scroll", 1, "units")
+        return "break"
+
+    def reset(self):
+        self.top = 0
+        self.follow = True
+        self.refresh()
+
+    def refresh(self):
+        size = len(self.log)
+        if self.follow:
+            self.top = self.max_top()
+        self.top = min(self.top, self.max_top())
+        key = (self.log.total, size, self.top)
+        if key == self._shown: return
+        self._shown = key
+        for k, item in enumerate(self.items):
+            i = self.top + k
+            if i < size:
+                n, ti, zi, xi, p32, p43 = self.log.row(i)
+                self.tree.item(item, values=(f"{n}", f"{ti:.2f} s", f"{zi:.2f}", f"{xi:.2f}",
+                                             f"{p32:.1f}", f"{p43:.1f}"))
+            else:
+                self.tree.item(item, values=())
+        if size:
+            self.sb.set(self.top / size, min(1.0, (self.top + self.height) / size))
+        else:
+            self.sb.set(0.0, 1.0)
 
 # --- 2. GRAFIKUS FELÜLET ---
 
 class RobotApp:
+    LOG_LIMIT = 1000000  # ennél több sor esetén a legrégebbiek kiesnek a naplóból
+    ROUTE_BUDGET = 1.0   # az útvonal-optimalizálás időkerete (s)
+    CYCLE_SLICE = 0.004  # képkockánként ennyi időt (s) kap a ciklusidő becslése
+    STREAM_QUEUE = 1024  # ellenőrzött, még át nem vett élő célpontok (a fogadó szálon)
+    LIVE_BUFFER = 32     # ennyi élő célpont várhat a mozgásra; fölötte a küldő fékeződik
+    STREAM_POLL_MS = 20
+
     def __init__(self, root):
         self.root = root
         self.root.title("Robotkar Szimuláció ")
         self.root.geometry("1280x768") 
 
         self.model = RobotArmModel()
+        self.reach = ReachabilityMap(self.model)
+        # Újratervezéskor csak a megváltozott szakaszok számolódnak újra
+        self.seg_cache = SegmentCache()
         self.is_moving = False
         self.is_paused = False
-        self.anim_queue = []
+        self.player = None
         self.mouse_ik_angles = None 
+        self.anim_info = None
+        self.cycle_est = None   # a folyamatban lévő ciklusidő-becslés (start után)
+
+        # Megtartott rajzelemek (rétegek kulcsai és a kar elem-azonosítói)
+        self._static_key = None
+        self._points_key = None
+        self.arm_items = {}
+
+        # Teljesítménymérés (None = kikapcsolva, a rajzolás ilyenkor nem mér)
+        self.profiler = None
+        self.overlay_item = None
+
+        # Élő célpontfolyam (külön szálon fogad; a Tk szál csak a sorból vesz át)
+        self.stream = None
+        self.live_targets = deque()
+        self._live_key = None
         
         # Állapotjelző a rakodáshoz
         self.is_holding_object = False 
@@ -89,6 +191,9 @@ class RobotApp:
         self.bin_x = 1.2
         self.bin_y = -0.6
 
+        # Betöltött akadályok (a gyűjtő rakodás módban automatikusan hozzáadódik)
+        self.obstacles = []
+
         # Layout
         self.left_frame = tk.Frame(root, width=320, bg="#f0f0f0", padx=10, pady=10)
         self.left_frame.pack(side="left", fill="y")
@@ -107,20 +212,26 @@ class RobotApp:
         self.origin_y = 550 
         self.scale = 100.0
 
+        # Minden újrarajzolás ezen az ütemezőn megy át
+        self.scheduler = RenderScheduler(self.root, self.draw, fps=60)
+
         self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<Button-3>", self.on_canvas_right_click)
         self.canvas.bind("<Motion>", self.on_mouse_move) 
         self.root.bind("<Configure>", self.on_resize)
         
         self.update_model_from_ui()
-        self.draw()
+        self.request_draw()
 
     def setup_controls(self):
         # 1. Változók 
         vf = tk.LabelFrame(self.left_frame, text="Változók", bg="#f0f0f0")
         vf.pack(fill="x", pady=5)
-        headers = ["L3(m)", "L4(m)", "φ32min(fok)", "φ32max(fok)", "φ43min(fok)", "φ43max(fok)", "tgy(s)", "v(m/s)"]
+        headers = ["L3(m)", "L4(m)", "φ32min(fok)", "φ32max(fok)", "φ43min(fok)", "φ43max(fok)", "tgy(s)", "v(m/s)",
+                   "ω32max(fok/s)", "ω43max(fok/s)"]
         defaults = [self.model.l3, self.model.l4, self.model.min_phi32, self.model.max_phi32, 
-                    self.model.min_phi43, self.model.max_phi43, self.model.tgy, self.model.v]
+                    self.model.min_phi43, self.model.max_phi43, self.model.tgy, self.model.v,
+                    self.model.w32_max, self.model.w43_max]
         self.entries = []
         for i, h in enumerate(headers):
             tk.Label(vf, text=h, bg="#f0f0f0").grid(row=i, column=0, sticky="e")
@@ -136,9 +247,38 @@ class RobotApp:
         self.pick_place_var = tk.BooleanVar(value=False)
         cb = tk.Checkbutton(mf, text="Rakodás Mód", 
                             variable=self.pick_place_var, bg="#f0f0f0", 
-                            font=("Arial", 10, "bold"), command=self.draw)
+                            font=("Arial", 10, "bold"), command=self.request_draw)
         cb.pack(padx=10, pady=5, anchor="w")
 
+        # Sebességprofil és a becsült ciklusidő
+        pf = tk.Frame(mf, bg="#f0f0f0")
+        pf.pack(fill="x", padx=10)
+        tk.Label(pf, text="Profil:", bg="#f0f0f0").pack(side="left")
+        self.profile_var = tk.StringVar(value=self.model.profile)
+        tk.OptionMenu(pf, self.profile_var, *MotionProfile.KINDS).pack(side="left")
+        self.line_var = tk.BooleanVar(value=self.model.straight_line)
+        tk.Checkbutton(mf, text="Egyenes pálya", variable=self.line_var,
+                       bg="#f0f0f0").pack(padx=10, anchor="w")
+        self.optimize_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(mf, text="Útvonal optimalizálás", variable=self.optimize_var,
+                       bg="#f0f0f0").pack(padx=10, anchor="w")
+        self.cycle_var = tk.StringVar(value="Ciklusidő: -")
+        tk.Label(mf, textvariable=self.cycle_var, bg="#f0f0f0").pack(padx=10, anchor="w")
+        self.collision_var = tk.StringVar(value="")
+        tk.Label(mf, textvariable=self.collision_var, bg="#f0f0f0", fg="#c00").pack(padx=10, anchor="w")
+        tk.Button(mf, text="Akadályok betöltése", command=self.load_obstacles).pack(fill="x", padx=10, pady=2)
+        prf = tk.Frame(mf, bg="#f0f0f0")
+        prf.pack(fill="x", padx=10)
+        self.profile_on_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(prf, text="Teljesítménymérés", variable=self.profile_on_var,
+                       bg="#f0f0f0", command=self.toggle_profiler).pack(side="left")
+        tk.Button(prf, text="Mérés mentése", command=self.export_metrics).pack(side="right")
+        self.stream_on_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(mf, text=f"Élő célpontok ({DEFAULT_SOCKET})", variable=self.stream_on_var,
+                       bg="#f0f0f0", command=self.toggle_stream).pack(padx=10, anchor="w")
+        self.stream_var = tk.StringVar(value="")
+        tk.Label(mf, textvariable=self.stream_var, bg="#f0f0f0").pack(padx=10, anchor="w")
+
 
         # 3. Adattáblázat
         df = tk.LabelFrame(self.left_frame, text="Adatok", bg="#f0f0f0")
@@ -155,13 +295,20 @@ class RobotApp:
             w = 50 if col == "Time" else 40
             self.tree.column(col, width=w, anchor="center")
             
-        sb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=sb.set)
+        sb = ttk.Scrollbar(tree_frame, orient="vertical")
         
         self.tree.pack(side="left", fill="x", expand=True)
         sb.pack(side="right", fill="y")
+
+        # A napló a memóriában tömören tárolódik; a táblázat csak a látható sorokat mutatja
+        self.log = TrajectoryLog(limit=self.LOG_LIMIT)
+        self.table = VirtualTable(self.tree, sb, self.log, height=8)
         
         tk.Button(df, text="Lista Törlése", command=self.clear_tbl).pack(side="bottom", fill="x", pady=5)
+        ef = tk.Frame(df, bg="#f0f0f0")
+        ef.pack(side="bottom", fill="x")
+        tk.Button(ef, text="Mentés CSV", command=self.export_csv).pack(side="left", fill="x", expand=True)
+        tk.Button(ef, text="Mentés .npy", command=self.export_npy).pack(side="left", fill="x", expand=True)
 
         # 4. Gombok
         bf = tk.Frame(self.left_frame, bg="#f0f0f0")
@@ -175,6 +322,17 @@ class RobotApp:
         self.div_var = tk.StringVar(value="12")
         tk.Entry(sub, textvariable=self.div_var, width=5).grid(row=1, column=1)
 
+        # Lejátszás: szünet, sebesség-szorzó és tekerés
+        tk.Button(sub, text="Szünet", command=self.toggle_pause).grid(row=0, column=2)
+        self.speed_var = tk.DoubleVar(value=1.0)
+        tk.Scale(bf, label="Sebesség (x)", variable=self.speed_var, orient="horizontal",
+                 from_=TrajectoryPlayer.MIN_SPEED, to=TrajectoryPlayer.MAX_SPEED, resolution=0.1,
+                 bg="#f0f0f0", command=self.on_speed).pack(fill="x")
+        self.seek_var = tk.DoubleVar(value=0.0)
+        tk.Scale(bf, label="Pozíció (%)", variable=self.seek_var, orient="horizontal",
+                 from_=0, to=100, resolution=0.1, showvalue=False,
+                 bg="#f0f0f0", command=self.on_seek).pack(fill="x")
+
     def update_model_from_ui(self, e=None):
         try:
             v = [float(x.get()) for x in self.entries]
@@ -182,135 +340,186 @@ class RobotApp:
             self.model.min_phi32, self.model.max_phi32 = v[2], v[3]
             self.model.min_phi43, self.model.max_phi43 = v[4], v[5]
             self.model.tgy, self.model.v = v[6], v[7]
+            self.model.w32_max, self.model.w43_max = v[8], v[9]
             self.model.calc_rad_limits()
-            self.draw()
+            self.request_draw()
         except: pass
 
+    def reach_lookup(self, px, py):
+        self.reach.update(self.origin_x, self.origin_y, self.scale,
+                          self.canvas.winfo_width(), self.canvas.winfo_height())
+        return self.reach.lookup(px, py)
+
     def on_mouse_move(self, e):
         if self.is_moving: return
+        if self.reach_lookup(e.x, e.y) == ReachabilityMap.OUTSIDE:
+            # Munkaterületen kívül: nincs IK, és ha nem változott semmi, újrarajzolás sem
+            if self.mouse_ik_angles is None: return
+            self.mouse_ik_angles = None
+            self.request_draw()
+            return
         wx = (e.x - self.origin_x) / self.scale
         wy = (self.origin_y - e.y) / self.scale
         res = self.model.inverse_kinematics(wx, wy)
         if res: self.mouse_ik_angles = res
         else: self.mouse_ik_angles = None
-        self.draw()
+        self.request_draw()
 
     def on_canvas_click(self, e):
         if self.is_moving: return
+        if self.reach_lookup(e.x, e.y) == ReachabilityMap.OUTSIDE:
+            print("Hiba: A pont kívül esik a munkaterületen!")
+            return
         wx = (e.x - self.origin_x) / self.scale
         wy = (self.origin_y - e.y) / self.scale
         res = self.model.inverse_kinematics(wx, wy)
         if res:
             self.model.points.append((wx, wy, res[0], res[1]))
             self.mouse_ik_angles = None 
-            self.draw()
+            self.request_draw()
         else:
             print("Hiba: A pont kívül esik a munkaterületen!")
 
+    def on_canvas_right_click(self, e):
+        # A legközelebbi pont törlése (a gyorsítótárból csak a szomszédos szakaszok esnek ki)
+        if self.is_moving or not self.model.points: return
+        pts = self.model.points
+        i = min(range(len(pts)), key=lambda k: (self.to_scr(*pts[k][:2])[0] - e.x) ** 2 +
+                                               (self.to_scr(*pts[k][:2])[1] - e.y) ** 2)
+        sx, sy = self.to_scr(*pts[i][:2])
+        if (sx - e.x) ** 2 + (sy - e.y) ** 2 <= 10 ** 2:
+            self.model.points = pts[:i] + pts[i+1:]
+            self.request_draw()
+
+    def request_draw(self, e=None):
+        self.scheduler.request()
+
     def to_scr(self, x, y):
         return self.origin_x + x*self.scale, self.origin_y - y*self.scale
 
     def draw(self):
-        self.canvas.delete("all")
-        bx, by = self.to_scr(0, 0)
+        # Rétegzett rajzolás: a statikus és a pont réteg csak változáskor épül újra,
+        # a kar elemei állandó azonosítóval mozognak (coords/itemconfig)
+        m = self.model
+        prof = self.profiler
+        if prof: t0 = prof.clock()
+        static_key = (m.l3, m.l4, m.min_phi32, m.max_phi32, m.min_phi43, m.max_phi43,
+                      self.scale, self.origin_x, self.origin_y,
+                      self.canvas.winfo_width(), self.canvas.winfo_height(),
+                      self.pick_place_var.get(), id(self.obstacles), len(self.obstacles))
+        if static_key != self._static_key:
+            if prof: prof.lap_start()
+            self.draw_static()
+            self._static_key = static_key
+
+        points_key = (id(m.points), len(m.points), m.points[-1] if m.points else None,
+                      self.scale, self.origin_x, self.origin_y)
+        if points_key != self._points_key:
+            if prof: prof.lap_start()
+            self.draw_points()
+            if prof: prof.lap("pontok")
+            self._points_key = points_key
+
+        live_key = (len(self.live_targets), self.live_targets[-1] if self.live_targets else None,
+                    self.scale, self.origin_x, self.origin_y)
+        if live_key != self._live_key:
+            self.draw_live()
+            self._live_key = live_key
+
+        if prof: prof.lap_start()
+        self.draw_arm()
+        if prof:
+            prof.lap("kar")
+            prof.record("rajzolás", prof.clock() - t0)
+            prof.tick()
+            self.draw_overlay()
+
+    def draw_overlay(self):
+        # Mérési adatok a vászon jobb felső sarkában (egyetlen, újrahasznosított szövegelem)
+        c = self.canvas
+        if self.overlay_item is None:
+            self.overlay_item = c.create_text(0, 0, anchor="ne", font=("Courier", 9),
+                                              fill="#004080", tags=("overlay",))
+        c.coords(self.overlay_item, c.winfo_width() - 10, 10)
+        c.itemconfig(self.overlay_item, text="\n".join(self.profiler.overlay_lines()))
+        c.tag_raise("overlay")
+
+    @property
+    def bin_xy(self):
+        # A közös jelenetrajzoló (jelenet.py) ebből tudja, van-e gyűjtő
+        return (self.bin_x, self.bin_y) if self.pick_place_var.get() else None
+
+    def draw_static(self):
+        c = self.canvas
+        c.delete("static")
+        jelenet.draw_static(c, self, ("static",), self.profiler)
+        # A statikus réteg mindig legalul marad
+        c.tag_lower("static")
+
+    def draw_live(self):
+        # A mozgásra váró élő célpontok (legfeljebb LIVE_BUFFER darab)
+        c = self.canvas
+        c.delete("live")
+        for p in self.live_targets:
+            if p is None: continue
+            sx, sy = self.to_scr(p[0], p[1])
+            c.create_oval(sx-3, sy-3, sx+3, sy+3, fill="#66CCFF", outline="#0066AA", tags=("live",))
+
+    def draw_points(self):
+        # Pontok - mindig a kar fölött
+        c = self.canvas
+        c.delete("points")
+        jelenet.draw_points(c, self, ("points",))
+        c.tag_raise("points")
+
+    def create_arm_items(self):
+        # A kar elemei egyszer jönnek létre, utána csak mozgatjuk őket
+        c = self.canvas
+        ar = ("arm",)
+        shadow_color = "#AAAAAA"
+        bold = ("Arial", 10, "bold")
+        it = {}
+        # Árnyék
+        it["shadow3"] = c.create_line(0, 0, 0, 0, fill=shadow_color, capstyle=tk.ROUND, tags=ar)
+        it["shadow4"] = c.create_line(0, 0, 0, 0, fill=shadow_color, capstyle=tk.ROUND, tags=ar)
+        # Karok
+        it["l3"] = c.create_line(0, 0, 0, 0, capstyle=tk.ROUND, tags=ar)
+        it["l3_hl"] = c.create_line(0, 0, 0, 0, fill="#FFFFFF", capstyle=tk.ROUND, tags=ar)
+        it["l3_txt"] = c.create_text(0, 0, text="L3", font=bold, tags=ar)
+        it["l4"] = c.create_line(0, 0, 0, 0, capstyle=tk.ROUND, tags=ar)
+        it["l4_hl"] = c.create_line(0, 0, 0, 0, fill="#D3D3D3", capstyle=tk.ROUND, tags=ar)
+        it["l4_txt"] = c.create_text(0, 0, text="L4", font=bold, tags=ar)
+        # Ízületek
+        it["jA"] = c.create_oval(0, 0, 0, 0, fill="#696969", outline="black", tags=ar)
+        it["jA_in"] = c.create_oval(0, 0, 0, 0, fill="#D3D3D3", outline="", tags=ar)
+        it["jB"] = c.create_oval(0, 0, 0, 0, fill="#888888", outline="black", tags=ar)
+        it["jB_in"] = c.create_oval(0, 0, 0, 0, fill="#EEEEEE", outline="", tags=ar)
+        # Végpont és megfogott tárgy
+        it["eff"] = c.create_oval(0, 0, 0, 0, fill="red", outline="black", tags=ar)
+        it["eff_in"] = c.create_oval(0, 0, 0, 0, fill="#FFCCCC", outline="", tags=ar)
+        it["box"] = c.create_rectangle(0, 0, 0, 0, fill="#FFFF00", outline="black", width=2, tags=ar)
+        # Koordináta-rendszer és szögek
+        it["cs_x"] = c.create_line(0, 0, 0, 0, fill="red", arrow="last", tags=ar)
+        it["cs_y"] = c.create_line(0, 0, 0, 0, fill="green", arrow="last", tags=ar)
+        it["arc32"] = c.create_arc(0, 0, 0, 0, style="arc", outline="#FF0000", width=2, tags=ar)
+        it["txt32"] = c.create_text(0, 0, fill="#FF0000", font=bold, tags=ar)
+        it["arc43"] = c.create_arc(0, 0, 0, 0, style="arc", outline="#FF0000", width=2, tags=ar)
+        it["txt43"] = c.create_text(0, 0, fill="#FF0000", font=bold, tags=ar)
+        # Animáció közbeni adatkijelzés
+        it["data"] = c.create_text(0, 0, fill="red", font=bold, anchor="w", state="hidden", tags=ar)
+        self.arm_items = it
+        self._arm_style = None
+        # A rétegsorrend ne függjön a létrehozás sorrendjétől: pontok és jelölések a kar fölött
+        c.tag_raise("points")
+        c.tag_raise("overlay")
+
+    def draw_arm(self):
+        if not self.arm_items:
+            self.create_arm_items()
+        c = self.canvas
+        it = self.arm_items
         sA = self.to_scr(0,0)
 
-        # --- 1. HÁTTÉR ELEMEK ---
-        # Gyűjtőterület 
-        if self.pick_place_var.get():
-            bin_w_scr, bin_h_scr = 60, 40
-            bin_cx, bin_cy = self.to_scr(self.bin_x, self.bin_y)
-            self.canvas.create_rectangle(bin_cx - bin_w_scr, bin_cy, 
-                                         bin_cx + bin_w_scr, bin_cy + bin_h_scr,
-                                         fill="#DDDDDD", outline="#888888", width=2)
-            self.canvas.create_rectangle(bin_cx - bin_w_scr + 5, bin_cy + 5, 
-                                         bin_cx + bin_w_scr - 5, bin_cy + bin_h_scr - 5,
-                                         fill="#BBBBBB", outline="")
-            self.canvas.create_text(bin_cx, bin_cy + bin_h_scr/2, text="GYŰJTŐ", 
-                                    fill="#555555", font=("Arial", 9, "bold"))
-
-
-        # --- 2. KOORDINÁTA RENDSZER ---
-        grid_color = "#E0E0E0"
-        axis_color = "#444444"
-        max_coord = 7 
-        axis_length = 6 * self.scale
-        
-        for i in range(1, max_coord):
-            sx = bx + i * self.scale
-            self.canvas.create_line(sx, 0, sx, self.canvas.winfo_height(), fill=grid_color) 
-            sy = by - i * self.scale
-            self.canvas.create_line(0, sy, self.canvas.winfo_width(), sy, fill=grid_color) 
-            sy_neg = by + i * self.scale
-            self.canvas.create_line(0, sy_neg, self.canvas.winfo_width(), sy_neg, fill=grid_color)
-
-        self.canvas.create_line(bx, by, bx + axis_length, by, fill=axis_color, arrow="last", width=1.5)
-        self.canvas.create_line(bx, by, bx, 0, fill=axis_color, arrow="last", width=1.5) 
-        
-        # Skála
-        for i in range(1, 6):
-            sx = bx + i * self.scale
-            self.canvas.create_line(sx, by - 5, sx, by + 5, fill=axis_color) 
-            self.canvas.create_text(sx, by + 15, text=str(i), font=("Arial", 9))
-            sy = by - i * self.scale
-            self.canvas.create_line(bx - 5, sy, bx + 5, sy, fill=axis_color) 
-            self.canvas.create_text(bx - 15, sy, text=str(i), font=("Arial", 9))
-            
-        self.canvas.create_text(bx + axis_length + 20, by, text="X (m)", font=("Arial", 10, "bold"))
-        self.canvas.create_text(bx, 20, text="Y (m)", font=("Arial", 10, "bold"))
-        self.canvas.create_text(bx - 10, by + 10, text="O", font=("Arial", 10))
-
-        # --- 3. TALAPZAT ---
-        pedestal_w, pedestal_h = 20, 7 
-        self.canvas.create_rectangle(sA[0] - pedestal_w, sA[1] - pedestal_h, 
-                                     sA[0] + pedestal_w, sA[1] + pedestal_h, 
-                                     fill="#666666", outline="#333333")
-        self.canvas.create_polygon([sA[0] - pedestal_w, sA[1] - pedestal_h, 
-                                    sA[0], sA[1] - pedestal_h - 10, 
-                                    sA[0] + pedestal_w, sA[1] - pedestal_h],
-                                    fill="#444444", outline="#333333")
-
-
-        # --- 4. MUNKATERÜLET ---
-        pts = []
-        step = 2
-        for d in range(int(self.model.min_phi32), int(self.model.max_phi32)+1, step):
-            r32 = math.radians(d)
-            _, _, p = self.model.forward_kinematics(r32, self.model.rad_min43)
-            sc = self.to_scr(*p)
-            pts.extend(sc)
-        for d in range(int(self.model.min_phi43), int(self.model.max_phi43)+1, step):
-            r43 = math.radians(d)
-            _, _, p = self.model.forward_kinematics(self.model.rad_max32, r43)
-            sc = self.to_scr(*p)
-            pts.extend(sc)
-        for d in range(int(self.model.max_phi32), int(self.model.min_phi32)-1, -step):
-            r32 = math.radians(d)
-            _, _, p = self.model.forward_kinematics(r32, self.model.rad_max43)
-            sc = self.to_scr(*p)
-            pts.extend(sc)
-        for d in range(int(self.model.max_phi43), int(self.model.min_phi43)-1, -step):
-            r43 = math.radians(d)
-            _, _, p = self.model.forward_kinematics(self.model.rad_min32, r43)
-            sc = self.to_scr(*p)
-            pts.extend(sc)
-        
-        self.canvas.create_polygon(pts, fill="#EFEFEF", outline="gray", dash=(5, 2))
-
-        # --- Végpontok (A, B, C, D) ---
-        _, _, pA_end = self.model.forward_kinematics(self.model.rad_max32, self.model.rad_max43)
-        sa = self.to_scr(*pA_end)
-        self.canvas.create_text(sa[0]-15, sa[1], text="A", font=("Arial", 11, "bold"))
-        _, _, pB_end = self.model.forward_kinematics(self.model.rad_max32, self.model.rad_min43)
-        sb = self.to_scr(*pB_end)
-        self.canvas.create_text(sb[0], sb[1]-15, text="B", font=("Arial", 11, "bold"))
-        _, _, pC_end = self.model.forward_kinematics(self.model.rad_min32, self.model.rad_min43)
-        sc = self.to_scr(*pC_end)
-        self.canvas.create_text(sc[0]+15, sc[1], text="C", font=("Arial", 11, "bold"))
-        _, _, pD_end = self.model.forward_kinematics(self.model.rad_min32, self.model.rad_max43)
-        sd = self.to_scr(*pD_end)
-        self.canvas.create_text(sd[0], sd[1]+15, text="D", font=("Arial", 11, "bold"))
-
         # --- 5. ROBOTKAR ---
         target_p32, target_p43 = self.model.rad_min32, self.model.rad_min43
         is_tracking = False
@@ -327,216 +536,350 @@ class RobotApp:
         sB = self.to_scr(*pB)
         sC = self.to_scr(*pC)
 
-        fill_L3 = "#C0C0C0" 
-        fill_L4 = "#A9A9A9" 
-        L3_highlight = "#FFFFFF"
-        L4_highlight = "#D3D3D3"
-        kar_vastagsag = 8
-        shadow_offset = 4
-        
-        if is_tracking:
-            fill_L3 = "#AAAAAA" 
-            fill_L4 = "#888888" 
-            dash_style = (2, 4) 
-            kar_vastagsag = 5
-            shadow_offset = 2
-        else:
-            dash_style = () 
+        kar_vastagsag = 5 if is_tracking else 8
+        shadow_offset = 2 if is_tracking else 4
+
+        # Stílus csak követés be/ki váltáskor változik
+        if self._arm_style != is_tracking:
+            if is_tracking:
+                fill_L3, fill_L4, dash_style, hl_state = "#AAAAAA", "#888888", (2, 4), "hidden"
+            else:
+                fill_L3, fill_L4, dash_style, hl_state = "#C0C0C0", "#A9A9A9", (), "normal"
+            c.itemconfig(it["shadow3"], width=kar_vastagsag, dash=dash_style)
+            c.itemconfig(it["shadow4"], width=kar_vastagsag - 2, dash=dash_style)
+            c.itemconfig(it["l3"], width=kar_vastagsag, fill=fill_L3, dash=dash_style)
+            c.itemconfig(it["l4"], width=kar_vastagsag - 2, fill=fill_L4, dash=dash_style)
+            c.itemconfig(it["l3_hl"], width=kar_vastagsag/3, state=hl_state)
+            c.itemconfig(it["l4_hl"], width=(kar_vastagsag-2)/3, state=hl_state)
+            self._arm_style = is_tracking
 
         # Árnyék
-        shadow_color = "#AAAAAA"
-        self.canvas.create_line(sA[0] + shadow_offset, sA[1] + shadow_offset, 
-                                sB[0] + shadow_offset, sB[1] + shadow_offset, 
-                                width=kar_vastagsag, fill=shadow_color, 
-                                capstyle=tk.ROUND, dash=dash_style)
-        self.canvas.create_line(sB[0] + shadow_offset, sB[1] + shadow_offset, 
-                                sC[0] + shadow_offset, sC[1] + shadow_offset, 
-                                width=kar_vastagsag - 2, fill=shadow_color, 
-                                capstyle=tk.ROUND, dash=dash_style)
+        so = shadow_offset
+        c.coords(it["shadow3"], sA[0] + so, sA[1] + so, sB[0] + so, sB[1] + so)
+        c.coords(it["shadow4"], sB[0] + so, sB[1] + so, sC[0] + so, sC[1] + so)
 
         # Karok
-        self.canvas.create_line(sA[0], sA[1], sB[0], sB[1], 
-                                width=kar_vastagsag, fill=fill_L3, 
-                                capstyle=tk.ROUND, dash=dash_style)
-        if not is_tracking:
-            self.canvas.create_line(sA[0]-2, sA[1]-2, sB[0]-2, sB[1]-2,
-                                    width=kar_vastagsag/3, fill=L3_highlight, capstyle=tk.ROUND)
-        self.canvas.create_text((sA[0]+sB[0])/2, (sA[1]+sB[1])/2 - 15, text="L3", font=("Arial", 10, "bold"))
-                                
-        self.canvas.create_line(sB[0], sB[1], sC[0], sC[1], 
-                                width=kar_vastagsag - 2, fill=fill_L4, 
-                                capstyle=tk.ROUND, dash=dash_style)
-        if not is_tracking:
-            self.canvas.create_line(sB[0]-2, sB[1]-2, sC[0]-2, sC[1]-2,
-                                    width=(kar_vastagsag-2)/3, fill=L4_highlight, capstyle=tk.ROUND)
-        self.canvas.create_text((sB[0]+sC[0])/2 + 15, (sB[1]+sC[1])/2 - 15, text="L4", font=("Arial", 10, "bold"))
+        c.coords(it["l3"], sA[0], sA[1], sB[0], sB[1])
+        c.coords(it["l3_hl"], sA[0]-2, sA[1]-2, sB[0]-2, sB[1]-2)
+        c.coords(it["l3_txt"], (sA[0]+sB[0])/2, (sA[1]+sB[1])/2 - 15)
+        c.coords(it["l4"], sB[0], sB[1], sC[0], sC[1])
+        c.coords(it["l4_hl"], sB[0]-2, sB[1]-2, sC[0]-2, sC[1]-2)
+        c.coords(it["l4_txt"], (sB[0]+sC[0])/2 + 15, (sB[1]+sC[1])/2 - 15)
 
         # Ízületek
-        joint_size = 6
-        end_effector_size = 8
-        self.canvas.create_oval(sA[0]-joint_size, sA[1]-joint_size, sA[0]+joint_size, sA[1]+joint_size, fill="#696969", outline="black")
-        self.canvas.create_oval(sA[0]-joint_size+1, sA[1]-joint_size+1, sA[0]+joint_size-3, sA[1]+joint_size-3, fill="#D3D3D3", outline="") 
-        self.canvas.create_oval(sB[0]-joint_size, sB[1]-joint_size, sB[0]+joint_size, sB[1]+joint_size, fill="#888888", outline="black")
-        self.canvas.create_oval(sB[0]-joint_size+1, sB[1]-joint_size+1, sB[0]+joint_size-3, sB[1]+joint_size-3, fill="#EEEEEE", outline="") 
+        js = 6
+        c.coords(it["jA"], sA[0]-js, sA[1]-js, sA[0]+js, sA[1]+js)
+        c.coords(it["jA_in"], sA[0]-js+1, sA[1]-js+1, sA[0]+js-3, sA[1]+js-3)
+        c.coords(it["jB"], sB[0]-js, sB[1]-js, sB[0]+js, sB[1]+js)
+        c.coords(it["jB_in"], sB[0]-js+1, sB[1]-js+1, sB[0]+js-3, sB[1]+js-3)
 
         # Végpont
-        self.canvas.create_oval(sC[0]-end_effector_size, sC[1]-end_effector_size, sC[0]+end_effector_size, sC[1]+end_effector_size, fill="red", outline="black")
-        self.canvas.create_oval(sC[0]-end_effector_size+2, sC[1]-end_effector_size+2, sC[0]+end_effector_size-4, sC[1]+end_effector_size-4, fill="#FFCCCC", outline="")
+        es = 8
+        c.coords(it["eff"], sC[0]-es, sC[1]-es, sC[0]+es, sC[1]+es)
+        c.coords(it["eff_in"], sC[0]-es+2, sC[1]-es+2, sC[0]+es-4, sC[1]+es-4)
         
         if self.is_holding_object:
             box_sz = 12
-            self.canvas.create_rectangle(sC[0]-box_sz, sC[1]-box_sz, sC[0]+box_sz, sC[1]+box_sz, 
-                                         fill="#FFFF00", outline="black", width=2)
+            c.coords(it["box"], sC[0]-box_sz, sC[1]-box_sz, sC[0]+box_sz, sC[1]+box_sz)
+            c.itemconfig(it["box"], state="normal")
+        else:
+            c.itemconfig(it["box"], state="hidden")
 
         # Szögek
         d32 = math.degrees(target_p32)
         self.draw_cs(sB[0], sB[1], d32)
         d43 = math.degrees(target_p43)
-        self.canvas.create_arc(sA[0]-25, sA[1]-25, sA[0]+25, sA[1]+25, start=0, extent=d32, style="arc", outline="#FF0000", width=2)
-        self.canvas.create_text(sA[0]+35, sA[1]-10, text=f"{d32:.1f}°", fill="#FF0000", font=("Arial", 10, "bold"))
-        self.canvas.create_arc(sB[0]-25, sB[1]-25, sB[0]+25, sB[1]+25, start=d32, extent=-d43, style="arc", outline="#FF0000", width=2)
-        self.canvas.create_text(sB[0]+20, sB[1]+20, text=f"{d43:.1f}°", fill="#FF0000", font=("Arial", 10, "bold"))
-
-        # Pontok
-        for i, p in enumerate(self.model.points):
-            sc = self.to_scr(p[0], p[1])
-            self.canvas.create_oval(sc[0]-4, sc[1]-4, sc[0]+4, sc[1]+4, fill="#FFA500", outline="black")
-            self.canvas.create_text(sc[0] + 10, sc[1] - 10, text=str(i+1), font=("Arial", 8, "bold"), fill="#FFA500")
-            if i > 0:
-                prev = self.to_scr(self.model.points[i-1][0], self.model.points[i-1][1])
-                self.canvas.create_line(prev[0], prev[1], sc[0], sc[1], width=2, fill="gray")
+        c.coords(it["arc32"], sA[0]-25, sA[1]-25, sA[0]+25, sA[1]+25)
+        c.itemconfig(it["arc32"], start=0, extent=d32)
+        c.coords(it["txt32"], sA[0]+35, sA[1]-10)
+        c.itemconfig(it["txt32"], text=f"{d32:.1f}°")
+        c.coords(it["arc43"], sB[0]-25, sB[1]-25, sB[0]+25, sB[1]+25)
+        c.itemconfig(it["arc43"], start=d32, extent=-d43)
+        c.coords(it["txt43"], sB[0]+20, sB[1]+20)
+        c.itemconfig(it["txt43"], text=f"{d43:.1f}°")
+
+        # Aktuális adatok animáció közben
+        if self.is_moving and self.anim_info:
+            pos, t = self.anim_info
+            c.coords(it["data"], sC[0] + 50, sC[1] - 20)
+            c.itemconfig(it["data"], text=f"X: {pos[0]:.2f} m\nY: {pos[1]:.2f} m\nT: {t:.2f} s",
+                         state="normal")
+        else:
+            c.itemconfig(it["data"], state="hidden")
 
     def draw_cs(self, ox, oy, ang):
         rad = math.radians(ang)
         l = 30
         x2 = ox + l * math.cos(rad)
         y2 = oy - l * math.sin(rad)
-        self.canvas.create_line(ox, oy, x2, y2, fill="red", arrow="last")
+        self.canvas.coords(self.arm_items["cs_x"], ox, oy, x2, y2)
         rad2 = rad - math.pi/2 
         x3 = ox + l * math.cos(rad2)
         y3 = oy - l * math.sin(rad2)
-        self.canvas.create_line(ox, oy, x3, y3, fill="green", arrow="last")
+        self.canvas.coords(self.arm_items["cs_y"], ox, oy, x3, y3)
 
     # --- ÚTVONAL GENERÁLÁS ---
-    def generate_path_segment(self, start_angles, end_angles, steps, holding_state):
-        # Távolság és időbecslés
-        p1 = self.model.forward_kinematics(start_angles[0], start_angles[1])[2]
-        p2 = self.model.forward_kinematics(end_angles[0], end_angles[1])[2]
-        dist = math.sqrt((p2[0]-p1[0])**2 + (p2[1]-p1[1])**2)
-        
-        velocity = self.model.v if self.model.v > 0 else 0.5
-        total_duration = dist / velocity if dist > 0 else 1.0 
-        dt = total_duration / steps if steps > 0 else 0
-
-        segment = []
-        for j in range(steps + 1):
-            t_ratio = j / steps
-            curr32 = start_angles[0] + (end_angles[0] - start_angles[0]) * t_ratio
-            curr43 = start_angles[1] + (end_angles[1] - start_angles[1]) * t_ratio
-            
-            current_n = j
-            current_t = j * dt
-            segment.append((curr32, curr43, current_n, current_t, holding_state, True))
-            
-        return segment
+    # A tervezés a szimulációs magban van; ez csak a modellt és a gyorsítótárat adja hozzá.
+    def plan_job(self, points, current_angles, steps, bin_angles=None):
+        return plan_job(self.model, points, current_angles, steps, bin_angles,
+                        cache=self.seg_cache, chunks=True)
 
     def start(self):
+        if self.stream is not None:
+            print("Hiba: Élő célpontfolyam közben a Start nem használható, előbb kapcsold ki!")
+            return
         if len(self.model.points) < 1: return
         self.clear_tbl()
-        self.anim_q = []
         try: d = int(self.div_var.get())
         except: d=10
         
         current_angles = (self.model.rad_min32, self.model.rad_min43)
         if hasattr(self, 'anim_st'): current_angles = self.anim_st
         
-        # --- RAKODÁS MÓD LOGIKA ---
+        bin_angles = None
         if self.pick_place_var.get():
-            bin_angles = self.model.inverse_kinematics(self.bin_x, self.bin_y, check_limits=False)
+            bin_angles = bin_angles_for(self.model, self.bin_x, self.bin_y)
             if not bin_angles:
                 print("Hiba: A gyűjtő fizikailag nem elérhető!")
                 return
-
-            for i, p in enumerate(self.model.points):
-                target_angles = (p[2], p[3])
-                
-                # 1. Mozgás a ponthoz 
-                seg = self.generate_path_segment(current_angles, target_angles, d, False)
-                self.anim_q.extend(seg)
-                
-                # 2. Várakozás a ponton
-                for _ in range(5): 
-                    last = seg[-1]
-                    # False flag 
-                    self.anim_q.append((last[0], last[1], last[2], last[3], True, False))
-
-                # 3. Mozgás a gyűjtőhöz 
-                seg = self.generate_path_segment(target_angles, bin_angles, d, True)
-                self.anim_q.extend(seg)
-                
-                # 4. Várakozás a gyűjtőnél 
-                for _ in range(5):
-                    last = seg[-1]
-                    self.anim_q.append((last[0], last[1], last[2], last[3], False, False))
-
-                current_angles = bin_angles
-                
-        # --- NORMÁL MÓD LOGIKA ---
-        else:
-            if len(self.model.points) < 2: return
-            for i in range(len(self.model.points)-1):
-                p1, p2 = self.model.points[i], self.model.points[i+1]
-                seg = self.generate_path_segment((p1[2], p1[3]), (p2[2], p2[3]), d, False)
-                self.anim_q.extend(seg)
+        elif len(self.model.points) < 2: return
+
+        self.model.profile = self.profile_var.get()
+        self.model.straight_line = self.line_var.get()
+        points = list(self.model.points)
+        saving = ""
+        if self.optimize_var.get():
+            points, t_orig, t_new = optimize_route(self.model, points, current_angles, bin_angles,
+                                                   time_budget=self.ROUTE_BUDGET)
+            # A pontok új sorrendje a rajzon is látszik
+            self.model.points = list(points)
+            self.request_draw()
+            saving = f", megtakarítás: {t_orig - t_new:.2f} s"
+
+        # A pontlista pillanatképe: a lejátszás alatti módosítás nem zavarja a tervezést
+        job = self.watch_collisions(self.plan_job(points, current_angles, d, bin_angles), bin_angles)
 
         self.is_moving = True
+        self.is_paused = False
+        self.player = TrajectoryPlayer(job)
+        self.player.set_speed(self.speed_var.get())
         self.run_anim()
+
+        # A ciklusidő részletekben, a lejátszás mellett készül (egyenes pályánál a kiszámolt utat
+        # a lejátszás a gyorsítótárból veszi át); addig a csúszka a megtervezett részhez igazodik
+        self.cycle_var.set(f"Ciklusidő: … ({saving[2:]})" if saving else "Ciklusidő: …")
+        self.cycle_est = (iter(job_segments(points, current_angles, bin_angles)), [0.0, 0],
+                          DWELL_TIME if bin_angles is not None else 0.0, saving, self.player)
+        self.scheduler.request(self.estimate_cycle)
+
+    def estimate_cycle(self):
+        est = self.cycle_est
+        if est is None: return
+        segments, acc, dwell, saving, player = est
+        if player is not self.player:  # közben új lejátszás indult
+            self.cycle_est = None
+            return
+        deadline = time.perf_counter() + self.CYCLE_SLICE
+        for a, b in segments:
+            acc[0] += self.seg_cache.duration(self.model, a, b) + dwell
+            acc[1] += 1
+            if time.perf_counter() >= deadline:
+                self.scheduler.request(self.estimate_cycle)
+                return
+        player.total = acc[0]  # a csúszka a teljes feladat hosszához igazodik
+        self.cycle_var.set(f"Ciklusidő: {acc[0]:.2f} s ({acc[1]} szakasz{saving})")
+        self.cycle_est = None
     
     def run_anim(self):
-        if not self.is_moving or not self.anim_q: 
+        p = self.player
+        if not self.is_moving or p is None or p.done: 
             self.is_moving=False
             self.is_holding_object = False 
             if hasattr(self,'anim_st'): del self.anim_st
-            self.draw()
-            self.canvas.delete("current_data") 
+            self.anim_info = None
+            self.request_draw()
             return
+        if self.is_paused: return
         
-        data = self.anim_q.pop(0)
-        
-        self.anim_st = (data[0], data[1])
-        self.is_holding_object = data[4]
-        should_write = data[5] # Táblázat flag
-        
-        _, _, pos = self.model.forward_kinematics(data[0], data[1])
-        
-        # Adatok beírása az n és ti oszlopba
-        if should_write:
-            self.tree.insert("","end",values=(
-                f"{data[2]}",        
-                f"{data[3]:.2f} s",  
-                f"{pos[0]:.2f}",
-                f"{pos[1]:.2f}",
-                f"{math.degrees(data[0]):.1f}",
-                f"{math.degrees(data[1]):.1f}"
-            ))
-            self.tree.yview_moveto(1)
-            
-        self.draw()
-        
-        sC = self.to_scr(*pos)
-        current_data = f"X: {pos[0]:.2f} m\nY: {pos[1]:.2f} m\nT: {data[3]:.2f} s"
-        self.canvas.create_text(sC[0] + 50, sC[1] - 20, 
-                                text=current_data, 
-                                fill="red", font=("Arial", 10, "bold"), 
-                                anchor="w", tags="current_data") 
-        
-        self.root.after(30, self.run_anim) 
+        # Az eltelt idő alatt elért minták mind bekerülnek a táblázatba
+        passed = p.advance()
+        prof = self.profiler
+        if prof: t0 = prof.clock()
+        for data in passed:
+            if not data[5]: continue # Táblázat flag
+            self.log.append(table_row(self.model, data))
+        self.table.refresh()
+        if prof:
+            prof.record("táblázat", prof.clock() - t0)
+            prof.record("sor_mélység", len(p.samples) - p.next)
+
+        # A kirajzolt állapot a valódi időponthoz interpolált (élő forrásnál az első
+        # célpontig még nincs állapot)
+        st = p.state()
+        if st is not None:
+            phi32, phi43, holding, t = st
+            self.anim_st = (phi32, phi43)
+            self.is_holding_object = holding
+            _, _, pos = self.model.forward_kinematics(phi32, phi43)
+            self.anim_info = (pos, t)
+        if p.timeline > 0: self.seek_var.set(100.0 * p.t / p.timeline)
+
+        # Következő lépés a következő képkockában
+        self.scheduler.request(self.run_anim)
+
+    def toggle_pause(self):
+        if not self.is_moving or self.player is None: return
+        self.is_paused = not self.is_paused
+        if self.is_paused:
+            self.player.pause()
+        else:
+            self.player.resume()
+            self.run_anim()
+
+    def on_speed(self, value):
+        if self.player is not None: self.player.set_speed(value)
+
+    def on_seek(self, value):
+        p = self.player
+        if p is None or not self.is_moving or p.timeline <= 0: return
+        # A lejátszás közbeni visszaírás ne okozzon tekerést
+        if abs(float(value) - 100.0 * p.t / p.timeline) < 0.1: return
+        p.seek_fraction(float(value) / 100.0)
+        if self.is_paused:
+            st = p.state()
+            if st is None: return
+            phi32, phi43, holding, t = st
+            self.anim_st = (phi32, phi43)
+            self.is_holding_object = holding
+            self.anim_info = (self.model.forward_kinematics(phi32, phi43)[2], t)
+            self.request_draw()
     
+    def watch_collisions(self, job, bin_angles):
+        # Az ütközésvizsgálat a lejátszó előretekintésével együtt halad (induláskor nem blokkol);
+        # a találatok megjelenésükkor kerülnek ki
+        obstacles = list(self.obstacles)
+        if bin_angles is not None:
+            obstacles.append(bin_obstacle(self.bin_x, self.bin_y))
+        self.collision_hits = 0
+        self.collision_var.set("")
+        return watch_collisions(self.model, job, obstacles, self.on_collision)
+
+    def on_collision(self, seg, k, name, link):
+        print(f"Figyelem: ütközés a(z) {seg+1}. szakasz {k}. mintájánál ({link} - {name})")
+        self.collision_hits += 1
+        self.collision_var.set(f"Ütközés: {self.collision_hits} szakaszban")
+
+    def load_obstacles(self):
+        import json
+        path = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        if not path: return
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict): data = data.get("obstacles", [])
+            self.obstacles = obstacles_from_json(data)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Hiba: az akadályok nem tölthetők be: {e}")
+            return
+        self.request_draw()
+
+    def toggle_profiler(self):
+        if self.profile_on_var.get():
+            self.profiler = Profiler()
+            self.profiler.instrument(self.model)
+        else:
+            self.profiler.uninstrument()
+            self.profiler = None
+            self.canvas.delete("overlay")
+            self.overlay_item = None
+        self.scheduler.profiler = self.profiler
+        self._static_key = None  # a statikus réteg szakaszai is mérődjenek
+        self.request_draw()
+
+    def export_metrics(self):
+        if self.profiler is None:
+            print("Hiba: a teljesítménymérés nincs bekapcsolva!")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path: self.profiler.export(path)
+
+    def toggle_stream(self):
+        if self.stream_on_var.get():
+            self.stream = TargetServer(self.model, maxsize=self.STREAM_QUEUE)
+            try:
+                self.stream.start_unix(DEFAULT_SOCKET)
+            except OSError as e:
+                print(f"Hiba: az élő célpontfolyam nem indítható: {e}")
+                self.stream = None
+                self.stream_on_var.set(False)
+                return
+            if not self.start_live():
+                self.stream.stop()
+                self.stream = None
+                self.stream_on_var.set(False)
+                return
+            self.pump_targets()
+        else:
+            self.stream.stop()
+            self.stream = None
+            self.live_targets.append(None)  # a már várakozó célpontok még lefutnak
+            self.stream_var.set("")
+
+    def start_live(self):
+        # Lejátszás élő forrásból: a tervező mindig a következő beérkezett célponthoz tervez
+        self.is_moving = False
+        self.clear_tbl()
+        try: d = int(self.div_var.get())
+        except: d=10
+        current_angles = (self.model.rad_min32, self.model.rad_min43)
+        if hasattr(self, 'anim_st'): current_angles = self.anim_st
+        bin_angles = None
+        if self.pick_place_var.get():
+            bin_angles = bin_angles_for(self.model, self.bin_x, self.bin_y)
+            if not bin_angles:
+                print("Hiba: A gyűjtő fizikailag nem elérhető!")
+                return False
+        self.model.profile = self.profile_var.get()
+        self.model.straight_line = self.line_var.get()
+        self.live_targets = deque()
+        job = live_job(self.model, self.live_targets, current_angles, d, bin_angles, cache=self.seg_cache,
+                       chunks=True)
+        job = self.watch_collisions(job, bin_angles)
+        self.is_moving = True
+        self.is_paused = False
+        self.player = TrajectoryPlayer(job)
+        self.player.set_speed(self.speed_var.get())
+        self.run_anim()
+        return True
+
+    def pump_targets(self):
+        # Tk szálon fut: csak annyit vesz át, amennyi a mozgásra váró pufferbe fér,
+        # így a teli sor a fogadó szálon keresztül a küldőt fékezi
+        srv = self.stream
+        if srv is None: return
+        moved = 0
+        while len(self.live_targets) < self.LIVE_BUFFER:
+            try:
+                self.live_targets.append(srv.get(block=False))
+            except queue.Empty:
+                break
+            moved += 1
+        if moved: self.request_draw()
+        self.stream_var.set(f"Elfogadva: {srv.accepted}, elutasítva: {srv.rejected}, "
+                            f"sorban: {srv.queue.qsize() + len(self.live_targets)}")
+        self.root.after(self.STREAM_POLL_MS, self.pump_targets)
+
     def stop(self): self.is_moving=False
-    def del_pts(self): self.model.points=[]; self.draw()
+    def del_pts(self): self.model.points=[]; self.request_draw()
     def clear_tbl(self): 
-        for i in self.tree.get_children(): self.tree.delete(i)
-    def on_resize(self,e): self.draw()
+        self.log.clear(); self.table.reset()
+    def export_csv(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if path: self.log.export_csv(path)
+    def export_npy(self):
+        path = filedialog.asksaveasfilename(defaultextension=".npy", filetypes=[("NumPy", "*.npy")])
+        if path: self.log.export_npy(path)
+    def on_resize(self,e): self.request_draw()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,1091 @@
+# Grafikus felület nélküli szimulációs mag: modell, pályatervezés, lejátszás.
+# Nem importálja a tkintert, így kijelző nélküli szerveren is futtatható:
+#   python szimulacio.py feladat.json -o tablazat.csv
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from munkaterulet import Workspace
+
+# NumPy opcionális és lustán töltődik be (csak az első kötegelt hívásnál),
+# hogy a parancssori indulás gyors maradjon
+_np = False
+
+def numpy_or_none():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+# --- 1. MATEMATIKAI MODELL ---
+
+class RobotArmModel:
+    def __init__(self):
+        # Adatok
+        self.l3 = 1.2
+        self.l4 = 0.7
+        self.min_phi32 = 25.0
+        self.max_phi32 = 80.0
+        self.min_phi43 = 45.0
+        self.max_phi43 = 135.0
+        self.tgy = 0.5
+        self.v = 0.5
+        # Csuklósebesség-korlátok (fok/s); a gyorsulás-korlát ebből és tgy-ből adódik
+        self.w32_max = 60.0
+        self.w43_max = 90.0
+        # Sebességprofil: "linear" (régi, állandó Descartes-sebesség), "trapez" vagy "s" (S-görbe)
+        self.profile = "trapez"
+        # Egyenes (Descartes) pálya: adaptív mintavétel megengedett eltéréssel (m) és
+        # legfeljebb ekkora csuklószög-lépéssel (fok) két minta között
+        self.straight_line = False
+        self.line_tol = 0.002
+        self.line_max_step = 5.0
+        
+        self.points = []
+        # Minden paraméterváltozáskor nő - ebből tudják a gyorsítótárak, hogy újra kell számolni
+        self.revision = 0
+        self.calc_rad_limits()
+        # Zárt alakú munkaterület (ívek, terület, sarkok); a paraméterekből lustán frissül
+        self.workspace = Workspace(self)
+
+    def calc_rad_limits(self):
+        self.revision += 1
+        self.rad_min32 = math.radians(self.min_phi32)
+        self.rad_max32 = math.radians(self.max_phi32)
+        self.rad_min43 = math.radians(self.min_phi43)
+        self.rad_max43 = math.radians(self.max_phi43)
+
+    def forward_kinematics(self, phi32, phi43):
+        ax, ay = 0, 0
+        bx = self.l3 * math.cos(phi32)
+        by = self.l3 * math.sin(phi32)
+        
+        # Könyök jobbra/lefelé hajlik
+        abs_angle = phi32 - phi43
+        
+        cx = bx + self.l4 * math.cos(abs_angle)
+        cy = by + self.l4 * math.sin(abs_angle)
+        
+        return (ax, ay), (bx, by), (cx, cy)
+
+    def inverse_kinematics(self, x, y, check_limits=True):
+        dist_sq = x**2 + y**2
+        dist = math.sqrt(dist_sq)
+        
+        if dist > (self.l3 + self.l4) or dist < abs(self.l3 - self.l4) or dist == 0:
+            return None
+
+        val = (self.l3**2 + self.l4**2 - dist_sq) / (2 * self.l3 * self.l4)
+        val = max(-1.0, min(1.0, val))
+        
+        gamma = math.acos(val)
+        phi43 = math.pi - gamma
+
+        beta = math.atan2(y, x)
+        
+        val_alpha = (self.l3**2 + dist_sq - self.l4**2) / (2 * self.l3 * dist)
+        val_alpha = max(-1.0, min(1.0, val_alpha))
+        alpha = math.acos(val_alpha)
+        
+        phi32 = beta + alpha
+
+        if check_limits:
+            eps = 0.001
+            if not (self.rad_min32 - eps <= phi32 <= self.rad_max32 + eps):
+                return None
+            if not (self.rad_min43 - eps <= phi43 <= self.rad_max43 + eps):
+                return None
+
+        return phi32, phi43
+
+    def plan_signature(self):
+        # Minden, amitől egy megtervezett szakasz függ (a revision a hosszakat és határokat fedi)
+        return (self.revision, self.l3, self.l4, self.tgy, self.v, self.w32_max, self.w43_max,
+                self.profile, self.straight_line, self.line_tol, self.line_max_step)
+
+    def within_limits(self, phi32, phi43, eps=0.001):
+        return (self.rad_min32 - eps <= phi32 <= self.rad_max32 + eps and
+                self.rad_min43 - eps <= phi43 <= self.rad_max43 + eps)
+
+    def jacobian_condition(self, phi32, phi43):
+        # A végpont-Jacobi mátrix kondíciószáma (σmax/σmin); a munkaterület szélén
+        # (φ43 -> 0 vagy π) a végtelenhez tart
+        abs_angle = phi32 - phi43
+        cx = self.l3 * math.cos(phi32) + self.l4 * math.cos(abs_angle)
+        cy = self.l3 * math.sin(phi32) + self.l4 * math.sin(abs_angle)
+        j11, j21 = -cy, cx
+        j12, j22 = self.l4 * math.sin(abs_angle), -self.l4 * math.cos(abs_angle)
+        fro = j11*j11 + j12*j12 + j21*j21 + j22*j22
+        det = abs(j11 * j22 - j12 * j21)
+        if det < 1e-12: return math.inf
+        root = math.sqrt(max(0.0, fro * fro - 4 * det * det))
+        return math.sqrt((fro + root) / (fro - root)) if fro > root else 1.0
+
+    def in_annulus(self, x, y):
+        # Fizikai elérhetőség (szöghatárok nélkül), O(1): l3-l4 <= r <= l3+l4
+        d_sq = x * x + y * y
+        return d_sq > 0 and (self.l3 - self.l4) ** 2 <= d_sq <= (self.l3 + self.l4) ** 2
+
+    # --- Kötegelt kinematika ---
+    # Tömbökön dolgozik: NumPy-jal vektorizáltan, anélkül listákkal.
+
+    def forward_kinematics_batch(self, phi32, phi43):
+        # Visszatér: (bx, by, cx, cy, ok) - ok: a szögpár a határokon belül van
+        eps = 0.001
+        lo32, hi32 = self.rad_min32 - eps, self.rad_max32 + eps
+        lo43, hi43 = self.rad_min43 - eps, self.rad_max43 + eps
+
+        np = numpy_or_none()
+        if np is not None:
+            p32 = np.asarray(phi32, dtype=float)
+            p43 = np.asarray(phi43, dtype=float)
+            bx = self.l3 * np.cos(p32)
+            by = self.l3 * np.sin(p32)
+            abs_angle = p32 - p43
+            cx = bx + self.l4 * np.cos(abs_angle)
+            cy = by + self.l4 * np.sin(abs_angle)
+            ok = (p32 >= lo32) & (p32 <= hi32) & (p43 >= lo43) & (p43 <= hi43)
+            return bx, by, cx, cy, ok
+
+        bx, by, cx, cy, ok = [], [], [], [], []
+        cos, sin = math.cos, math.sin
+        for a32, a43 in zip(phi32, phi43):
+            x = self.l3 * cos(a32)
+            y = self.l3 * sin(a32)
+            abs_angle = a32 - a43
+            bx.append(x)
+            by.append(y)
+            cx.append(x + self.l4 * cos(abs_angle))
+            cy.append(y + self.l4 * sin(abs_angle))
+            ok.append(lo32 <= a32 <= hi32 and lo43 <= a43 <= hi43)
+        return bx, by, cx, cy, ok
+
+    def inverse_kinematics_batch(self, x, y, check_limits=True):
+        # Visszatér: (phi32, phi43, ok) - ahol ok hamis, ott a szögek NaN értékűek
+        l3, l4 = self.l3, self.l4
+        eps = 0.001
+        lo32, hi32 = self.rad_min32 - eps, self.rad_max32 + eps
+        lo43, hi43 = self.rad_min43 - eps, self.rad_max43 + eps
+
+        np = numpy_or_none()
+        if np is not None:
+            x = np.asarray(x, dtype=float)
+            y = np.asarray(y, dtype=float)
+            dist_sq = x**2 + y**2
+            dist = np.sqrt(dist_sq)
+            ok = (dist <= l3 + l4) & (dist >= abs(l3 - l4)) & (dist != 0)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                val = np.clip((l3**2 + l4**2 - dist_sq) / (2 * l3 * l4), -1.0, 1.0)
+                phi43 = math.pi - np.arccos(val)
+                val_alpha = np.clip((l3**2 + dist_sq - l4**2) / (2 * l3 * dist), -1.0, 1.0)
+                phi32 = np.arctan2(y, x) + np.arccos(val_alpha)
+
+            if check_limits:
+                ok &= (phi32 >= lo32) & (phi32 <= hi32) & (phi43 >= lo43) & (phi43 <= hi43)
+            phi32 = np.where(ok, phi32, np.nan)
+            phi43 = np.where(ok, phi43, np.nan)
+            return phi32, phi43, ok
+
+        out32, out43, ok = [], [], []
+        nan = float("nan")
+        r_max, r_min = l3 + l4, abs(l3 - l4)
+        for px, py in zip(x, y):
+            dist_sq = px**2 + py**2
+            dist = math.sqrt(dist_sq)
+            if dist > r_max or dist < r_min or dist == 0:
+                out32.append(nan); out43.append(nan); ok.append(False)
+                continue
+            val = max(-1.0, min(1.0, (l3**2 + l4**2 - dist_sq) / (2 * l3 * l4)))
+            p43 = math.pi - math.acos(val)
+            val_alpha = max(-1.0, min(1.0, (l3**2 + dist_sq - l4**2) / (2 * l3 * dist)))
+            p32 = math.atan2(py, px) + math.acos(val_alpha)
+            if check_limits and not (lo32 <= p32 <= hi32 and lo43 <= p43 <= hi43):
+                out32.append(nan); out43.append(nan); ok.append(False)
+                continue
+            out32.append(p32); out43.append(p43); ok.append(True)
+        return out32, out43, ok
+
+    def workspace_outline(self, scale=100.0, tol_px=0.5):
+        # A munkaterület határa: a négy határív sokszöge, a léptékhez igazított felbontással
+        return self.workspace.outline(scale, tol_px)
+
+# --- 2. ELÉRHETŐSÉGI TÉRKÉP ---
+
+class ReachabilityMap:
+    # Vászon-felbontású bitkép a munkaterületről: egy képpont kikeresése O(1).
+    # 0 = biztosan kívül, 1 = biztosan belül, 2 = határsáv (itt pontos IK dönt)
+    OUTSIDE, INSIDE, EDGE = 0, 1, 2
+    EDGE_PX = 2
+
+    def __init__(self, model):
+        self.model = model
+        self.key = None
+        self.bitmap = None
+        self.width = self.height = 0
+
+    def update(self, origin_x, origin_y, scale, width, height):
+        # Lusta újraépítés: csak ha a modell (calc_rad_limits) vagy a nézet változott
+        key = (self.model.revision, origin_x, origin_y, scale, width, height)
+        if key != self.key:
+            self.build(origin_x, origin_y, scale, width, height)
+            self.key = key
+
+    def build(self, origin_x, origin_y, scale, width, height):
+        w, h = max(1, int(width)), max(1, int(height))
+        bitmap = bytearray(w * h)
+        cx, cy = self.model.workspace_outline(scale, 0.25)
+        poly = [(origin_x + x * scale, origin_y - y * scale) for x, y in zip(cx, cy)]
+        edges = list(zip(poly, poly[1:] + poly[:1]))
+
+        # Belső rész: soronkénti (scanline) kitöltés
+        y_lo = max(0, int(min(p[1] for p in poly)))
+        y_hi = min(h - 1, int(max(p[1] for p in poly)) + 1)
+        for py in range(y_lo, y_hi + 1):
+            xs = []
+            for (x0, y0), (x1, y1) in edges:
+                if (y0 <= py < y1) or (y1 <= py < y0):
+                    xs.append(x0 + (py - y0) * (x1 - x0) / (y1 - y0))
+            xs.sort()
+            row = py * w
+            for k in range(0, len(xs) - 1, 2):
+                a = max(0, int(math.ceil(xs[k])))
+                b = min(w - 1, int(math.floor(xs[k + 1])))
+                if b >= a:
+                    bitmap[row + a:row + b + 1] = b"\x01" * (b - a + 1)
+
+        # Határsáv: a határ mentén pontos számítás kell
+        r = self.EDGE_PX
+        for (x0, y0), (x1, y1) in edges:
+            n = max(1, int(math.hypot(x1 - x0, y1 - y0) * 2))
+            for k in range(n + 1):
+                px = int(x0 + (x1 - x0) * k / n)
+                py = int(y0 + (y1 - y0) * k / n)
+                a, b = max(0, px - r), min(w - 1, px + r)
+                if b < a:
+                    continue
+                for yy in range(max(0, py - r), min(h - 1, py + r) + 1):
+                    bitmap[yy * w + a:yy * w + b + 1] = b"\x02" * (b - a + 1)
+
+        self.bitmap = bitmap
+        self.width, self.height = w, h
+
+    def lookup(self, px, py):
+        px, py = int(px), int(py)
+        if self.bitmap is not None and 0 <= px < self.width and 0 <= py < self.height:
+            return self.bitmap[py * self.width + px]
+        return self.EDGE
+
+# --- 3. PÁLYA LEJÁTSZÓ ---
+
+class Trajectory:
+    # Tömör, oszlopos mintatároló: φ32, φ43, szakaszon belüli idő (t) és a lejátszási
+    # idővonal (T) array('d')-ben, a sorszám array('I')-ben, a jelzők (megfogva, táblázatba
+    # írandó, várakozás) bitenként egy bájtban - mintánként 37 bájt. A várakozás egyetlen
+    # sor, amelynek hossza az idővonalból adódik (T a várakozás végét jelöli).
+    # Indexeléskor a szokásos mintát adja: (φ32, φ43, n, t, megfogva, írandó), várakozásnál
+    # hetedik elemként a hosszát is. A szeletelés nem másol (TrajectoryView).
+    HOLD, WRITE, DWELL = 1, 2, 4
+    TYPECODES = ("d", "d", "d", "d", "I", "B")
+    MAGIC = b"RKTRAJ1" + (b"<" if sys.byteorder == "little" else b">")
+
+    def __init__(self, columns=None):
+        cols = columns or [array(tc) for tc in self.TYPECODES]
+        self.phi32, self.phi43, self.t, self.T, self.n, self.flags = cols
+        self.readonly = columns is not None and not isinstance(cols[0], array)
+
+    @classmethod
+    def from_samples(cls, samples):
+        traj = cls()
+        for s in samples: traj.append(s)
+        return traj
+
+    def columns(self):
+        return self.phi32, self.phi43, self.t, self.T, self.n, self.flags
+
+    def __len__(self):
+        return len(self.T)
+
+    def append(self, s):
+        # Az idővonal ugyanaz, mint a lejátszásnál: szakaszon belül a t különbsége,
+        # várakozásnál annak hossza, új szakasz elején nincs ugrás
+        T = self.T[-1] if self.T else 0.0
+        if not s[5]:
+            T += s[6]
+            flags = self.DWELL
+        else:
+            if s[2] > 0 and self.T: T += s[3] - self.t[-1]
+            flags = self.WRITE
+        if s[4]: flags |= self.HOLD
+        self.phi32.append(s[0])
+        self.phi43.append(s[1])
+        self.t.append(s[3])
+        self.T.append(T)
+        self.n.append(s[2])
+        self.flags.append(flags)
+
+    def extend(self, other):
+        # Egy másik pálya (pl. gyorsítótárazott szakasz) hozzáfűzése oszloponként, mintánkénti
+        # átalakítás nélkül; az idővonal az append() szabálya szerint tolódik el
+        if not len(other): return
+        T = self.T[-1] if self.T else 0.0
+        if other.flags[0] & self.DWELL: T += other.T[0]
+        elif other.n[0] > 0 and self.T: T += other.t[0] - self.t[-1]
+        off = T - other.T[0]
+        for c, o in zip(self.columns(), other.columns()):
+            if c is not self.T: c.extend(o)
+        if off == 0:
+            self.T.extend(other.T)
+            return
+        np = numpy_or_none()
+        if np is not None:
+            self.T.frombytes((np.frombuffer(other.T, dtype=np.float64) + off).tobytes())
+        else:
+            self.T.extend([v + off for v in other.T])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1: raise ValueError("csak egyes lépésközű szelet támogatott")
+            return TrajectoryView(self, start, stop)
+        f = self.flags[i]
+        if f & self.DWELL:
+            if i < 0: i += len(self)
+            return (self.phi32[i], self.phi43[i], self.n[i], self.t[i], bool(f & self.HOLD), False,
+                    self.T[i] - self.T[i - 1] if i > 0 else self.T[i])
+        return self.phi32[i], self.phi43[i], self.n[i], self.t[i], bool(f & self.HOLD), True
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __delitem__(self, i):
+        # Csak az elejéről törlés (lejátszott minták eldobása)
+        if not isinstance(i, slice) or i.start not in (None, 0) or i.step not in (None, 1):
+            raise ValueError("csak az elejéről lehet törölni")
+        for c in self.columns(): del c[:i.stop]
+
+    def nbytes(self):
+        return sum(len(c) * c.itemsize for c in self.columns())
+
+    def save(self, path):
+        # Fejléc (8 bájt azonosító + mintaszám), utána az oszlopok egymás után, gépi bájtsorrendben
+        with open(path, "wb") as f:
+            f.write(self.MAGIC + len(self).to_bytes(8, sys.byteorder))
+            for c in self.columns():
+                f.write(c if isinstance(c, array) else c.tobytes())
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        # use_mmap: az oszlopok a fájlra mutató csak olvasható nézetek (nincs beolvasás/másolás)
+        import mmap
+        with open(path, "rb") as f:
+            head = f.read(16)
+            if head[:8] != cls.MAGIC:
+                raise ValueError(f"nem pályafájl vagy más bájtsorrendű: {path}")
+            count = int.from_bytes(head[8:], sys.byteorder)
+            if use_mmap:
+                buf = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buf = memoryview(head + f.read())
+        cols, off = [], 16
+        for tc in cls.TYPECODES:
+            size = count * array(tc).itemsize
+            cols.append(buf[off:off + size].cast(tc))
+            off += size
+        return cls(cols)
+
+class TrajectoryView:
+    # Másolás nélküli szelet egy Trajectory-ból
+    def __init__(self, traj, start, stop):
+        self.traj, self.start, self.stop = traj, start, max(start, stop)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            return TrajectoryView(self.traj, self.start + start, self.start + stop)
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        return self.traj[self.start + i]
+
+    def __iter__(self):
+        traj = self.traj
+        for i in range(self.start, self.stop):
+            yield traj[i]
+
+class TrajectoryPlayer:
+    # Falióra-vezérelt lejátszás: a pályát a valóban eltelt idő szerint interpolálja,
+    # lemaradáskor mintákat ugrik át. A mintákat egy (akár lusta) forrásból húzza,
+    # mindig csak egy kis előretekintő ablaknyit tervez meg. A megtervezett minták
+    # indexelt pufferben (Trajectory) maradnak, így a szünet, a folytatás és a tekerés nem másol.
+    # Kész Trajectory forrásként (pl. memóriába leképezett fájlból) másolás nélkül játszható le.
+    MIN_SPEED, MAX_SPEED = 0.1, 50.0
+
+    def __init__(self, source, clock=time.perf_counter, lookahead=0.5, history=None):
+        if isinstance(source, Trajectory):
+            self.samples, self.source, self.exhausted = source, iter(()), True
+        else:
+            self.samples, self.source, self.exhausted = Trajectory(), iter(source), False
+        self.times = self.samples.T  # ugyanaz az oszlop, nem másolat
+        self.clock = clock
+        self.lookahead = lookahead  # ennyi pályaidőt tervez előre (s)
+        self.history = history      # ennyi lejátszott mintát tart meg tekeréshez (None = mindet)
+        self.base = 0               # a puffer első mintájának sorszáma a teljes pályán
+        self.t = 0.0
+        self.next = 0               # az első még ki nem adott minta indexe a pufferben
+        self.speed = 1.0
+        self.paused = False
+        self.skipped = 0            # lemaradás miatt külön képkockát nem kapott minták
+        self.total = None           # a teljes pálya hossza, ha előre ismert (pl. job_cycle_time)
+        self._wall = None
+        self.fill(0.0)
+
+    def fill(self, until_t):
+        # A forrásból addig húz, amíg a puffer el nem éri az until_t időpontot.
+        # Élő forrás None-t adhat: most nincs új minta, a lejátszás az utolsónál vár.
+        times, samples = self.times, self.samples
+        while not self.exhausted and (not times or times[-1] < until_t):
+            try:
+                s = next(self.source)
+            except StopIteration:
+                self.exhausted = True
+                break
+            if s is None: break
+            if isinstance(s, Trajectory): samples.extend(s)  # egész szakasz, oszloponként
+            else: samples.append(s)
+
+    @property
+    def duration(self):
+        # Teljes hossz, ha a forrás már elfogyott; addig a megtervezett rész hossza
+        return self.times[-1] if self.times else 0.0
+
+    @property
+    def timeline(self):
+        # Az idővonal hossza a csúszkához és a tekeréshez: lusta tervezésnél a duration csak a
+        # már megtervezett részt fedi, ezért az előre ismert teljes hossz az irányadó
+        return self.total if self.total else self.duration
+
+    def set_speed(self, speed):
+        self.tick()
+        self.speed = max(self.MIN_SPEED, min(self.MAX_SPEED, float(speed)))
+
+    def pause(self):
+        self.tick()
+        self.paused = True
+
+    def resume(self):
+        self._wall = self.clock()
+        self.paused = False
+
+    def seek(self, t):
+        t = max(0.0, float(t))
+        self.fill(t + self.lookahead)
+        self.t = max(self.times[0] if self.times else 0.0, min(self.duration, t))
+        self.next = bisect_right(self.times, self.t)
+        self._wall = self.clock()
+
+    def seek_fraction(self, frac):
+        self.seek(frac * self.timeline)
+
+    @property
+    def done(self):
+        return self.exhausted and self.next >= len(self.samples) and self.t >= self.duration
+
+    def tick(self):
+        now = self.clock()
+        if not self.paused and self._wall is not None:
+            self.t = self.t + (now - self._wall) * self.speed
+        self._wall = now
+        self.fill(self.t + self.lookahead * max(1.0, self.speed))
+        self.t = min(self.t, self.duration)
+
+    def advance(self):
+        # Lépteti az időt, és visszaadja az azóta elért mintákat (másolás nélküli nézet,
+        # a következő advance() hívásig érvényes - a régi minták eldobása előtte történik)
+        self.trim()
+        self.tick()
+        first = self.next
+        self.next = max(first, bisect_right(self.times, self.t))
+        if self.next - first > 1:
+            self.skipped += self.next - first - 1
+        return self.samples[first:self.next]
+
+    def trim(self):
+        # A már lejátszott minták eldobása (részletekben, hogy amortizáltan O(1) legyen)
+        if self.history is None or self.samples.readonly: return
+        behind = self.next - 1 - self.history
+        if behind > self.history:
+            del self.samples[:behind]
+            self.next -= behind
+            self.base += behind
+
+    def state(self):
+        # (φ32, φ43, megfogva, szakaszon belüli idő) az aktuális időpontban
+        if not self.samples:
+            return None
+        i = max(0, bisect_right(self.times, self.t) - 1)
+        a = self.samples[i]
+        if i + 1 < len(self.samples):
+            b = self.samples[i + 1]
+            span = self.times[i + 1] - self.times[i]
+            if span > 0 and b[5] and b[2] > 0:
+                r = (self.t - self.times[i]) / span
+                return (a[0] + (b[0] - a[0]) * r, a[1] + (b[1] - a[1]) * r,
+                        a[4], a[3] + (b[3] - a[3]) * r)
+        return a[0], a[1], a[4], a[3]
+# --- 4. SEBESSÉGPROFILOK ---
+
+class MotionProfile:
+    # Nyugalomból nyugalomba vivő profil a [0, distance] úton, vmax/amax korláttal.
+    # "trapez": egyenletes gyorsulás; "s": szinuszos (véges rántású) gyorsítási szakasz,
+    # amelynek csúcsgyorsulása π/2-szerese az átlagosnak, ezért hosszabb rámpát kap.
+    KINDS = ("linear", "trapez", "s")
+
+    def __init__(self, distance, vmax, amax, kind="trapez"):
+        self.distance = distance
+        self.kind = kind
+        self.vpeak = self.ta = self.tc = self.duration = 0.0
+        if distance <= 0 or vmax <= 0:
+            return
+        if kind == "linear" or amax <= 0 or math.isinf(amax):
+            self.vpeak = vmax
+            self.tc = self.duration = distance / vmax
+            return
+        k = math.pi / 2 if kind == "s" else 1.0
+        ta = k * vmax / amax
+        vpeak = vmax
+        if distance < vmax * ta:
+            # Nem éri el a csúcssebességet: háromszög (ill. harang) alakú profil
+            vpeak = math.sqrt(distance * amax / k)
+            ta = k * vpeak / amax
+        self.vpeak, self.ta = vpeak, ta
+        self.tc = (distance - vpeak * ta) / vpeak
+        self.duration = 2 * ta + self.tc
+
+    def ramp(self, t):
+        # A gyorsítási szakaszban t idő alatt megtett út
+        v, ta = self.vpeak, self.ta
+        if self.kind == "s":
+            return v / 2 * (t - ta / math.pi * math.sin(math.pi * t / ta))
+        return v * t * t / (2 * ta)
+
+    def time_at(self, s):
+        # A position() inverze (monoton, felezéssel)
+        if s <= 0: return 0.0
+        if s >= self.distance: return self.duration
+        lo, hi = 0.0, self.duration
+        for _ in range(50):
+            mid = (lo + hi) / 2
+            if self.position(mid) < s: lo = mid
+            else: hi = mid
+        return (lo + hi) / 2
+
+    def position(self, t):
+        if t <= 0: return 0.0
+        if t >= self.duration: return self.distance
+        if t < self.ta: return self.ramp(t)
+        if t <= self.ta + self.tc: return self.vpeak * (t - self.ta / 2)
+        return self.distance - self.ramp(self.duration - t)
+
+def joint_profile(model, start_angles, end_angles, kind=None):
+    # Szinkronizált csuklómozgás: mindkét csukló ugyanazt a normált u(t) ∈ [0, 1] profilt követi
+    # (a csuklótéri egyenes megmarad), és u korlátjai a szűkebb csuklóból adódnak.
+    kind = kind or model.profile
+    vmax_u = amax_u = math.inf
+    for d, w_deg in ((end_angles[0] - start_angles[0], model.w32_max),
+                     (end_angles[1] - start_angles[1], model.w43_max)):
+        d = abs(d)
+        if d <= 1e-12: continue
+        w = math.radians(w_deg)
+        a = w / model.tgy if model.tgy > 0 else math.inf  # tgy: a gyorsítás (beállás) ideje
+        vmax_u = min(vmax_u, w / d)
+        amax_u = min(amax_u, a / d)
+    if math.isinf(vmax_u):
+        return MotionProfile(0.0, 0.0, 0.0, kind)
+    return MotionProfile(1.0, vmax_u, amax_u, kind)
+
+# --- Egyenes (Descartes) pálya ---
+
+LINE_KAPPA_REF = 3.0  # e fölötti kondíciószámnál arányosan szigorúbb az eltérés-tűrés
+LINE_MAX_DEPTH = 16
+
+def line_path(model, start_angles, end_angles):
+    # Adaptív mintavétel az egyenes mentén: egy intervallumot akkor kell felezni, ha a
+    # csuklótéri interpoláció közepe túl messze esik az egyenestől (a tűrés a Jacobi-mátrix
+    # kondíciója szerint szigorodik), vagy túl nagy a csuklószög-lépés.
+    # Visszatér: [(u, φ32, φ43), ...] u ∈ [0, 1], vagy None, ha az egyenes kilép a munkaterületből.
+    fk = model.forward_kinematics
+    p1 = fk(start_angles[0], start_angles[1])[2]
+    p2 = fk(end_angles[0], end_angles[1])[2]
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    # A határon kívüli végpontnál (pl. gyűjtő) csak a fizikai elérhetőség számít
+    lims = model.within_limits(*start_angles) and model.within_limits(*end_angles)
+    max_dq = math.radians(model.line_max_step)
+    tol = model.line_tol
+    out = [(0.0, start_angles[0], start_angles[1])]
+
+    def refine(u0, q0, u1, q1, depth):
+        um = (u0 + u1) / 2
+        xm, ym = p1[0] + dx * um, p1[1] + dy * um
+        qm = model.inverse_kinematics(xm, ym, check_limits=lims)
+        if qm is None:
+            return False
+        c = fk((q0[0] + q1[0]) / 2, (q0[1] + q1[1]) / 2)[2]
+        dev = math.hypot(c[0] - xm, c[1] - ym)
+        tol_eff = tol * min(1.0, LINE_KAPPA_REF / model.jacobian_condition(*qm))
+        dq = max(abs(q1[0] - q0[0]), abs(q1[1] - q0[1]))
+        if depth < LINE_MAX_DEPTH and (dev > tol_eff or dq > max_dq):
+            return refine(u0, q0, um, qm, depth + 1) and refine(um, qm, u1, q1, depth + 1)
+        out.append((u1, q1[0], q1[1]))
+        return True
+
+    if (dx or dy) and not refine(0.0, start_angles, 1.0, end_angles, 0):
+        return None
+    return out
+
+def line_timing(model, path):
+    # Mintaidők az egyenes mentén: Descartes-profil v-vel és v/tgy gyorsulással; ha közben
+    # valamelyik csukló túllépné a sebességkorlátját, az egész szakasz arányosan lassul
+    fk = model.forward_kinematics
+    p1 = fk(path[0][1], path[0][2])[2]
+    p2 = fk(path[-1][1], path[-1][2])[2]
+    dist = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
+    v = model.v if model.v > 0 else 0.5
+    a = v / model.tgy if model.tgy > 0 else math.inf
+    prof = MotionProfile(dist, v, a, model.profile)
+    times = [prof.time_at(u * dist) for u, _, _ in path]
+
+    w32, w43 = math.radians(model.w32_max), math.radians(model.w43_max)
+    scale = 1.0
+    for k in range(1, len(path)):
+        dt = times[k] - times[k - 1]
+        need = max(abs(path[k][1] - path[k-1][1]) / w32, abs(path[k][2] - path[k-1][2]) / w43)
+        if dt > 0 and need > dt * scale:
+            scale = need / dt
+    return [t * scale for t in times]
+
+def line_segment(model, start_angles, end_angles):
+    # Egyenes pálya a mintaidőivel: (út, idők), vagy (None, None), ha kilép a munkaterületből
+    path = line_path(model, start_angles, end_angles)
+    return (path, line_timing(model, path)) if path is not None else (None, None)
+
+def segment_duration(model, start_angles, end_angles, line=None):
+    # Egy szakasz időtartama a modell profilja szerint (a legkisebb elérhető ciklusidő);
+    # line: előre kiszámolt line_segment() eredmény egyenes pályához
+    if model.straight_line:
+        path, times = line if line is not None else line_segment(model, start_angles, end_angles)
+        if path is not None:
+            return times[-1]
+    if model.profile == "linear":
+        p1 = model.forward_kinematics(start_angles[0], start_angles[1])[2]
+        p2 = model.forward_kinematics(end_angles[0], end_angles[1])[2]
+        dist = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
+        velocity = model.v if model.v > 0 else 0.5
+        return dist / velocity if dist > 0 else 1.0
+    return joint_profile(model, start_angles, end_angles).duration
+
+# --- 5. ÚTVONAL GENERÁLÁS ---
+# Lusta csővezeték: a szakaszok, várakozások és megfogó-állapotok generátorok,
+# a lejátszó (vagy a parancssori futtatás) csak annyit húz belőlük, amennyi kell.
+
+DWELL_TIME = 0.15  # várakozás megfogáskor és elengedéskor (s)
+
+def iter_path_segment(model, start_angles, end_angles, steps, holding_state, line=None):
+    d32 = end_angles[0] - start_angles[0]
+    d43 = end_angles[1] - start_angles[1]
+
+    if model.straight_line:
+        # Egyenes pálya adaptív mintaszámmal (n itt nem számít); ha az egyenes kilép
+        # a munkaterületből, a szakasz csuklótéri interpolációval megy
+        path, times = line if line is not None else line_segment(model, start_angles, end_angles)
+        if path is not None:
+            for j, ((_, q32, q43), t) in enumerate(zip(path, times)):
+                yield (q32, q43, j, t, holding_state, True)
+            return
+        print("Figyelem: az egyenes pálya kilép a munkaterületből, csuklótéri mozgás lesz helyette.",
+              file=sys.stderr)
+
+    if model.profile == "linear":
+        # Régi viselkedés: Descartes-húr / v, egyenletes csuklótéri interpoláció
+        total_duration = segment_duration(model, start_angles, end_angles)
+        dt = total_duration / steps if steps > 0 else 0
+        for j in range(steps + 1):
+            r = j / steps
+            yield (start_angles[0] + d32 * r, start_angles[1] + d43 * r, j, j * dt, holding_state, True)
+        return
+
+    # Időoptimális profil: egyenletes időlépés, a profil szerinti pályaparaméter
+    prof = joint_profile(model, start_angles, end_angles)
+    dt = prof.duration / steps if steps > 0 else 0
+    for j in range(steps + 1):
+        r = prof.position(j * dt)
+        yield (start_angles[0] + d32 * r, start_angles[1] + d43 * r, j, j * dt, holding_state, True)
+
+def generate_path_segment(model, start_angles, end_angles, steps, holding_state):
+    return list(iter_path_segment(model, start_angles, end_angles, steps, holding_state))
+
+class SegmentCache:
+    # Megtervezett szakaszok LRU gyorsítótára, kulcs: (kezdő szögek, cél szögek, n, megfogás,
+    # modell-aláírás). Egy pont módosításakor csak a szomszédos szakaszok kulcsa változik, így
+    # csak azokat kell újratervezni. Modellváltozáskor (revision) automatikusan kiürül.
+    # Egyenes pályánál a kiszámolt út a szakasz megtervezéséig megmarad, így a ciklusidő
+    # becslése (duration) és a lejátszás (segment) egyszer számolja.
+    def __init__(self, max_samples=2000000):
+        self.max_samples = max_samples
+        self.clear()
+
+    def clear(self):
+        self.segments = OrderedDict()
+        self.durations = {}
+        self.lines = OrderedDict()
+        self.line_samples = 0
+        self.samples = 0
+        self.revision = None
+        self.hits = self.misses = 0
+
+    def check(self, model):
+        if model.revision != self.revision:
+            self.clear()
+            self.revision = model.revision
+
+    def segment(self, model, start_angles, end_angles, steps, holding_state):
+        self.check(model)
+        key = (tuple(start_angles), tuple(end_angles), steps, holding_state, model.plan_signature())
+        seg = self.segments.get(key)
+        if seg is not None:
+            self.segments.move_to_end(key)
+            self.hits += 1
+            return seg
+        self.misses += 1
+        line = None
+        if model.straight_line:
+            line = self.lines.pop((key[0], key[1], key[4]), None)
+            if line is not None: self.line_samples -= len(line[0] or ())
+        seg = Trajectory.from_samples(iter_path_segment(model, start_angles, end_angles, steps, holding_state,
+                                                        line))
+        self.segments[key] = seg
+        self.samples += len(seg)
+        while self.samples > self.max_samples and len(self.segments) > 1:
+            _, old = self.segments.popitem(last=False)
+            self.samples -= len(old)
+        return seg
+
+    def duration(self, model, start_angles, end_angles):
+        self.check(model)
+        key = (tuple(start_angles), tuple(end_angles), model.plan_signature())
+        d = self.durations.get(key)
+        if d is None:
+            if len(self.durations) > self.max_samples: self.durations.clear()
+            line = None
+            if model.straight_line:
+                line = self.lines[key] = line_segment(model, start_angles, end_angles)
+                self.line_samples += len(line[0] or ())
+                while self.line_samples > self.max_samples and len(self.lines) > 1:
+                    _, old = self.lines.popitem(last=False)
+                    self.line_samples -= len(old[0] or ())
+            d = self.durations[key] = segment_duration(model, start_angles, end_angles, line)
+        return d
+
+def dwell_stage(last, holding_state, duration=DWELL_TIME):
+    # Várakozás a szakasz végén egyetlen mintaként, a hosszával; a végén vált a megfogó
+    # állapota (nem kerül a táblázatba)
+    yield (last[0], last[1], last[2], last[3], holding_state, False, duration)
+
+def plan_job(model, points, current_angles, steps, bin_angles=None, cache=None, chunks=False):
+    # chunks: a gyorsítótárból jövő szakaszt egyben, Trajectory-ként adja (a lejátszó oszloponként
+    # fűzi a pufferéhez); a többi elem a szokásos minta
+    def segment(a, b, holding):
+        if cache is None:
+            yield from iter_path_segment(model, a, b, steps, holding)
+            return
+        seg = cache.segment(model, a, b, steps, holding)
+        if chunks: yield seg
+        else: yield from seg
+
+    def last_sample(s):
+        return s[-1] if isinstance(s, Trajectory) else s
+
+    # --- RAKODÁS MÓD LOGIKA ---
+    if bin_angles is not None:
+        for p in points:
+            target_angles = (p[2], p[3])
+            last = None
+
+            # 1. Mozgás a ponthoz, 2. várakozás és megfogás a ponton
+            for last in segment(current_angles, target_angles, False):
+                yield last
+            yield from dwell_stage(last_sample(last), True)
+
+            # 3. Mozgás a gyűjtőhöz, 4. várakozás és elengedés a gyűjtőnél
+            for last in segment(target_angles, bin_angles, True):
+                yield last
+            yield from dwell_stage(last_sample(last), False)
+
+            current_angles = bin_angles
+
+    # --- NORMÁL MÓD LOGIKA ---
+    else:
+        for i in range(len(points)-1):
+            p1, p2 = points[i], points[i+1]
+            yield from segment((p1[2], p1[3]), (p2[2], p2[3]), False)
+
+def live_job(model, targets, current_angles, steps, bin_angles=None, cache=None, chunks=False):
+    # Élő célpontfolyam (deque): mindig a következő célponthoz tervez; ha nincs célpont,
+    # None-t ad (a lejátszó vár), a None célpont a folyam vége
+    while True:
+        if not targets:
+            yield None
+            continue
+        p = targets.popleft()
+        if p is None: return
+        if bin_angles is not None:
+            yield from plan_job(model, [p], current_angles, steps, bin_angles, cache, chunks)
+            current_angles = bin_angles
+        else:
+            start = (None, None) + tuple(current_angles)
+            yield from plan_job(model, [start, p], current_angles, steps, None, cache, chunks)
+            current_angles = (p[2], p[3])
+
+def job_segments(points, current_angles, bin_angles=None):
+    # A feladat szakaszai (kezdő szögek, cél szögek) ugyanabban a sorrendben, mint plan_job
+    if bin_angles is not None:
+        for p in points:
+            yield current_angles, (p[2], p[3])
+            yield (p[2], p[3]), bin_angles
+            current_angles = bin_angles
+    else:
+        for i in range(len(points)-1):
+            yield (points[i][2], points[i][3]), (points[i+1][2], points[i+1][3])
+
+def job_cycle_time(model, points, current_angles, bin_angles=None, cache=None):
+    # (teljes ciklusidő, szakaszidők listája) mintavételezés nélkül;
+    # rakodásnál a megfogás/elengedés várakozása is beleszámít
+    duration = segment_duration if cache is None else cache.duration
+    seg_times = [duration(model, a, b) for a, b in job_segments(points, current_angles, bin_angles)]
+    total = sum(seg_times)
+    if bin_angles is not None:
+        total += len(seg_times) * DWELL_TIME
+    return total, seg_times
+
+def bin_angles_for(model, bin_x, bin_y):
+    # A gyűjtő csuklószögei (szöghatárok nélkül), vagy None, ha fizikailag elérhetetlen
+    if not model.in_annulus(bin_x, bin_y):
+        return None
+    return model.inverse_kinematics(bin_x, bin_y, check_limits=False)
+
+def table_row(model, data):
+    # A táblázat egy sora: n, ti, zi, ξi, φ32, φ43 (számként)
+    _, _, pos = model.forward_kinematics(data[0], data[1])
+    return data[2], data[3], pos[0], pos[1], math.degrees(data[0]), math.degrees(data[1])
+
+# --- 6. PÁLYANAPLÓ ---
+
+def csv_row(row):
+    n, ti, zi, xi, p32, p43 = row
+    return int(n), f"{ti:.4f}", f"{zi:.4f}", f"{xi:.4f}", f"{p32:.3f}", f"{p43:.3f}"
+
+class TrajectoryLog:
+    # A táblázat sorai tömör oszlopos tárolóban (array), opcionális gyűrűpuffer-korláttal.
+    # A törlés O(1), a teljes napló CSV-be vagy memóriába leképezhető .npy fájlba menthető.
+    COLUMNS = ("n", "ti", "zi", "ξi", "φ32", "φ43")
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.clear()
+
+    def clear(self):
+        self.cols = [array("q")] + [array("d") for _ in self.COLUMNS[1:]]
+        self.start = 0   # a legrégebbi sor helye, ha a gyűrű megtelt
+        self.total = 0   # valaha beírt sorok (total - len = eldobott)
+
+    def __len__(self):
+        return len(self.cols[0])
+
+    def append(self, row):
+        self.total += 1
+        cols = self.cols
+        if self.limit is None or len(cols[0]) < self.limit:
+            for c, v in zip(cols, row): c.append(v)
+        else:
+            i = self.start
+            for c, v in zip(cols, row): c[i] = v
+            self.start = (i + 1) % self.limit
+
+    def row(self, i):
+        cols = self.cols
+        size = len(cols[0])
+        if not 0 <= i < size:
+            raise IndexError(i)
+        j = (self.start + i) % size
+        return tuple(c[j] for c in cols)
+
+    def rows(self, first=0, last=None):
+        last = len(self) if last is None else min(last, len(self))
+        for i in range(max(0, first), last):
+            yield self.row(i)
+
+    def export_csv(self, path):
+        import csv
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(self.COLUMNS)
+            for row in self.rows():
+                w.writerow(csv_row(row))
+
+    def export_npy(self, path, chunk=4096):
+        # Szabványos NumPy .npy (float64, sorok x 6 oszlop), numpy nélkül írva;
+        # elemzéshez: numpy.load(path, mmap_mode="r")
+        ncols = len(self.COLUMNS)
+        descr = "<f8" if sys.byteorder == "little" else ">f8"
+        header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }" % (descr, len(self), ncols)
+        pad = 64 - (10 + len(header) + 1) % 64
+        header = header + " " * pad + "\n"
+        with open(path, "wb") as f:
+            f.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1"))
+            for first in range(0, len(self), chunk):
+                buf = array("d")
+                for row in self.rows(first, first + chunk):
+                    buf.extend(row)
+                buf.tofile(f)
+
+# --- 7. PARANCSSOROS FUTTATÁS ---
+
+PARAM_NAMES = ("l3", "l4", "min_phi32", "max_phi32", "min_phi43", "max_phi43", "tgy", "v",
+               "w32_max", "w43_max", "line_tol", "line_max_step")
+TABLE_HEADER = TrajectoryLog.COLUMNS
+
+def load_job(path):
+    # JSON feladatfájl: {"params": {...}, "points": [[x, y], ...], "mode": "normal"|"rakodas",
+    #                    "n": 12, "bin": [x, y]}
+    # Bármilyen más fájl: soronként egy "x y" vagy "x,y" pont, a többi alapértelmezett.
+    import json
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        return json.loads(text)
+    points = []
+    for line in text.splitlines():
+        line = line.split("#")[0].strip()
+        if not line: continue
+        x, y = line.replace(",", " ").split()[:2]
+        points.append([float(x), float(y)])
+    return {"points": points}
+
+def build_model(job):
+    model = RobotArmModel()
+    for k, v in job.get("params", {}).items():
+        if k not in PARAM_NAMES:
+            raise ValueError(f"Ismeretlen paraméter: {k}")
+        setattr(model, k, float(v))
+    profile = job.get("profile", model.profile)
+    if profile not in MotionProfile.KINDS:
+        raise ValueError(f"Ismeretlen profil: {profile}")
+    model.profile = profile
+    model.straight_line = bool(job.get("straight_line", False))
+    model.calc_rad_limits()
+
+    # A pontok ellenőrzése egyetlen kötegelt IK hívással
+    xs = [float(p[0]) for p in job.get("points", [])]
+    ys = [float(p[1]) for p in job.get("points", [])]
+    phi32, phi43, ok = model.inverse_kinematics_batch(xs, ys)
+    for i in range(len(xs)):
+        if ok[i]:
+            model.points.append((xs[i], ys[i], float(phi32[i]), float(phi43[i])))
+        else:
+            print(f"Hiba: A(z) {i+1}. pont kívül esik a munkaterületen!", file=sys.stderr)
+    return model
+
+def run_job(job, out, npy_path=None, traj_path=None):
+    import csv
+    model = build_model(job)
+    steps = int(job.get("n", 12))
+    start_angles = (model.rad_min32, model.rad_min43)
+    bin_angles = None
+    if job.get("mode", "normal") == "rakodas":
+        bin_x, bin_y = job.get("bin", (1.2, -0.6))
+        bin_angles = bin_angles_for(model, bin_x, bin_y)
+        if not bin_angles:
+            print("Hiba: A gyűjtő fizikailag nem elérhető!", file=sys.stderr)
+            return 1
+
+    if job.get("optimize"):
+        from utvonal import optimize_route
+        budget = float(job["optimize"]) if not isinstance(job["optimize"], bool) else 1.0
+        model.points, t_orig, t_new = optimize_route(model, model.points, start_angles, bin_angles,
+                                                     time_budget=budget)
+        print(f"Útvonal optimalizálva: {t_orig:.3f} s -> {t_new:.3f} s "
+              f"(megtakarítás: {t_orig - t_new:.3f} s)", file=sys.stderr)
+
+    total, seg_times = job_cycle_time(model, model.points, start_angles, bin_angles)
+    print(f"Ciklusidő: {total:.3f} s ({len(seg_times)} szakasz, profil: {model.profile})", file=sys.stderr)
+
+    if job.get("obstacles") or bin_angles is not None:
+        from akadalyok import obstacles_from_json, bin_obstacle, check_trajectory
+        obstacles = obstacles_from_json(job.get("obstacles", []))
+        if bin_angles is not None:
+            obstacles.append(bin_obstacle(*job.get("bin", (1.2, -0.6))))
+        for seg, k, name, link in check_trajectory(model, plan_job(model, model.points, start_angles,
+                                                                   steps, bin_angles), obstacles):
+            print(f"Figyelem: ütközés a(z) {seg+1}. szakasz {k}. mintájánál ({link} - {name})",
+                  file=sys.stderr)
+
+    writer = csv.writer(out)
+    writer.writerow(TABLE_HEADER)
+    log = TrajectoryLog() if npy_path else None
+    traj = Trajectory() if traj_path else None
+    rows = 0
+    for data in plan_job(model, model.points, start_angles, steps, bin_angles):
+        if traj is not None: traj.append(data)
+        if not data[5]: continue
+        row = table_row(model, data)
+        writer.writerow(csv_row(row))
+        if log is not None: log.append(row)
+        rows += 1
+    if log is not None:
+        log.export_npy(npy_path)
+    if traj is not None:
+        traj.save(traj_path)
+    return 0 if rows or len(model.points) < 2 else 1
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Robotkar pályaszimuláció grafikus felület nélkül")
+    ap.add_argument("job", help="feladatfájl (.json) vagy pontlista (soronként x y)")
+    ap.add_argument("-o", "--output", help="kimeneti CSV (alapértelmezés: standard kimenet)")
+    ap.add_argument("--npy", help="a táblázat bináris (.npy, memóriába leképezhető) mentése is")
+    ap.add_argument("--traj", help="a teljes pálya mentése (Trajectory.load-dal memóriába leképezhető)")
+    ap.add_argument("-n", type=int, help="felosztás szakaszonként (felülírja a fájlt)")
+    ap.add_argument("--mode", choices=("normal", "rakodas"), help="üzemmód (felülírja a fájlt)")
+    ap.add_argument("--profile", choices=MotionProfile.KINDS, help="sebességprofil (felülírja a fájlt)")
+    ap.add_argument("--line", type=float, metavar="TŰRÉS", nargs="?", const=-1.0,
+                    help="egyenes pálya adaptív mintavétellel (opcionális tűrés méterben)")
+    ap.add_argument("--optimize", type=float, metavar="MP", nargs="?", const=1.0,
+                    help="a pontsorrend optimalizálása, adott időkerettel (alapértelmezés: 1 s)")
+    args = ap.parse_args(argv)
+
+    job = load_job(args.job)
+    if args.n is not None: job["n"] = args.n
+    if args.mode is not None: job["mode"] = args.mode
+    if args.profile is not None: job["profile"] = args.profile
+    if args.optimize is not None: job["optimize"] = args.optimize
+    if args.line is not None:
+        job["straight_line"] = True
+        if args.line > 0: job.setdefault("params", {})["line_tol"] = args.line
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            return run_job(job, out, args.npy, args.traj)
+    return run_job(job, sys.stdout, args.npy, args.traj)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# A tesztek a tároló gyökeréből importálják a modulokat (nincs telepíthető csomag)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+# Ütközésvizsgálat: szakaszonként legfeljebb egy találat, az ütközés előtti utolsó mintával
+from akadalyok import CircleObstacle, RectObstacle, check_trajectory, split_segments
+from szimulacio import RobotArmModel, plan_job
+
+LINK_RADIUS = 0.03
+
+def planned(steps=50):
+    m = RobotArmModel()
+    m.calc_rad_limits()
+    pts = [(x, y) + tuple(m.inverse_kinematics(x, y))
+           for x, y in ((1.6, 0.3), (1.0, 1.2), (1.6, 0.3), (1.0, 1.2))]
+    return m, list(plan_job(m, pts, pts[0][2:], steps))
+
+def first_contact(m, seg, ob):
+    # Az első minta, amelyben valamelyik kartag a vastagságon belül van az akadálytól
+    for k, s in enumerate(seg):
+        _, (bx, by), (cx, cy) = m.forward_kinematics(s[0], s[1])
+        if min(ob.segment_distance(0.0, 0.0, bx, by), ob.segment_distance(bx, by, cx, cy)) <= LINK_RADIUS:
+            return k
+    return None
+
+def test_no_obstacles():
+    m, samples = planned()
+    assert check_trajectory(m, samples, []) == []
+
+def test_clear_path():
+    m, samples = planned()
+    assert check_trajectory(m, samples, [RectObstacle(-1.0, -1.0, -0.8, -0.8)]) == []
+
+def test_first_hit_per_segment():
+    m, samples = planned()
+    segs = list(split_segments(samples))
+    for r in (0.08, 0.01):
+        ob = CircleObstacle(1.3, 0.75, r, "akadály")
+        hits = check_trajectory(m, samples, [ob], LINK_RADIUS)
+        assert [h[0] for h in hits] == list(range(len(segs)))
+        for si, k, name, link in hits:
+            assert name == "akadály" and link in ("L3", "L4")
+            first = first_contact(m, segs[si], ob)
+            # A találat az ütközést megelőző minta: legfeljebb egy lépéssel az első érintkező előtt
+            assert first is not None and first - 1 <= k < first
+
+def test_hit_independent_of_subdivision():
+    ob = CircleObstacle(1.3, 0.75, 0.01, "akadály")
+    times = []
+    for steps in (20, 200):
+        m, samples = planned(steps)
+        segs = list(split_segments(samples))
+        hits = check_trajectory(m, samples, [ob], LINK_RADIUS)
+        si, k = hits[0][:2]
+        times.append((segs[si][k][3], segs[si][k + 1][3]))
+    # A két felosztás ütközési időablaka átfed
+    assert max(times[0][0], times[1][0]) <= min(times[0][1], times[1][1])
@@ -0,0 +1,58 @@
+# A munkaterület (terület, contains, elérhetőségi térkép) az IK döntésével egyezik - széles
+# φ32 határoknál is, ahol a négy ív már nem az elérhető tartomány határa
+import math
+
+import pytest
+
+from szimulacio import RobotArmModel, ReachabilityMap
+
+LIMITS = [None, (0, 90, 0, 180), (-10, 325, 0, 180), (-170, 170, 10, 170)]
+SCALE, SIZE = 100.0, 500
+
+def make_model(limits):
+    m = RobotArmModel()
+    if limits is not None:
+        m.min_phi32, m.max_phi32, m.min_phi43, m.max_phi43 = limits
+    m.calc_rad_limits()
+    return m
+
+def grid_points(step):
+    half = SIZE // 2
+    for py in range(0, SIZE, step):
+        for px in range(0, SIZE, step):
+            yield px, py, (px - half) / SCALE, (half - py) / SCALE
+
+@pytest.mark.parametrize("limits", LIMITS)
+def test_contains_matches_ik(limits):
+    m = make_model(limits)
+    for _, _, x, y in grid_points(4):
+        assert m.workspace.contains(x, y) == (m.inverse_kinematics(x, y) is not None), (x, y)
+
+@pytest.mark.parametrize("limits", LIMITS)
+def test_area_matches_ik_count(limits):
+    m = make_model(limits)
+    step = 2
+    inside = sum(1 for _, _, x, y in grid_points(step) if m.inverse_kinematics(x, y) is not None)
+    estimate = inside * (step / SCALE) ** 2
+    assert m.workspace.area() == pytest.approx(estimate, rel=0.02)
+
+@pytest.mark.parametrize("limits", LIMITS)
+def test_reachability_map_matches_ik(limits):
+    m = make_model(limits)
+    rm = ReachabilityMap(m)
+    half = SIZE // 2
+    rm.update(half, half, SCALE, SIZE, SIZE)
+    for px, py, x, y in grid_points(3):
+        cell = rm.lookup(px, py)
+        if cell == rm.EDGE: continue
+        assert (cell == rm.INSIDE) == (m.inverse_kinematics(x, y) is not None), (x, y)
+
+def test_closed_form_only_within_ik_branch():
+    m = make_model(None)
+    closed = (m.l3 * m.l4 * (m.rad_max32 - m.rad_min32) *
+              (math.cos(m.rad_min43) - math.cos(m.rad_max43)))
+    assert m.workspace.area() == closed
+    assert m.workspace.exact
+    wide = make_model((-10, 325, 0, 180)).workspace
+    wide.area()
+    assert not wide.exact
@@ -0,0 +1,40 @@
+# Folytatható bejárás: a félbeszakadt utolsó sor nem számít késznek, és folytatáskor levágódik
+import json
+
+from parametervizsgalat import combo_key, done_keys, grid_combinations, run_sweep
+
+JOB = {"points": [[1.6, 0.3], [1.0, 1.2], [1.4, 0.8]]}
+COMBOS = grid_combinations({"l3": [1.0, 1.2, 1.4], "max_phi32": [70.0, 80.0]})
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_done_keys_ignores_partial_tail(tmp_path):
+    path = tmp_path / "eredmeny.jsonl"
+    full = json.dumps({"params": COMBOS[0]}) + "\n"
+    path.write_text(full + '{"params": {"l3": 1.2', encoding="utf-8")
+    keys, end = done_keys(str(path))
+    assert keys == {combo_key(COMBOS[0])}
+    assert end == len(full.encode())
+
+def test_done_keys_missing_file(tmp_path):
+    assert done_keys(str(tmp_path / "nincs.jsonl")) == (set(), 0)
+
+def test_resume_after_interrupted_write(tmp_path):
+    path = tmp_path / "eredmeny.jsonl"
+    assert run_sweep(JOB, COMBOS[:2], str(path), processes=1) == 2
+    # Megszakadt írás: a harmadik rekordnak csak az eleje került ki
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"params": COMBOS[2], "valid": True})[:20])
+
+    assert run_sweep(JOB, COMBOS, str(path), processes=1) == len(COMBOS) - 2
+    records = read_records(path)
+    keys = [combo_key(r["params"]) for r in records]
+    assert len(keys) == len(set(keys)) == len(COMBOS)
+    assert set(keys) == {combo_key(c) for c in COMBOS}
+
+    # Újabb futás: minden kész, a fájl nem változik
+    before = path.read_bytes()
+    assert run_sweep(JOB, COMBOS, str(path), processes=1) == 0
+    assert path.read_bytes() == before
@@ -0,0 +1,43 @@
+# A tömör pályatároló: mentés/betöltés oda-vissza, és az oszloponkénti hozzáfűzés idővonala
+import pytest
+
+from szimulacio import RobotArmModel, Trajectory, plan_job, dwell_stage
+
+def sample_trajectory():
+    m = RobotArmModel()
+    m.calc_rad_limits()
+    pts = [(x, y) + tuple(m.inverse_kinematics(x, y)) for x, y in ((1.6, 0.3), (1.0, 1.2))]
+    samples = list(plan_job(m, pts, pts[0][2:], 20))
+    samples.extend(dwell_stage(samples[-1], True))
+    return Trajectory.from_samples(samples)
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_load_round_trip(tmp_path, use_mmap):
+    traj = sample_trajectory()
+    path = str(tmp_path / "palya.bin")
+    traj.save(path)
+    loaded = Trajectory.load(path, use_mmap=use_mmap)
+    assert loaded.readonly
+    assert len(loaded) == len(traj)
+    assert list(loaded) == list(traj)
+    for a, b in zip(loaded.columns(), traj.columns()):
+        assert list(a) == list(b)
+    # A betöltött pálya újra menthető, bájtra azonosan
+    again = str(tmp_path / "ujra.bin")
+    loaded.save(again)
+    with open(path, "rb") as f1, open(again, "rb") as f2:
+        assert f1.read() == f2.read()
+
+def test_load_rejects_foreign_file(tmp_path):
+    path = tmp_path / "mas.bin"
+    path.write_bytes(b"nem palya" * 4)
+    with pytest.raises(ValueError):
+        Trajectory.load(str(path))
+
+def test_extend_matches_append():
+    traj = sample_trajectory()
+    half = len(traj) // 2
+    head = Trajectory.from_samples(list(traj)[:half])
+    head.extend(Trajectory.from_samples(list(traj)[half:]))
+    assert list(head.T) == pytest.approx(list(traj.T))
+    assert list(head) == pytest.approx(list(traj))
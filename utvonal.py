@@ -0,0 +1,226 @@
+# Bejárási sorrend optimalizálása: a betanított pontok sorrendje a teljes csuklótéri
+# mozgásidő szerint (legközelebbi szomszéd + 2-opt / Or-opt helyi keresés, időkerettel).
+import math
+import time
+
+from szimulacio import segment_duration, job_cycle_time
+
+class RouteCost:
+    # Irányított költség a csomópontok között; a 0. csomópont a kiinduló helyzet (depó).
+    # A depóba visszatérés ingyenes (nyitott útvonal), ismeretlen kezdőhelyzetnél a depó "üres".
+    # A páronkénti gyorsítótár korlátos: teliben újrakezdődik (a helyi keresés a szomszédokon marad).
+    CACHE_LIMIT = 500000
+
+    def __init__(self, model, points, start_angles=None):
+        self.model = model
+        self.angles = [start_angles] + [(p[2], p[3]) for p in points]
+        self.cache = {}
+
+    def __call__(self, i, j):
+        if j == 0 or i == j: return 0.0
+        if i == 0 and self.angles[0] is None: return 0.0
+        key = (i, j) if i < j else (j, i)
+        c = self.cache.get(key)
+        if c is None:
+            if len(self.cache) >= self.CACHE_LIMIT: self.cache.clear()
+            c = self.cache[key] = segment_duration(self.model, self.angles[i], self.angles[j])
+        return c
+
+class PointGrid:
+    # Egyenletes rács a csuklósebességgel skálázott szögtérben; a keresés gyűrűnként bővül
+    def __init__(self, model, points):
+        w32, w43 = math.radians(model.w32_max) or 1.0, math.radians(model.w43_max) or 1.0
+        self.xy = xy = [(p[2] / w32, p[3] / w43) for p in points]
+        n = len(xy)
+        self.x0 = min((p[0] for p in xy), default=0.0)
+        self.y0 = min((p[1] for p in xy), default=0.0)
+        span = max(max((p[0] for p in xy), default=0.0) - self.x0,
+                   max((p[1] for p in xy), default=0.0) - self.y0, 1e-9)
+        self.cells = max(1, int(math.sqrt(n / 2)))
+        self.size = span / self.cells + 1e-12
+        self.grid = {}
+        for i, (x, y) in enumerate(xy):
+            self.grid.setdefault(self.key(x, y), []).append(i)
+
+    def key(self, x, y):
+        return int((x - self.x0) / self.size), int((y - self.y0) / self.size)
+
+    def remove(self, i):
+        key = self.key(*self.xy[i])
+        ids = self.grid[key]
+        ids.remove(i)
+        if not ids: del self.grid[key]
+
+    def nearest(self, i, k):
+        # Az i. ponthoz legközelebbi k (másik) pont: [(távolság², sorszám), ...]
+        xy, grid, size = self.xy, self.grid, self.size
+        x, y = xy[i]
+        cx, cy = self.key(x, y)
+        found = []
+        r = 0
+        while True:
+            for gx in range(cx - r, cx + r + 1):
+                for gy in (range(cy - r, cy + r + 1) if abs(gx - cx) == r else (cy - r, cy + r)):
+                    ids = grid.get((gx, gy))
+                    if ids is None: continue
+                    for j in ids:
+                        if j != i:
+                            px, py = xy[j]
+                            found.append(((px - x) ** 2 + (py - y) ** 2, j))
+            # A r. gyűrűn túli pontok legalább r*size távolságra vannak
+            if len(found) >= k:
+                limit = (r * size) ** 2
+                if sum(1 for d, _ in found if d <= limit) >= k: break
+            if r > self.cells or not grid: break
+            r += 1
+        found.sort()
+        return found[:k]
+
+def neighbour_lists(model, points, k, deadline=None):
+    # k legközelebbi szomszéd a csuklósebességgel skálázott szögtérben (rácsos kereséssel);
+    # az időkeret lejártakor None
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0: return [[] for _ in points]
+    grid = PointGrid(model, points)
+    result = []
+    for i in range(n):
+        if deadline is not None and i % 256 == 0 and time.perf_counter() >= deadline: return None
+        result.append([j + 1 for _, j in grid.nearest(i, k)])  # csomópont-sorszám (a 0. a depó)
+    return result
+
+def tour_cost(tour, cost):
+    return sum(cost(tour[i], tour[(i + 1) % len(tour)]) for i in range(len(tour)))
+
+def nearest_neighbour_tour(model, points, cost, neigh, deadline):
+    # Mohó építés a depóból indulva; ha a szomszédlistán minden foglalt, a rácsban keresi
+    # a legközelebbi még be nem járt pontot (a bejártak kikerülnek a rácsból).
+    # Az időkeret lejártakor None (a hívó az eredeti sorrendet tartja meg).
+    n = len(points)
+    grid = PointGrid(model, points)
+    visited = [False] * (n + 1)
+    visited[0] = True
+    tour = [0]
+    cur = 0
+    for step in range(n):
+        if step % 64 == 0 and time.perf_counter() >= deadline: return None
+        nxt = None
+        if cur:
+            cand = [j for j in neigh[cur - 1] if not visited[j]]
+            if cand: nxt = min(cand, key=lambda j: cost(cur, j))
+        if nxt is None:
+            if cur:
+                near = grid.nearest(cur - 1, 1)
+                nxt = near[0][1] + 1
+            else:
+                nxt = min(range(1, n + 1), key=lambda j: cost(0, j))
+        visited[nxt] = True
+        if cur: grid.remove(cur - 1)
+        tour.append(nxt)
+        cur = nxt
+    return tour
+
+def two_opt(tour, cost, neigh, deadline):
+    n = len(tour)
+    pos = [0] * n
+    for i, c in enumerate(tour): pos[c] = i
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(n):
+            a, b = tour[i], tour[(i + 1) % n]
+            if a == 0: continue
+            for c in neigh[a - 1]:
+                j = pos[c]
+                d = tour[(j + 1) % n]
+                if c == b or d == a: continue
+                if i < j:
+                    gain = cost(a, b) + cost(c, d) - cost(a, c) - cost(b, d)
+                    lo, hi = i + 1, j
+                else:
+                    gain = cost(c, d) + cost(a, b) - cost(c, a) - cost(d, b)
+                    lo, hi = j + 1, i
+                if gain > 1e-9 and lo >= 1:
+                    tour[lo:hi + 1] = tour[lo:hi + 1][::-1]
+                    for k in range(lo, hi + 1): pos[tour[k]] = k
+                    improved = True
+                    break
+            if time.perf_counter() >= deadline: break
+    return tour
+
+def or_opt(tour, cost, neigh, deadline, max_len=3):
+    # 1-3 hosszú láncszakasz áthelyezése egy szomszédos él közé (irányát megtartva)
+    n = len(tour)
+    pos = [0] * n
+    for i, c in enumerate(tour): pos[c] = i
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for seg_len in range(1, max_len + 1):
+            i = 1
+            while i + seg_len <= n and time.perf_counter() < deadline:
+                prev, first = tour[i - 1], tour[i]
+                last, nxt = tour[i + seg_len - 1], tour[(i + seg_len) % n]
+                removed = cost(prev, first) + cost(last, nxt) - cost(prev, nxt)
+                best, best_gain = None, 1e-9
+                for c in neigh[first - 1]:
+                    j = pos[c]
+                    if i - 1 <= j < i + seg_len: continue
+                    d = tour[(j + 1) % n]
+                    gain = removed - (cost(c, first) + cost(last, d) - cost(c, d))
+                    if gain > best_gain: best, best_gain = c, gain
+                if best is None:
+                    i += 1
+                    continue
+                seg = tour[i:i + seg_len]
+                del tour[i:i + seg_len]
+                j = tour.index(best)
+                tour[j + 1:j + 1] = seg
+                for k, c in enumerate(tour): pos[c] = k
+                improved = True
+    return tour
+
+def optimize_route(model, points, start_angles=None, bin_angles=None, time_budget=1.0, k=10):
+    # Visszatér: (új pontsorrend, eredeti ciklusidő, új ciklusidő)
+    points = list(points)
+    if bin_angles is not None:
+        return optimize_pick_place(model, points, start_angles, bin_angles)
+    if len(points) < 3:
+        t = job_cycle_time(model, points, start_angles)[0]
+        return points, t, t
+
+    deadline = time.perf_counter() + time_budget
+    # Normál módban a kar az első pontból indul, ezért a kezdőpont szabadon választható
+    cost = RouteCost(model, points, None)
+    neigh = neighbour_lists(model, points, k, deadline)
+    tour = nearest_neighbour_tour(model, points, cost, neigh, deadline) if neigh is not None else None
+    if tour is None:
+        t = job_cycle_time(model, points, start_angles)[0]
+        return points, t, t
+    while time.perf_counter() < deadline:
+        before = tour_cost(tour, cost)
+        two_opt(tour, cost, neigh, deadline)
+        or_opt(tour, cost, neigh, deadline)
+        if tour_cost(tour, cost) >= before - 1e-9: break
+
+    ordered = [points[c - 1] for c in tour[1:]]
+    t_orig = job_cycle_time(model, points, start_angles)[0]
+    t_new = job_cycle_time(model, ordered, start_angles)[0]
+    if t_new > t_orig:
+        return points, t_orig, t_orig
+    return ordered, t_orig, t_new
+
+def optimize_pick_place(model, points, start_angles, bin_angles):
+    # Rakodásnál minden pont után a gyűjtőbe megy a kar, így a pontonkénti gyűjtő-pont-gyűjtő út
+    # sorrendfüggetlen; csak az első pont számít: az, amelyiknél c(start, p) - c(gyűjtő, p) a legkisebb.
+    # Ez pontos optimum, keresés nélkül.
+    t_orig = job_cycle_time(model, points, start_angles, bin_angles)[0]
+    if len(points) < 2 or start_angles is None:
+        return points, t_orig, t_orig
+    def first_gain(p):
+        a = (p[2], p[3])
+        return segment_duration(model, start_angles, a) - segment_duration(model, bin_angles, a)
+    best = min(range(len(points)), key=lambda i: first_gain(points[i]))
+    ordered = [points[best]] + points[:best] + points[best + 1:]
+    t_new = job_cycle_time(model, ordered, start_angles, bin_angles)[0]
+    return ordered, t_orig, t_new